@@ -1,31 +1,65 @@
-from typing import Any, Union, List, Tuple, Dict
+from typing import Any, Iterable, Iterator, Union, List, Tuple, Dict
 
 from fastfs.global_instance import fast_file_manager
+from fastfs.lines import LineWriter
 
 
-def write_pickle(file_name: str, file_data: Any):
+def write_pickle(file_name: str, file_data: Any,
+                 compression: Union[None, str] = 'infer', compression_level: Union[None, int] = None,
+                 out_of_band: bool = False,
+                 skip_if_unchanged: bool = False) -> bool:
     """
     Writes data to a pickle file.
 
     Args:
         file_name: The name/path of the file to write the pickle data to.
         file_data: The data to write as a pickle object.
+        compression: 'infer' picks the compression from the file extension ('.gz', '.bz2', '.xz', '.zst', '.lz4').
+                     It can also be given by name ('gzip', 'bz2', 'xz', 'zstd', 'lz4'), or None to never compress.
+        compression_level: The compression level. Defaults to a fast level for each compression.
+        out_of_band: If True, uses pickle protocol 5 and writes large buffers (NumPy arrays, bytearrays and other
+                     objects supporting PEP 574) as separate aligned segments after the pickle stream, without
+                     copying them. read_pickle then maps them from the file instead of reading and copying them.
+                     bytes objects are always pickled in-band.
+        skip_if_unchanged: If True, the data is serialized in memory and compared with the digest recorded when the
+                           file was last written this way. The write is skipped if they match, see fastfs.digests.
+
+    Returns:
+        bool: False if the write was skipped because the file was unchanged, True otherwise.
     """
-    fast_file_manager.write_pickle(file_name, file_data)
+    return fast_file_manager.write_pickle(file_name, file_data, compression=compression,
+                                          compression_level=compression_level, out_of_band=out_of_band,
+                                          skip_if_unchanged=skip_if_unchanged)
 
 
-def write_json(file_name: str, file_data: Any):
+def write_json(file_name: str, file_data: Any,
+               compression: Union[None, str] = 'infer', compression_level: Union[None, int] = None,
+               backend: Union[None, str] = None,
+               skip_if_unchanged: bool = False) -> bool:
     """
     Writes data to a JSON file.
 
     Args:
         file_name: The name/path of the file to write the JSON data to.
         file_data: The data to write as a JSON object.
+        compression: 'infer' picks the compression from the file extension ('.gz', '.bz2', '.xz', '.zst', '.lz4').
+                     It can also be given by name ('gzip', 'bz2', 'xz', 'zstd', 'lz4'), or None to never compress.
+        compression_level: The compression level. Defaults to a fast level for each compression.
+        backend: The JSON backend, e.g. 'orjson'. Defaults to the manager's backend, see fastfs.utils.set_json_backend.
+        skip_if_unchanged: If True, the data is serialized in memory and compared with the digest recorded when the
+                           file was last written this way. The write is skipped if they match, see fastfs.digests.
+
+    Returns:
+        bool: False if the write was skipped because the file was unchanged, True otherwise.
     """
-    fast_file_manager.write_json(file_name, file_data)
+    return fast_file_manager.write_json(file_name, file_data, compression=compression,
+                                        compression_level=compression_level, backend=backend,
+                                        skip_if_unchanged=skip_if_unchanged)
 
 
-def write_csv(file_name: str, file_data: Union[List[dict], List[list]], header: Union[None, list] = None):
+def write_csv(file_name: str, file_data: Union[List[dict], List[list]], header: Union[None, list] = None,
+              compression: Union[None, str] = 'infer', compression_level: Union[None, int] = None,
+              skip_if_unchanged: bool = False) -> bool:
     """
     Writes data to a CSV file.
 
@@ -33,100 +67,404 @@ def write_csv(file_name: str, file_data: Union[List[dict], List[list]], header:
         file_name: The name/path of the file to write the CSV data to.
         file_data: The data to write as a list of dictionaries or a list of lists.
         header: An optional list of header values. If provided, this will be written as the first row in the CSV file.
+        compression: 'infer' picks the compression from the file extension ('.gz', '.bz2', '.xz', '.zst', '.lz4').
+                     It can also be given by name ('gzip', 'bz2', 'xz', 'zstd', 'lz4'), or None to never compress.
+        compression_level: The compression level. Defaults to a fast level for each compression.
+        skip_if_unchanged: If True, the data is serialized in memory and compared with the digest recorded when the
+                           file was last written this way. The write is skipped if they match, see fastfs.digests.
+
+    Returns:
+        bool: False if the write was skipped because the file was unchanged, True otherwise.
     """
-    fast_file_manager.write_csv(file_name, file_data, header=header)
+    return fast_file_manager.write_csv(file_name, file_data, header=header, compression=compression,
+                                       compression_level=compression_level, skip_if_unchanged=skip_if_unchanged)
 
 
-def read_csv(file_name: str, return_list_of_dicts: bool = False) -> Union[Tuple[List[str], List[List[str]]], List[dict]]:
+def read_csv(file_name: str, return_list_of_dicts: bool = False,
+             compression: Union[None, str] = 'infer') -> Union[Tuple[List[str], List[List[str]]], List[dict]]:
     """
     Reads data from a CSV file.
 
     Args:
         file_name: The name/path of the CSV file to read from.
+        compression: 'infer' detects the compression from the file extension. It can also be given by name,
+                     or None to read the file as-is.
 
     Returns:
         Union[Tuple[List[str], List[List[str]]], List[dict]]: The data read from the CSV file, either a tuple containing headers and rows 
         or a single list of dicts with the headers as the keys in the list.
     """
 
-    return fast_file_manager.read_csv(file_name, return_list_of_dicts=return_list_of_dicts)
+    return fast_file_manager.read_csv(file_name, return_list_of_dicts=return_list_of_dicts, compression=compression)
+
+
+def iter_csv(file_name: str, batch_size: int = 10000, as_dicts: bool = False,
+             usecols: Union[None, List[Union[str, int]]] = None,
+             compression: Union[None, str] = 'infer') -> Iterator[Union[Tuple[List[str], List[List[str]]], List[dict]]]:
+    """
+    Reads data from a CSV file in batches of rows, keeping only one batch in memory at a time.
+
+    The file is opened once and closed when iteration finishes or the caller stops early. Blank lines are skipped.
+
+    Args:
+        file_name: The name/path of the CSV file to read from.
+        batch_size: The maximum number of rows per batch.
+        as_dicts: If True, each batch is a list of dicts with the headers as the keys. If False, each batch is a
+                  tuple of the headers and a list of rows, like read_csv.
+        usecols: An optional list of column names or indices to keep. Other columns are discarded as rows are read.
+        compression: 'infer' detects the compression from the file extension. It can also be given by name,
+                     or None to read the file as-is.
+
+    Yields:
+        Union[Tuple[List[str], List[List[str]]], List[dict]]: One batch of rows at a time.
+    """
+    return fast_file_manager.iter_csv(file_name, batch_size=batch_size, as_dicts=as_dicts, usecols=usecols,
+                                      compression=compression)
 
 
-def write_file(file_name: str, file_data: Any):
+def write_file(file_name: str, file_data: Any,
+               compression: Union[None, str] = None, compression_level: Union[None, int] = None,
+               skip_if_unchanged: bool = False) -> bool:
     """
     Writes data to a file.
 
     Args:
         file_name: The name/path of the file to write the data to.
         file_data: The data to write to the file.
+        compression: None (the default) writes the data as-is, even to a '.gz' file. 'infer' picks the compression
+                     from the file extension ('.gz', '.bz2', '.xz', '.zst', '.lz4'), and it can also be given by name
+                     ('gzip', 'bz2', 'xz', 'zstd', 'lz4').
+        compression_level: The compression level. Defaults to a fast level for each compression.
+        skip_if_unchanged: If True, the data is serialized in memory and compared with the digest recorded when the
+                           file was last written this way. The write is skipped if they match, see fastfs.digests.
+
+    Returns:
+        bool: False if the write was skipped because the file was unchanged, True otherwise.
     """
-    fast_file_manager.write_file(file_name, file_data)
+    return fast_file_manager.write_file(file_name, file_data, compression=compression,
+                                        compression_level=compression_level, skip_if_unchanged=skip_if_unchanged)
 
 
-def read_pickle(file_name: str) -> Any:
+def read_pickle(file_name: str, compression: Union[None, str] = 'infer', mmap: bool = False) -> Any:
     """
     Reads data from a pickle file.
 
+    Pickles written with out_of_band=True are read with one readinto call into a buffer that their large buffers
+    share, so e.g. NumPy arrays are loaded without copying their data a second time.
+
     Args:
         file_name: The name/path of the pickle file to read from.
+        compression: 'infer' detects the compression from the file extension. It can also be given by name,
+                     or None to read the file as-is.
+        mmap: If True, uncompressed out-of-band pickles are memory-mapped instead, and their arrays are copy-on-write
+              views of the mapping that are only read as they are touched. Unsafe while the file can be truncated
+              or rewritten in place: touching such an array afterwards kills the process with SIGBUS. Only use it
+              for files that are never overwritten, or only replaced by atomic writes.
 
     Returns:
         Any: The data read from the pickle file.
     """
-    return fast_file_manager.read_pickle(file_name)
+    # Only passed when set, so plain reads stay cacheable
+    options = {'mmap': True} if mmap else {}
+
+    return fast_file_manager.read_pickle(file_name, compression=compression, **options)
 
 
-def read_json(file_name: str) -> Union[dict, list]:
+def read_json(file_name: str, compression: Union[None, str] = 'infer',
+              backend: Union[None, str] = None) -> Union[dict, list]:
     """
     Reads data from a JSON file.
 
     Args:
         file_name: The name/path of the JSON file to read from.
+        compression: 'infer' detects the compression from the file extension. It can also be given by name,
+                     or None to read the file as-is.
+        backend: The JSON backend, e.g. 'orjson'. Defaults to the manager's backend, see fastfs.utils.set_json_backend.
 
     Returns:
         Union[dict, list]: The data read from the JSON file, either a dictionary or a list.
     """
-    return fast_file_manager.read_json(file_name)
+    return fast_file_manager.read_json(file_name, compression=compression, backend=backend)
 
 
-def read_file(file_name: str) -> str:
+def read_file(file_name: str, compression: Union[None, str] = None) -> str:
     """
     Reads data from a file.
 
     Args:
         file_name: The name/path of the file to read from.
+        compression: None (the default) reads the file as-is, even a '.gz' file. 'infer' detects the compression
+                     from the file extension, and it can also be given by name.
 
     Returns:
         str: The data read from the file.
     """
-    return fast_file_manager.read_file(file_name)
+    return fast_file_manager.read_file(file_name, compression=compression)
 
 
-def write_lines(file_name: str, lines: list):
+def write_lines(file_name: str, lines: Iterable[str], buffer_size: int = 1024 * 1024,
+                compression: Union[None, str] = 'infer', compression_level: Union[None, int] = None,
+                skip_if_unchanged: bool = False) -> bool:
     """
-    Writes a list of lines to a file.
+    Writes lines to a file, replacing the file if it exists.
+
+    Lines are joined into chunks of about buffer_size characters and written with one call per chunk, so any
+    iterable, e.g. a generator producing millions of lines, is written with bounded memory.
 
     Args:
         file_name: The name/path of the file to write the lines to.
-        lines: A list of strings to write to the file, one string per line.
+        lines: Any iterable of strings, one string per line, without newlines.
+        buffer_size: The approximate number of characters joined and written per write call.
+        compression: 'infer' picks the compression from the file extension ('.gz', '.bz2', '.xz', '.zst', '.lz4').
+                     It can also be given by name ('gzip', 'bz2', 'xz', 'zstd', 'lz4'), or None to never compress.
+        compression_level: The compression level. Defaults to a fast level for each compression.
+        skip_if_unchanged: If True, the data is serialized in memory and compared with the digest recorded when the
+                           file was last written this way. The write is skipped if they match, see fastfs.digests.
+
+    Returns:
+        bool: False if the write was skipped because the file was unchanged, True otherwise.
+    """
+    return fast_file_manager.write_lines(file_name, lines, buffer_size=buffer_size, compression=compression,
+                                         compression_level=compression_level, skip_if_unchanged=skip_if_unchanged)
+
+
+def append_lines(file_name: str, lines: Iterable[str], buffer_size: int = 1024 * 1024,
+                 compression: Union[None, str] = 'infer', compression_level: Union[None, int] = None):
+    """
+    Appends lines to a file, creating it if it doesn't exist.
+
+    Each call opens and closes the file. For many small appends, keep a handle open with open_line_writer.
+
+    Args:
+        file_name: The name/path of the file to append the lines to.
+        lines: Any iterable of strings, one string per line, without newlines.
+        buffer_size: The approximate number of characters joined and written per write call.
+        compression: 'infer' picks the compression from the file extension ('.gz', '.bz2', '.xz', '.zst', '.lz4').
+                     It can also be given by name ('gzip', 'bz2', 'xz', 'zstd', 'lz4'), or None to never compress.
+        compression_level: The compression level. Defaults to a fast level for each compression.
     """
-    fast_file_manager.write_lines(file_name, lines)
+    fast_file_manager.append_lines(file_name, lines, buffer_size=buffer_size, compression=compression,
+                                   compression_level=compression_level)
 
 
-def read_lines(file_name: str) -> List[str]:
+def open_line_writer(file_name: str, append: bool = True, buffer_size: int = 1024 * 1024,
+                     compression: Union[None, str] = 'infer', compression_level: Union[None, int] = None) -> LineWriter:
+    """
+    Opens a file for writing lines and keeps it open, e.g. for a log written over the lifetime of a program.
+
+    Lines written one at a time are buffered and joined into chunks of about buffer_size characters before they
+    reach the file. Call flush() to make buffered lines visible to readers, and close the writer (or use it as a
+    context manager) so no buffered line is lost.
+
+    Args:
+        file_name: The name/path of the file to write lines to.
+        append: If True, lines are appended to the file. If False, the file is truncated first.
+        buffer_size: The approximate number of characters buffered before they are written.
+        compression: 'infer' picks the compression from the file extension ('.gz', '.bz2', '.xz', '.zst', '.lz4').
+                     It can also be given by name ('gzip', 'bz2', 'xz', 'zstd', 'lz4'), or None to never compress.
+        compression_level: The compression level. Defaults to a fast level for each compression.
+
+    Returns:
+        LineWriter: The open writer, with write(line), write_lines(lines), flush() and close().
+    """
+    return fast_file_manager.open_line_writer(file_name, append=append, buffer_size=buffer_size,
+                                              compression=compression, compression_level=compression_level)
+
+
+def read_lines(file_name: str, compression: Union[None, str] = 'infer') -> List[str]:
     """
     Reads lines from a file.
 
     Args:
         file_name: The name/path of the file to read lines from.
+        compression: 'infer' detects the compression from the file extension. It can also be given by name,
+                     or None to read the file as-is.
 
     Returns:
         List[str]: A list of strings containing the lines read from the file.
     """
-    return fast_file_manager.read_lines(file_name)
+    return fast_file_manager.read_lines(file_name, compression=compression)
+
+
+def iter_lines(file_name: str, chunk_size: int = 256 * 1024, start: int = 0, end: Union[None, int] = None,
+               binary: bool = False, keepends: bool = True, batches: bool = False,
+               compression: Union[None, str] = 'infer') -> Iterator[Union[str, bytes, List[Union[str, bytes]]]]:
+    """
+    Iterates over the lines of a file, reading it in large binary chunks.
+
+    The file is closed when the iteration finishes, when the iterator is closed, or when it is garbage collected,
+    so breaking out of a loop early doesn't leak the file.
+
+    Args:
+        file_name: The name/path of the file to read lines from.
+        chunk_size: The number of bytes read per call.
+        start: The byte offset to start at. It must be the start of a line, e.g. from split_line_ranges.
+        end: The byte offset to stop at, or None to read to the end of the file. It must be the end of a line.
+        binary: If True, yields the lines as bytes, without decoding them.
+        keepends: If True, lines end with their line break like lines of a file opened in text mode.
+        batches: If True, yields a list of lines per chunk read instead of single lines, which saves the cost of
+                 yielding every line when lines are processed in bulk.
+        compression: 'infer' detects the compression from the file extension. It can also be given by name,
+                     or None to read the file as-is.
+
+    Returns:
+        Iterator[Union[str, bytes, List[Union[str, bytes]]]]: The lines, decoded from UTF-8 unless binary is True.
+    """
+    return fast_file_manager.iter_lines(file_name, chunk_size=chunk_size, start=start, end=end, binary=binary,
+                                        keepends=keepends, batches=batches, compression=compression)
+
+
+def tail_lines(file_name: str, n: int = 10, compression: Union[None, str] = 'infer') -> List[str]:
+    """
+    Reads the last lines of a file.
+
+    Uncompressed files are read backward from the end, so the cost depends on n rather than the file size.
+    Compressed files are decompressed from the start.
+
+    Args:
+        file_name: The name/path of the file to read lines from.
+        n: The number of lines to return.
+        compression: 'infer' detects the compression from the file extension. It can also be given by name,
+                     or None to read the file as-is.
+
+    Returns:
+        List[str]: Up to n lines, oldest first, without their line breaks.
+    """
+    return fast_file_manager.tail_lines(file_name, n, compression=compression)
+
+
+def count_lines(file_name: str, compression: Union[None, str] = 'infer') -> int:
+    """
+    Counts the lines of a file without decoding them. A last line without a line break is counted.
+
+    Args:
+        file_name: The name/path of the file to count lines in.
+        compression: 'infer' detects the compression from the file extension. It can also be given by name,
+                     or None to read the file as-is.
+
+    Returns:
+        int: The number of lines.
+    """
+    return fast_file_manager.count_lines(file_name, compression=compression)
+
+
+def split_line_ranges(file_name: str, k: int) -> List[Tuple[int, int]]:
+    """
+    Splits an uncompressed file into byte ranges aligned to line breaks, so several processes can each read a
+    slice of one large file with iter_lines(file_name, start=start, end=end).
+
+    Args:
+        file_name: The name/path of the file to split.
+        k: The number of ranges. Fewer are returned if the file has fewer lines or is empty.
+
+    Returns:
+        List[Tuple[int, int]]: (start, end) byte offsets of about equal size that together cover the file.
+
+    Raises:
+        ValueError: If the file is compressed or k is less than 1.
+    """
+    return fast_file_manager.split_line_ranges(file_name, k)
+
+
+def write_jsonl(file_name: str, records: Iterable[Any], batch_size: int = 1000,
+                compression: Union[None, str] = 'infer', compression_level: Union[None, int] = None,
+                backend: Union[None, str] = None,
+                skip_if_unchanged: bool = False) -> bool:
+    """
+    Writes records to a JSON Lines file, one JSON value per line, replacing the file if it exists.
+
+    Args:
+        file_name: The name/path of the file to write the records to.
+        records: Any iterable of JSON-serializable records, e.g. a generator. It is consumed one batch at a time.
+        batch_size: The number of records encoded and written with each write call.
+        compression: 'infer' picks the compression from the file extension ('.gz', '.bz2', '.xz', '.zst', '.lz4').
+                     It can also be given by name ('gzip', 'bz2', 'xz', 'zstd', 'lz4'), or None to never compress.
+        compression_level: The compression level. Defaults to a fast level for each compression.
+        backend: The JSON backend, e.g. 'orjson'. Defaults to the manager's backend, see fastfs.utils.set_json_backend.
+        skip_if_unchanged: If True, the data is serialized in memory and compared with the digest recorded when the
+                           file was last written this way. The write is skipped if they match, see fastfs.digests.
+
+    Returns:
+        bool: False if the write was skipped because the file was unchanged, True otherwise.
+    """
+    return fast_file_manager.write_jsonl(file_name, records, batch_size=batch_size, compression=compression,
+                                         compression_level=compression_level, backend=backend,
+                                         skip_if_unchanged=skip_if_unchanged)
+
+
+def append_jsonl(file_name: str, records: Iterable[Any], batch_size: int = 1000,
+                 compression: Union[None, str] = 'infer', compression_level: Union[None, int] = None,
+                 backend: Union[None, str] = None):
+    """
+    Appends records to a JSON Lines file, creating it if it doesn't exist. Existing records are never rewritten.
+
+    Records are buffered and written with one write call per batch. If a record can't be encoded, the batches
+    before it have already been appended.
+
+    Args:
+        file_name: The name/path of the file to append the records to.
+        records: Any iterable of JSON-serializable records, e.g. a generator. It is consumed one batch at a time.
+        batch_size: The number of records encoded and written with each write call.
+        compression: 'infer' picks the compression from the file extension ('.gz', '.bz2', '.xz', '.zst', '.lz4').
+                     It can also be given by name ('gzip', 'bz2', 'xz', 'zstd', 'lz4'), or None to never compress.
+        compression_level: The compression level. Defaults to a fast level for each compression.
+        backend: The JSON backend, e.g. 'orjson'. Defaults to the manager's backend, see fastfs.utils.set_json_backend.
+    """
+    fast_file_manager.append_jsonl(file_name, records, batch_size=batch_size,
+                                   compression=compression, compression_level=compression_level, backend=backend)
 
 
-def write_ini(file_name: str, data: Union[Dict[Any, Dict[Any, Any]], Dict[Any, Any]]):
+def iter_jsonl(file_name: str, workers: int = 0, chunk_size: int = 1000, with_offsets: bool = False,
+               compression: Union[None, str] = 'infer', backend: Union[None, str] = None) -> Iterator[Any]:
+    """
+    Reads records from a JSON Lines file one at a time, keeping at most a few chunks of lines in memory.
+
+    The file is opened once and closed when iteration finishes or the caller stops early. Blank lines are skipped.
+
+    Args:
+        file_name: The name/path of the JSON Lines file to read from.
+        workers: If greater than 0, chunks of lines are decoded in this many worker processes while the file is
+                 read. Worth it for large files with large records; starting the processes takes a moment.
+        chunk_size: The number of lines decoded together, and sent to a worker process at a time.
+        with_offsets: If True, yields (byte offset, record) pairs. Offsets can be passed to read_jsonl later to
+                      read single records without scanning the file.
+        compression: 'infer' detects the compression from the file extension. It can also be given by name,
+                     or None to read the file as-is.
+        backend: The JSON backend, e.g. 'orjson'. Defaults to the manager's backend, see fastfs.utils.set_json_backend.
+
+    Yields:
+        Any: Each record in file order, or a (byte offset, record) tuple if with_offsets is True.
+    """
+    return fast_file_manager.iter_jsonl(file_name, workers=workers, chunk_size=chunk_size,
+                                        with_offsets=with_offsets, compression=compression, backend=backend)
+
+
+def read_jsonl(file_name: str, start: int = 0, stop: Union[None, int] = None,
+               offsets: Union[None, Iterable[int]] = None, compression: Union[None, str] = 'infer',
+               backend: Union[None, str] = None) -> List[Any]:
+    """
+    Reads records from a JSON Lines file, optionally only some of them.
+
+    Args:
+        file_name: The name/path of the JSON Lines file to read from.
+        start: The first line to read, counting from 0. Earlier lines are skipped without being decoded.
+        stop: The line to stop at (exclusive). Reading stops there, the rest of the file is never read.
+        offsets: Byte offsets of the records to read, e.g. from iter_jsonl(with_offsets=True). Only those lines
+                 are read. Can't be combined with start and stop.
+        compression: 'infer' detects the compression from the file extension. It can also be given by name,
+                     or None to read the file as-is. Seeking to offsets in compressed files decompresses up to them.
+        backend: The JSON backend, e.g. 'orjson'. Defaults to the manager's backend, see fastfs.utils.set_json_backend.
+
+    Returns:
+        List[Any]: The records, in file order for line ranges or in the order of offsets. Blank lines are skipped.
+    """
+    return fast_file_manager.read_jsonl(file_name, start=start, stop=stop, offsets=offsets, compression=compression,
+                                        backend=backend)
+
+
+def write_ini(file_name: str, data: Union[Dict[Any, Dict[Any, Any]], Dict[Any, Any]],
+              compression: Union[None, str] = 'infer', compression_level: Union[None, int] = None,
+              skip_if_unchanged: bool = False) -> bool:
     """
     Writes data to an INI file.
 
@@ -134,19 +472,102 @@ def write_ini(file_name: str, data: Union[Dict[Any, Dict[Any, Any]], Dict[Any, A
         file_name: The name/path of the file to write the data to.
         data: The data to write to the INI file. It can either be a dict or a dict of dicts.
         If data is only a dict, the data will be written to under the 'DEFAULT' section.
+        compression: 'infer' picks the compression from the file extension ('.gz', '.bz2', '.xz', '.zst', '.lz4').
+                     It can also be given by name ('gzip', 'bz2', 'xz', 'zstd', 'lz4'), or None to never compress.
+        compression_level: The compression level. Defaults to a fast level for each compression.
+        skip_if_unchanged: If True, the data is serialized in memory and compared with the digest recorded when the
+                           file was last written this way. The write is skipped if they match, see fastfs.digests.
+
+    Returns:
+        bool: False if the write was skipped because the file was unchanged, True otherwise.
     """
-    fast_file_manager.write_ini(file_name, data)
+    return fast_file_manager.write_ini(file_name, data, compression=compression, compression_level=compression_level,
+                                       skip_if_unchanged=skip_if_unchanged)
 
 
-def read_ini(file_name: str) -> Union[Dict[Any, Dict[Any, Any]], Dict[Any, Any]]:
+def read_ini(file_name: str,
+             compression: Union[None, str] = 'infer') -> Union[Dict[Any, Dict[Any, Any]], Dict[Any, Any]]:
     """
     Reads data from an INI file.
 
     Args:
         file_name: The name/path of the INI file to read from.
+        compression: 'infer' detects the compression from the file extension. It can also be given by name,
+                     or None to read the file as-is.
 
     Returns:
         Union[Dict[Any, Dict[Any, Any]], Dict[Any, Any]]: The data read from the INI file. 
         If the INI file has multiple sections, it returns a dict of dicts. If it only has a default section, it returns a flat dict.
     """
-    return fast_file_manager.read_ini(file_name)
+    return fast_file_manager.read_ini(file_name, compression=compression)
+
+
+def write_binary(file_name: str, file_data: bytes,
+                 compression: Union[None, str] = None, compression_level: Union[None, int] = None,
+                 skip_if_unchanged: bool = False) -> bool:
+    """
+    Writes bytes to a file.
+
+    Args:
+        file_name: The name/path of the file to write the data to.
+        file_data: The bytes to write.
+        compression: None (the default) writes the data as-is, even to a '.gz' file. 'infer' picks the compression
+                     from the file extension ('.gz', '.bz2', '.xz', '.zst', '.lz4'), and it can also be given by name
+                     ('gzip', 'bz2', 'xz', 'zstd', 'lz4').
+        compression_level: The compression level. Defaults to a fast level for each compression.
+        skip_if_unchanged: If True, the data is serialized in memory and compared with the digest recorded when the
+                           file was last written this way. The write is skipped if they match, see fastfs.digests.
+
+    Returns:
+        bool: False if the write was skipped because the file was unchanged, True otherwise.
+    """
+    return fast_file_manager.write_binary(file_name, file_data, compression=compression,
+                                          compression_level=compression_level, skip_if_unchanged=skip_if_unchanged)
+
+
+def read_binary(file_name: str, mmap: bool = False,
+                compression: Union[None, str] = None) -> Union[bytes, memoryview]:
+    """
+    Reads bytes from a file.
+
+    Args:
+        file_name: The name/path of the file to read from.
+        mmap: If True, the file is memory-mapped instead of copied into memory. See map_binary.
+        compression: None (the default) reads the file as-is, even a '.gz' file. 'infer' detects the compression
+                     from the file extension, and it can also be given by name.
+
+    Returns:
+        Union[bytes, memoryview]: The contents of the file, or a read-only memoryview of it if mmap is True.
+    """
+    return fast_file_manager.read_binary(file_name, mmap=mmap, compression=compression)
+
+
+def map_binary(file_name: str) -> memoryview:
+    """
+    Memory-maps a file without copying it. Pages are loaded from disk lazily as they are accessed.
+
+    The mapping stays valid for as long as the returned memoryview (or any slice of it) is referenced, and is
+    unmapped once it is released, e.g. when leaving a `with map_binary(...) as data:` block.
+
+    Args:
+        file_name: The name/path of the file to map.
+
+    Returns:
+        memoryview: A read-only view of the file's bytes.
+    """
+    return fast_file_manager.map_binary(file_name)
+
+
+def read_binary_into(file_name: str, buffer: Union[bytearray, memoryview], offset: int = 0) -> int:
+    """
+    Reads a file into an existing buffer, so hot loops can reuse one preallocated bytearray.
+
+    Args:
+        file_name: The name/path of the file to read from.
+        buffer: A writable buffer. At most len(buffer) bytes are read.
+        offset: The position in the file to start reading from.
+
+    Returns:
+        int: The number of bytes read. Less than len(buffer) if the end of the file was reached.
+    """
+    return fast_file_manager.read_binary_into(file_name, buffer, offset=offset)
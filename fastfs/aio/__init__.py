@@ -0,0 +1,278 @@
+# Asyncio versions of the fastfs functions. Blocking file I/O runs on a dedicated, bounded thread pool
+# so it never blocks the event loop.
+import asyncio
+import functools
+import weakref
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Iterable, List, Tuple, Union
+
+import fastfs
+import fastfs.utils
+import fastfs.extensions
+
+
+class AsyncFileManager():
+    """
+    Runs blocking fastfs calls on its own thread pool.
+
+    Args:
+        max_workers: The number of I/O threads.
+        max_concurrency: The maximum number of calls this instance runs at once, per event loop.
+                         Defaults to max_workers. Extra calls wait without occupying a thread.
+    """
+
+    def __init__(self, max_workers: int = 32, max_concurrency: Union[None, int] = None):
+        self.max_workers = max_workers
+        self.max_concurrency = max_concurrency if max_concurrency is not None else max_workers
+
+        self._executor = None
+        self._semaphores = weakref.WeakKeyDictionary()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix='fastfs-aio')
+        return self._executor
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # Semaphores are bound to the event loop they are first used on
+        loop = asyncio.get_running_loop()
+
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphores[loop] = semaphore
+
+        return semaphore
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """Runs func(*args, **kwargs) on the I/O thread pool and returns its result."""
+        async with self._get_semaphore():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), functools.partial(func, *args, **kwargs))
+
+    async def gather(self, func: Callable, args_ls: Iterable[tuple], limit: Union[None, int] = None,
+                     return_exceptions: bool = False) -> List[Any]:
+        """
+        Calls func(*args) for every args tuple with at most `limit` calls in flight.
+
+        Args:
+            func: The blocking function to call, e.g. fastfs.read_json.
+            args_ls: The positional arguments of each call.
+            limit: The maximum number of concurrent calls. Defaults to max_concurrency.
+            return_exceptions: If True, exceptions are returned in place of results instead of being raised.
+
+        Returns:
+            List[Any]: The results, in the same order as args_ls.
+        """
+        args_ls = list(args_ls)
+        results = [None] * len(args_ls)
+        pending = iter(enumerate(args_ls))
+
+        # A fixed number of workers pulling from one iterator avoids creating a task per file
+        async def worker():
+            for idx, args in pending:
+                try:
+                    results[idx] = await self.run(func, *args)
+                except Exception as exc:
+                    if not return_exceptions:
+                        raise
+                    results[idx] = exc
+
+        limit = limit if limit is not None else self.max_concurrency
+        workers = [asyncio.ensure_future(worker())
+                   for _ in range(max(1, min(limit, len(args_ls))))]
+
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers:
+                task.cancel()
+
+        return results
+
+    async def iterate(self, iterator_func: Callable, *args, **kwargs) -> AsyncIterator[Any]:
+        """Consumes a blocking generator such as fastfs.utils.iter_directory, one item per thread pool call."""
+        iterator = await self.run(iterator_func, *args, **kwargs)
+        done = object()
+
+        try:
+            while True:
+                item = await self.run(next, iterator, done)
+
+                if item is done:
+                    return
+
+                yield item
+        finally:
+            await self.run(iterator.close)
+
+    def shutdown(self, wait: bool = True):
+        """Shuts down the thread pool. It is recreated if the instance is used again."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+
+# The instance used by the module-level functions below
+async_file_manager = AsyncFileManager()
+
+
+def _asyncify(func: Callable) -> Callable:
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        return await async_file_manager.run(func, *args, **kwargs)
+
+    wrapper.__module__ = __name__
+    wrapper.__doc__ = f"Asynchronous version of {func.__module__}.{func.__name__}.\n{func.__doc__ or ''}"
+    return wrapper
+
+
+async def read_many(file_names: Iterable[str], read_func: Callable = fastfs.read_json,
+                    limit: Union[None, int] = None, return_exceptions: bool = False) -> List[Any]:
+    """
+    Reads many files concurrently.
+
+    Args:
+        file_names: The names/paths of the files to read.
+        read_func: The blocking fastfs read function to use, e.g. fastfs.read_pickle.
+        limit: The maximum number of concurrent reads.
+        return_exceptions: If True, exceptions are returned in place of results instead of being raised.
+
+    Returns:
+        List[Any]: The data read from each file, in the same order as file_names.
+    """
+    return await async_file_manager.gather(read_func, ((file_name,) for file_name in file_names),
+                                           limit=limit, return_exceptions=return_exceptions)
+
+
+async def write_many(files: Iterable[Tuple[str, Any]], write_func: Callable = fastfs.write_json,
+                     limit: Union[None, int] = None, return_exceptions: bool = False) -> List[Any]:
+    """
+    Writes many files concurrently.
+
+    Args:
+        files: (file_name, file_data) pairs to write.
+        write_func: The blocking fastfs write function to use, e.g. fastfs.write_pickle.
+        limit: The maximum number of concurrent writes.
+        return_exceptions: If True, exceptions are returned in place of None instead of being raised.
+
+    Returns:
+        List[Any]: None for each written file (or its exception), in the same order as files.
+    """
+    return await async_file_manager.gather(write_func, files, limit=limit, return_exceptions=return_exceptions)
+
+
+def iter_directory(directory_name: str, *args, **kwargs) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    Asynchronous version of fastfs.utils.iter_directory. Use with `async for`.
+    """
+    return async_file_manager.iterate(fastfs.utils.iter_directory, directory_name, *args, **kwargs)
+
+
+def iter_csv(file_name: str, *args, **kwargs) -> AsyncIterator[Any]:
+    """
+    Asynchronous version of fastfs.iter_csv. Use with `async for`.
+    """
+    return async_file_manager.iterate(fastfs.iter_csv, file_name, *args, **kwargs)
+
+
+def iter_jsonl(file_name: str, *args, **kwargs) -> AsyncIterator[Any]:
+    """
+    Asynchronous version of fastfs.iter_jsonl. Use with `async for`.
+    """
+    return async_file_manager.iterate(fastfs.iter_jsonl, file_name, *args, **kwargs)
+
+
+def iter_lines(file_name: str, *args, **kwargs) -> AsyncIterator[Any]:
+    """
+    Asynchronous version of fastfs.iter_lines. Use with `async for`.
+    """
+    return async_file_manager.iterate(fastfs.iter_lines, file_name, *args, **kwargs)
+
+
+def iter_hdf5(file_name: str, *args, **kwargs) -> AsyncIterator[Any]:
+    """
+    Asynchronous version of fastfs.extensions.iter_hdf5. Use with `async for`.
+    """
+    return async_file_manager.iterate(fastfs.extensions.iter_hdf5, file_name, *args, **kwargs)
+
+
+def iter_dataframe(file_name: str, *args, **kwargs) -> AsyncIterator[Any]:
+    """
+    Asynchronous version of fastfs.extensions.iter_dataframe. Use with `async for`.
+    """
+    return async_file_manager.iterate(fastfs.extensions.iter_dataframe, file_name, *args, **kwargs)
+
+
+# fastfs
+write_pickle = _asyncify(fastfs.write_pickle)
+write_json = _asyncify(fastfs.write_json)
+write_csv = _asyncify(fastfs.write_csv)
+read_csv = _asyncify(fastfs.read_csv)
+write_file = _asyncify(fastfs.write_file)
+read_pickle = _asyncify(fastfs.read_pickle)
+read_json = _asyncify(fastfs.read_json)
+read_file = _asyncify(fastfs.read_file)
+write_lines = _asyncify(fastfs.write_lines)
+append_lines = _asyncify(fastfs.append_lines)
+# Opened on the thread pool like open_pack, the returned handle's methods are blocking
+open_line_writer = _asyncify(fastfs.open_line_writer)
+tail_lines = _asyncify(fastfs.tail_lines)
+count_lines = _asyncify(fastfs.count_lines)
+split_line_ranges = _asyncify(fastfs.split_line_ranges)
+read_lines = _asyncify(fastfs.read_lines)
+write_jsonl = _asyncify(fastfs.write_jsonl)
+append_jsonl = _asyncify(fastfs.append_jsonl)
+read_jsonl = _asyncify(fastfs.read_jsonl)
+write_ini = _asyncify(fastfs.write_ini)
+read_ini = _asyncify(fastfs.read_ini)
+write_binary = _asyncify(fastfs.write_binary)
+read_binary = _asyncify(fastfs.read_binary)
+map_binary = _asyncify(fastfs.map_binary)
+read_binary_into = _asyncify(fastfs.read_binary_into)
+
+# fastfs.utils
+get_fs_directory = _asyncify(fastfs.utils.get_fs_directory)
+reload_config = _asyncify(fastfs.utils.reload_config)
+ls = _asyncify(fastfs.utils.ls)
+sorted_ls = _asyncify(fastfs.utils.sorted_ls)
+create_fs = _asyncify(fastfs.utils.create_fs)
+file_exists = _asyncify(fastfs.utils.file_exists)
+touch_file = _asyncify(fastfs.utils.touch_file)
+delete_file = _asyncify(fastfs.utils.delete_file)
+delete_directory = _asyncify(fastfs.utils.delete_directory)
+touch_directory = _asyncify(fastfs.utils.touch_directory)
+get_directory_info = _asyncify(fastfs.utils.get_directory_info)
+get_file_info = _asyncify(fastfs.utils.get_file_info)
+bulk_write_directory = _asyncify(fastfs.utils.bulk_write_directory)
+bulk_read_directory = _asyncify(fastfs.utils.bulk_read_directory)
+write_pack = _asyncify(fastfs.utils.write_pack)
+append_pack = _asyncify(fastfs.utils.append_pack)
+open_pack = _asyncify(fastfs.utils.open_pack)
+enable_read_cache = _asyncify(fastfs.utils.enable_read_cache)
+disable_read_cache = _asyncify(fastfs.utils.disable_read_cache)
+invalidate_read_cache = _asyncify(fastfs.utils.invalidate_read_cache)
+enable_instrumentation = _asyncify(fastfs.utils.enable_instrumentation)
+disable_instrumentation = _asyncify(fastfs.utils.disable_instrumentation)
+set_write_options = _asyncify(fastfs.utils.set_write_options)
+set_json_backend = _asyncify(fastfs.utils.set_json_backend)
+get_json_backend = _asyncify(fastfs.utils.get_json_backend)
+enable_listing_index = _asyncify(fastfs.utils.enable_listing_index)
+disable_listing_index = _asyncify(fastfs.utils.disable_listing_index)
+save_listing_indexes = _asyncify(fastfs.utils.save_listing_indexes)
+# write_batch is not mirrored: batches are per thread and can't span coroutines
+
+# fastfs.extensions
+write_yaml = _asyncify(fastfs.extensions.write_yaml)
+read_yaml = _asyncify(fastfs.extensions.read_yaml)
+write_hdf5 = _asyncify(fastfs.extensions.write_hdf5)
+append_hdf5 = _asyncify(fastfs.extensions.append_hdf5)
+read_hdf5 = _asyncify(fastfs.extensions.read_hdf5)
+list_hdf5_datasets = _asyncify(fastfs.extensions.list_hdf5_datasets)
+# Opened on the thread pool like open_pack, the returned handle's methods are blocking
+open_hdf5 = _asyncify(fastfs.extensions.open_hdf5)
+write_dataframe = _asyncify(fastfs.extensions.write_dataframe)
+read_dataframe = _asyncify(fastfs.extensions.read_dataframe)
+read_csv_columns = _asyncify(fastfs.extensions.read_csv_columns)
@@ -0,0 +1,2 @@
+from fastfs.bench.core import BENCHMARKS, PAYLOAD_SIZES, PROFILES, Benchmark, BenchmarkContext, benchmark
+from fastfs.bench.core import compare_results, load_results, measure, run_benchmarks, save_results
@@ -0,0 +1,108 @@
+import argparse
+import sys
+
+from typing import Any, Dict, List, Union
+
+from fastfs.bench.core import PAYLOAD_SIZES, PROFILES, compare_results, load_results, run_benchmarks, save_results
+
+
+def _format_bytes(num_bytes: float) -> str:
+    for unit in ('B', 'KB', 'MB'):
+        if num_bytes < 1024:
+            return f'{num_bytes:.0f}{unit}'
+        num_bytes /= 1024
+
+    return f'{num_bytes:.1f}GB'
+
+
+def print_results(results: Dict[str, Any]):
+    print(f"{'benchmark':<36} {'ops/s':>10} {'MB/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'peak mem':>9}")
+
+    for key, result in results['results'].items():
+        peak = _format_bytes(result['peak_memory_bytes']) if 'peak_memory_bytes' in result else '-'
+
+        print(f"{key:<36} {result['ops_per_second']:>10.1f} {result['mb_per_second']:>9.1f} "
+              f"{result['latency_p50_ms']:>9.3f} {result['latency_p99_ms']:>9.3f} {peak:>9}")
+
+    for name, reason in results.get('skipped', {}).items():
+        print(f'{name:<36} skipped, {reason}')
+
+
+def print_comparison(comparisons: List[Dict[str, Any]], threshold: float) -> int:
+    regressions = [comparison for comparison in comparisons if comparison['regression']]
+
+    for comparison in comparisons:
+        marker = 'REGRESSION' if comparison['regression'] else ''
+        print(f"{comparison['benchmark']:<36} {comparison['metric']:<18} {comparison['baseline']:>12.3f} "
+              f"{comparison['current']:>12.3f} {comparison['change']:>+8.1%} {marker}")
+
+    print(f'{len(regressions)} regression(s) worse than {threshold:.0%} across {len(comparisons)} comparisons')
+
+    return len(regressions)
+
+
+def _csv_list(value: str) -> List[str]:
+    return [item for item in value.split(',') if item]
+
+
+def main(argv: Union[None, List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='python -m fastfs.bench', description='Benchmarks the fastfs readers, writers and directory operations.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help='run the benchmarks')
+    run_parser.add_argument('--profile', choices=list(PROFILES), default='quick',
+                            help='payload and directory sizes to run (default: quick)')
+    run_parser.add_argument('--filter', type=_csv_list, default=None,
+                            help='comma-separated substrings of the benchmark names to run')
+    run_parser.add_argument('--payloads', type=_csv_list, default=None,
+                            help=f"comma-separated payload sizes, overriding the profile ({', '.join(PAYLOAD_SIZES)})")
+    run_parser.add_argument('--directories', type=lambda value: [int(item) for item in _csv_list(value)],
+                            default=None, help='comma-separated directory sizes in files, overriding the profile')
+    run_parser.add_argument('--workers', type=int, default=1,
+                            help='workers for the bulk directory operations')
+    run_parser.add_argument('--min-time', type=float, default=0.5,
+                            help='minimum seconds spent timing each benchmark')
+    run_parser.add_argument('--no-memory', action='store_true',
+                            help='skip the tracemalloc peak memory measurement')
+    run_parser.add_argument('--work-dir', default=None,
+                            help='directory to write the benchmark files to (default: a temporary directory)')
+    run_parser.add_argument('--output', '-o', default=None,
+                            help='file to save the JSON results to')
+    run_parser.add_argument('--baseline', default=None,
+                            help='results file to compare this run against')
+    run_parser.add_argument('--threshold', type=float, default=0.1,
+                            help='relative slowdown counted as a regression (default: 0.1)')
+
+    compare_parser = subparsers.add_parser('compare', help='compare two saved runs')
+    compare_parser.add_argument('baseline', help='results file of the reference run')
+    compare_parser.add_argument('current', help='results file of the run to check')
+    compare_parser.add_argument('--threshold', type=float, default=0.1,
+                                help='relative slowdown counted as a regression (default: 0.1)')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'compare':
+        comparisons = compare_results(load_results(args.baseline), load_results(args.current),
+                                      threshold=args.threshold)
+        return 1 if print_comparison(comparisons, args.threshold) else 0
+
+    results = run_benchmarks(profile=args.profile, names=args.filter, payloads=args.payloads,
+                             directories=args.directories, work_dir=args.work_dir, workers=args.workers,
+                             min_time=args.min_time, memory=not args.no_memory,
+                             progress=lambda key: print(f'running {key}', file=sys.stderr))
+
+    print_results(results)
+
+    if args.output is not None:
+        save_results(results, args.output)
+
+    if args.baseline is not None:
+        comparisons = compare_results(load_results(args.baseline), results, threshold=args.threshold)
+        return 1 if print_comparison(comparisons, args.threshold) else 0
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,310 @@
+import mmap
+import os
+
+from typing import Any, Callable, Dict, List, Tuple
+
+from fastfs.bench.core import PAYLOAD_SIZES, BenchmarkContext, Prepared, benchmark
+from fastfs.file_managers.fast_file_manager import FastFileManager
+
+
+# Encoded size of one record in JSON, roughly
+RECORD_BYTES = 100
+
+COLUMNS = ['id', 'name', 'email', 'score', 'active']
+
+
+def make_records(size: str) -> List[Dict[str, Any]]:
+    """Returns JSON-like records that encode to about PAYLOAD_SIZES[size] bytes."""
+    return [{'id': idx, 'name': f'user-{idx}', 'email': f'user-{idx}@example.com', 'score': idx * 0.5,
+             'active': idx % 2 == 0} for idx in range(max(1, PAYLOAD_SIZES[size] // RECORD_BYTES))]
+
+
+def make_rows(size: str) -> List[list]:
+    return [[record[column] for column in COLUMNS] for record in make_records(size)]
+
+
+def make_lines(size: str) -> List[str]:
+    return [f"{record['id']},{record['name']},{record['email']}" for record in make_records(size)]
+
+
+def make_bytes(size: str) -> bytes:
+    pattern = bytes(range(256))
+    return (pattern * (PAYLOAD_SIZES[size] // len(pattern) + 1))[:PAYLOAD_SIZES[size]]
+
+
+def make_ini(size: str) -> Dict[str, Dict[str, str]]:
+    return {f"section-{record['id']}": {'name': record['name'], 'email': record['email']}
+            for record in make_records(size)}
+
+
+def _codec(name: str, extension: str, make_data: Callable[[str], Any],
+           write: Callable[[BenchmarkContext, str, Any], Any],
+           reads: Dict[str, tuple], requires: Tuple[str, ...] = ()):
+    """
+    Registers write_<name> plus one benchmark per entry of reads, all sharing the same payload.
+
+    reads maps a benchmark name to the read function, a function counting the items it returned and
+    optionally the modules it needs on top of requires.
+    """
+    def file_name(context: BenchmarkContext, size: str) -> str:
+        return context.path(f'{name}-{size}.{extension}')
+
+    def setup_write(context: BenchmarkContext, size: str) -> Prepared:
+        path, data = file_name(context, size), make_data(size)
+        write(context, path, data)
+
+        return (lambda: write(context, path, data)), os.path.getsize(path), len(data)
+
+    benchmark(f'write_{name}', 'codec', requires)(setup_write)
+
+    for read_name, (read, count, *read_requires) in reads.items():
+        def setup_read(context: BenchmarkContext, size: str, read=read, count=count) -> Prepared:
+            path = file_name(context, size)
+            write(context, path, make_data(size))
+
+            return (lambda: read(context, path)), os.path.getsize(path), count(read(context, path))
+
+        benchmark(read_name, 'codec', requires + tuple(*read_requires))(setup_read)
+
+
+def _consume(iterator) -> int:
+    count = 0
+
+    for _ in iterator:
+        count += 1
+
+    return count
+
+
+_codec('json', 'json', make_records,
+       lambda context, path, data: context.manager.write_json(path, data),
+       {'read_json': (lambda context, path: context.manager.read_json(path), len)})
+
+# Compressed files stream through the same readers and writers
+_codec('json_gz', 'json.gz', make_records,
+       lambda context, path, data: context.manager.write_json(path, data),
+       {'read_json_gz': (lambda context, path: context.manager.read_json(path), len)})
+
+# The same payload through each JSON backend, to compare them side by side
+for _backend, _requires in (('json', ()), ('orjson', ('orjson',)), ('ujson', ('ujson',)), ('simdjson', ('simdjson',))):
+    _codec(f'json_{_backend}', 'json', make_records,
+           lambda context, path, data, backend=_backend: context.manager.write_json(path, data, backend=backend),
+           {f'read_json_{_backend}': (
+               lambda context, path, backend=_backend: context.manager.read_json(path, backend=backend), len)},
+           requires=_requires)
+
+_codec('jsonl', 'jsonl', make_records,
+       lambda context, path, data: context.manager.write_jsonl(path, data),
+       {'read_jsonl': (lambda context, path: context.manager.read_jsonl(path), len),
+        'iter_jsonl': (lambda context, path: _consume(context.manager.iter_jsonl(path)), lambda records: records)})
+
+_codec('pickle', 'pickle', make_records,
+       lambda context, path, data: context.manager.write_pickle(path, data),
+       {'read_pickle': (lambda context, path: context.manager.read_pickle(path), len)})
+
+_codec('csv', 'csv', make_rows,
+       lambda context, path, data: context.manager.write_csv(path, data, header=COLUMNS),
+       {'read_csv': (lambda context, path: context.manager.read_csv(path), lambda result: len(result[1])),
+        'read_csv_dicts': (lambda context, path: context.manager.read_csv(path, return_list_of_dicts=True), len),
+        'iter_csv': (lambda context, path: sum(len(rows) for _, rows in context.manager.iter_csv(path)),
+                     lambda rows: rows),
+        'read_csv_columns': (lambda context, path: context.manager.read_csv_columns(path),
+                             lambda columns: len(columns['id']), ('numpy',))})
+
+_codec('file', 'txt', lambda size: '\n'.join(make_lines(size)),
+       lambda context, path, data: context.manager.write_file(path, data),
+       {'read_file': (lambda context, path: context.manager.read_file(path), lambda text: text.count('\n') + 1)})
+
+_codec('lines', 'txt', make_lines,
+       lambda context, path, data: context.manager.write_lines(path, data),
+       {'read_lines': (lambda context, path: context.manager.read_lines(path), len),
+        'iter_lines': (lambda context, path: _consume(context.manager.iter_lines(path)), lambda lines: lines),
+        'iter_line_batches': (lambda context, path: sum(map(len, context.manager.iter_lines(path, batches=True))),
+                              lambda lines: lines),
+        'count_lines': (lambda context, path: context.manager.count_lines(path), lambda lines: lines),
+        'tail_lines': (lambda context, path: context.manager.tail_lines(path, 100), len)})
+
+_codec('ini', 'ini', make_ini,
+       lambda context, path, data: context.manager.write_ini(path, data),
+       {'read_ini': (lambda context, path: context.manager.read_ini(path), len)})
+
+def _touch_mapping(context: BenchmarkContext, path: str) -> int:
+    # One byte per page faults the whole mapping in, without copying it or checksumming every byte
+    with context.manager.read_binary(path, mmap=True) as view:
+        return sum(view[::mmap.PAGESIZE])
+
+
+_codec('binary', 'bin', make_bytes,
+       lambda context, path, data: context.manager.write_binary(path, data),
+       {'read_binary': (lambda context, path: context.manager.read_binary(path), lambda data: 1),
+        'read_binary_mmap': (_touch_mapping, lambda checksum: 1)})
+
+_codec('yaml', 'yaml', make_records,
+       lambda context, path, data: context.manager.write_yaml(path, data),
+       {'read_yaml': (lambda context, path: context.manager.read_yaml(path), len)},
+       requires=('yaml',))
+
+
+def _cached_read(extension: str, return_mode: str):
+    def setup(context: BenchmarkContext, size: str) -> Prepared:
+        # A manager of its own, so the other benchmarks keep reading uncached
+        manager = FastFileManager()
+        manager.enable_read_cache(return_mode=return_mode)
+
+        path = context.path(f'cached-{return_mode}-{size}.{extension}')
+        read = manager.read_json if extension == 'json' else manager.read_yaml
+
+        (manager.write_json if extension == 'json' else manager.write_yaml)(path, make_records(size))
+
+        return (lambda: read(path)), os.path.getsize(path), len(read(path))
+
+    return setup
+
+
+# Compare with read_json and read_yaml: hits skip reading and decoding the file
+for _extension, _requires in (('json', ()), ('yaml', ('yaml',))):
+    for _mode in ('copy', 'view'):
+        benchmark(f'read_{_extension}_cached_{_mode}', 'codec', _requires)(_cached_read(_extension, _mode))
+
+
+def _make_array(size: str):
+    import numpy as np
+
+    return np.arange(PAYLOAD_SIZES[size] // 8, dtype=np.float64)
+
+
+_codec('hdf5', 'hdf5', _make_array,
+       lambda context, path, data: context.manager.write_hdf5(path, data),
+       {'read_hdf5': (lambda context, path: context.manager.read_hdf5(path), len),
+        'read_hdf5_slice': (lambda context, path: context.manager.read_hdf5(path, slice=slice(0, 1024)), len),
+        'iter_hdf5': (lambda context, path: sum(map(len, context.manager.iter_hdf5(path, rows=65536))),
+                      lambda rows: rows)},
+       requires=('h5py', 'numpy'))
+
+_codec('hdf5_gzip', 'hdf5', _make_array,
+       lambda context, path, data: context.manager.write_hdf5(path, data, compression='gzip', compression_level=1),
+       {'read_hdf5_gzip': (lambda context, path: context.manager.read_hdf5(path), len)},
+       requires=('h5py', 'numpy'))
+
+
+def _make_dataframe(size: str):
+    import pandas as pd
+
+    return pd.DataFrame(make_rows(size), columns=COLUMNS)
+
+
+_codec('dataframe', 'csv', _make_dataframe,
+       lambda context, path, data: context.manager.write_dataframe(path, data, index=False),
+       {'read_dataframe': (lambda context, path: context.manager.read_dataframe(path), len)},
+       requires=('pandas',))
+
+# The binary formats against the CSV path above, with the same rows
+for _name, _extension, _requires in (('dataframe_pickle', 'pickle', ()), ('dataframe_feather', 'feather', ('pyarrow',)),
+                                     ('dataframe_parquet', 'parquet', ('pyarrow',)),
+                                     ('dataframe_hdf5', 'h5', ('tables',))):
+    _codec(_name, _extension, _make_dataframe,
+           lambda context, path, data: context.manager.write_dataframe(path, data, index=False),
+           {f'read_{_name}': (lambda context, path: context.manager.read_dataframe(path), len),
+            f'read_{_name}_column': (lambda context, path: context.manager.read_dataframe(path, columns=[COLUMNS[0]]),
+                                     len)},
+           requires=('pandas',) + _requires)
+
+
+def _make_arrays(size: str) -> Dict[str, Any]:
+    import numpy as np
+
+    # A model-checkpoint-like payload: a few large arrays and a little metadata
+    weights = np.frombuffer(make_bytes(size), dtype=np.uint8).copy()
+
+    return {'weights': weights, 'bias': weights[:len(weights) // 2].copy(), 'epoch': 3}
+
+
+# Protocol 5 out-of-band buffers against a regular pickle of the same arrays
+for _name, _out_of_band in (('pickle_arrays', False), ('pickle_out_of_band', True)):
+    _codec(_name, 'pickle', _make_arrays,
+           lambda context, path, data, out_of_band=_out_of_band: context.manager.write_pickle(
+               path, data, out_of_band=out_of_band),
+           {f'read_{_name}': (lambda context, path: context.manager.read_pickle(path), len)},
+           requires=('numpy',))
+
+_codec('pickle_out_of_band_mmap', 'pickle', _make_arrays,
+       lambda context, path, data: context.manager.write_pickle(path, data, out_of_band=True),
+       {'read_pickle_out_of_band_mmap': (lambda context, path: context.manager.read_pickle(path, mmap=True), len)},
+       requires=('numpy',))
+
+
+def _directory_bytes(directory_name: str) -> int:
+    with os.scandir(directory_name) as entries:
+        return sum(entry.stat().st_size for entry in entries if entry.is_file())
+
+
+@benchmark('bulk_write_directory', 'directory')
+def _bulk_write_directory(context: BenchmarkContext, num_files: int) -> Prepared:
+    directory_name = context.path(f'bulk-write-{num_files}')
+    file_data_ls = [make_records('small')] * num_files
+
+    def run():
+        return context.manager.bulk_write_directory(directory_name, file_data_ls, 'json', workers=context.workers)
+
+    run()
+
+    return run, _directory_bytes(directory_name), num_files
+
+
+@benchmark('bulk_read_directory', 'directory')
+def _bulk_read_directory(context: BenchmarkContext, num_files: int) -> Prepared:
+    directory_name = context.directory(num_files)
+
+    return (lambda: context.manager.bulk_read_directory(directory_name, workers=context.workers)), \
+        _directory_bytes(directory_name), num_files
+
+
+@benchmark('bulk_write_pack', 'directory')
+def _bulk_write_pack(context: BenchmarkContext, num_files: int) -> Prepared:
+    pack_name = context.path(f'bulk-write-{num_files}.pack')
+    file_data_ls = [make_records('small')] * num_files
+
+    def run():
+        return context.manager.bulk_write_directory(pack_name, file_data_ls, 'json', pack=True)
+
+    run()
+
+    return run, os.path.getsize(pack_name), num_files
+
+
+@benchmark('bulk_read_pack', 'directory')
+def _bulk_read_pack(context: BenchmarkContext, num_files: int) -> Prepared:
+    pack_name = context.path(f'bulk-read-{num_files}.pack')
+
+    context.manager.bulk_write_directory(pack_name, [make_records('small')] * num_files, 'json', pack=True)
+
+    return (lambda: context.manager.bulk_read_directory(pack_name)), os.path.getsize(pack_name), num_files
+
+
+@benchmark('iter_directory', 'directory')
+def _iter_directory(context: BenchmarkContext, num_files: int) -> Prepared:
+    directory_name = context.directory(num_files)
+
+    return (lambda: _consume(context.manager.iter_directory(directory_name))), \
+        _directory_bytes(directory_name), num_files
+
+
+@benchmark('ls', 'directory')
+def _ls(context: BenchmarkContext, num_files: int) -> Prepared:
+    directory_name = context.directory(num_files)
+
+    return (lambda: context.manager.ls(directory_name)), 0, num_files
+
+
+@benchmark('sorted_ls', 'directory')
+def _sorted_ls(context: BenchmarkContext, num_files: int) -> Prepared:
+    directory_name = context.directory(num_files)
+
+    return (lambda: context.manager.sorted_ls(directory_name, 'numeric')), 0, num_files
+
+
+@benchmark('get_directory_info', 'directory')
+def _get_directory_info(context: BenchmarkContext, num_files: int) -> Prepared:
+    directory_name = context.directory(num_files)
+
+    return (lambda: context.manager.get_directory_info(directory_name, workers=context.workers)), 0, num_files
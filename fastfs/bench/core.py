@@ -0,0 +1,312 @@
+import importlib.util
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from typing import Any, Callable, Dict, Iterable, List, Tuple, Union
+
+from fastfs.file_managers.fast_file_manager import FastFileManager
+
+
+RESULTS_VERSION = 1
+
+# Approximate encoded size of each payload, see cases.make_records
+PAYLOAD_SIZES = {
+    'small': 1024,
+    'medium': 100 * 1024,
+    'large': 10 * 1024 * 1024,
+}
+
+PROFILES = {
+    'quick': {'payloads': ('small', 'medium'), 'directories': (1000,)},
+    'default': {'payloads': ('small', 'medium', 'large'), 'directories': (1000, 10000)},
+    'full': {'payloads': ('small', 'medium', 'large'), 'directories': (1000, 10000, 100000, 1000000)},
+}
+
+PERCENTILES = (50, 90, 99)
+
+# Setup functions return the callable to time, the bytes and the items (files, rows, ...) it handles per call
+Prepared = Tuple[Callable[[], Any], int, int]
+
+
+class Benchmark():
+    """
+    A registered benchmark.
+
+    setup(context, size) prepares the inputs of one run and returns a Prepared tuple. size is a PAYLOAD_SIZES
+    name for the 'codec' group and a number of files for the 'directory' group.
+    """
+
+    def __init__(self, name: str, group: str, setup: Callable[['BenchmarkContext', Union[str, int]], Prepared],
+                 requires: Tuple[str, ...] = ()):
+        self.name = name
+        self.group = group
+        self.setup = setup
+        self.requires = requires
+
+    def missing_requirements(self) -> List[str]:
+        return [module for module in self.requires if importlib.util.find_spec(module) is None]
+
+
+BENCHMARKS: Dict[str, Benchmark] = {}
+
+
+def benchmark(name: str, group: str, requires: Tuple[str, ...] = ()):
+    """Registers the decorated setup function as a benchmark."""
+    def decorator(setup):
+        BENCHMARKS[name] = Benchmark(name, group, setup, requires)
+        return setup
+
+    return decorator
+
+
+class BenchmarkContext():
+    """The working directory and file manager shared by the benchmarks of one run."""
+
+    def __init__(self, work_dir: str, workers: int = 1):
+        self.work_dir = work_dir
+        self.workers = workers
+        self.manager = FastFileManager()
+
+        self._directories: Dict[Tuple[int, str], str] = {}
+
+    def path(self, *parts: str) -> str:
+        # Absolute paths are never rewritten into the fastfs directory
+        return os.path.join(self.work_dir, *parts)
+
+    def directory(self, num_files: int, data_type: str = 'json') -> str:
+        """Returns a directory of num_files small files, creating it on first use."""
+        key = (num_files, data_type)
+
+        if key not in self._directories:
+            from fastfs.bench.cases import make_records
+
+            directory_name = self.path(f'dir-{data_type}-{num_files}')
+            self.manager.bulk_write_directory(directory_name, [make_records(
+                'small')] * num_files, data_type, workers=max(self.workers, 4))
+            self._directories[key] = directory_name
+
+        return self._directories[key]
+
+
+def _percentile(sorted_values: List[float], percentile: float) -> float:
+    # Nearest-rank percentile
+    idx = max(0, -(-len(sorted_values) * percentile // 100) - 1)
+    return sorted_values[int(idx)]
+
+
+def measure(func: Callable[[], Any], bytes_per_call: int = 0, items_per_call: int = 1, min_time: float = 0.5,
+            min_calls: int = 3, max_calls: int = 1000, memory: bool = True) -> Dict[str, float]:
+    """
+    Times func until both min_time seconds and min_calls calls are reached (or max_calls calls are made),
+    after one warm-up call.
+
+    Peak memory is measured with tracemalloc in a separate call, since tracing slows down the timed calls.
+    """
+    func()
+
+    latencies = []
+    start = time.perf_counter()
+
+    while len(latencies) < max_calls and (len(latencies) < min_calls or time.perf_counter() - start < min_time):
+        call_start = time.perf_counter()
+        func()
+        latencies.append(time.perf_counter() - call_start)
+
+    total = sum(latencies)
+    calls = len(latencies)
+    latencies.sort()
+
+    result = {
+        'calls': calls,
+        'seconds': total,
+        'ops_per_second': calls / total if total else float('inf'),
+        'items_per_second': calls * items_per_call / total if total else float('inf'),
+        'mb_per_second': calls * bytes_per_call / total / 1024 / 1024 if total else float('inf'),
+        'bytes_per_call': bytes_per_call,
+        'latency_mean_ms': total / calls * 1000,
+        'latency_max_ms': latencies[-1] * 1000,
+    }
+
+    for percentile in PERCENTILES:
+        result[f'latency_p{percentile}_ms'] = _percentile(
+            latencies, percentile) * 1000
+
+    if memory:
+        tracemalloc.start()
+        try:
+            func()
+            result['peak_memory_bytes'] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return result
+
+
+def _metadata(profile: Union[None, str], payloads: Iterable[str], directories: Iterable[int], workers: int) -> Dict[str, Any]:
+    optional = {}
+
+    for module in ('orjson', 'yaml', 'numpy', 'pandas', 'h5py', 'pyarrow', 'tables'):
+        optional[module] = importlib.util.find_spec(module) is not None
+
+    return {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': sys.version.split()[0],
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'profile': profile,
+        'payloads': list(payloads),
+        'directories': list(directories),
+        'workers': workers,
+        'optional_dependencies': optional,
+    }
+
+
+def _selected(name: str, patterns: Union[None, Iterable[str]]) -> bool:
+    return patterns is None or any(pattern in name for pattern in patterns)
+
+
+def run_benchmarks(profile: str = 'quick', names: Union[None, Iterable[str]] = None,
+                   payloads: Union[None, Iterable[str]] = None, directories: Union[None, Iterable[int]] = None,
+                   work_dir: Union[None, str] = None, workers: int = 1, min_time: float = 0.5, min_calls: int = 3,
+                   memory: bool = True, progress: Union[None, Callable[[str], None]] = None) -> Dict[str, Any]:
+    """
+    Runs the registered benchmarks and returns their results, ready to be saved with save_results.
+
+    Benchmarks are selected by substring match against names. payloads and directories override the
+    sizes of the profile. Files are written under a temporary directory (or work_dir), removed afterwards.
+    """
+    # Registers the built-in benchmarks
+    import fastfs.bench.cases  # noqa: F401
+
+    if profile not in PROFILES:
+        raise ValueError(
+            f"Unknown profile {profile}. Supported profiles: {', '.join(PROFILES)}")
+
+    payloads = tuple(payloads if payloads is not None else PROFILES[profile]['payloads'])
+    directories = tuple(directories if directories is not None else PROFILES[profile]['directories'])
+
+    for payload in payloads:
+        if payload not in PAYLOAD_SIZES:
+            raise ValueError(
+                f"Unknown payload {payload}. Supported payloads: {', '.join(PAYLOAD_SIZES)}")
+
+    names = tuple(names) if names is not None else None
+
+    results = {}
+    skipped = {}
+
+    owns_work_dir = work_dir is None
+    if owns_work_dir:
+        work_dir = tempfile.mkdtemp(prefix='fastfs-bench-')
+    else:
+        os.makedirs(work_dir, exist_ok=True)
+
+    try:
+        context = BenchmarkContext(work_dir, workers=workers)
+
+        for bench in BENCHMARKS.values():
+            if not _selected(bench.name, names):
+                continue
+
+            missing = bench.missing_requirements()
+            if missing:
+                skipped[bench.name] = f"requires {', '.join(missing)}"
+                continue
+
+            sizes = payloads if bench.group == 'codec' else directories
+
+            for size in sizes:
+                key = f'{bench.name}[{size}]'
+
+                if progress is not None:
+                    progress(key)
+
+                func, bytes_per_call, items_per_call = bench.setup(context, size)
+
+                # Directory benchmarks can take minutes per call on the largest sizes
+                calls = min_calls if bench.group == 'codec' else 1
+
+                results[key] = {'benchmark': bench.name, 'group': bench.group, 'size': size,
+                                **measure(func, bytes_per_call, items_per_call, min_time=min_time,
+                                          min_calls=calls, memory=memory)}
+    finally:
+        if owns_work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    return {'version': RESULTS_VERSION, 'metadata': _metadata(profile, payloads, directories, workers),
+            'results': results, 'skipped': skipped}
+
+
+def save_results(results: Dict[str, Any], file_name: str):
+    with open(file_name, 'w', encoding='utf-8') as file:
+        json.dump(results, file, indent=2, sort_keys=True)
+
+
+def load_results(file_name: str) -> Dict[str, Any]:
+    with open(file_name, 'r', encoding='utf-8') as file:
+        results = json.load(file)
+
+    if results.get('version') != RESULTS_VERSION:
+        raise ValueError(
+            f"{file_name} is not a fastfs benchmark results file (version {RESULTS_VERSION})")
+
+    return results
+
+
+# metric -> True when higher is better
+COMPARED_METRICS = {
+    'ops_per_second': True,
+    'latency_p50_ms': False,
+    'latency_p99_ms': False,
+    'peak_memory_bytes': False,
+}
+
+# Memory changes below this are allocator noise
+MEMORY_NOISE_BYTES = 64 * 1024
+
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = 0.1,
+                    metrics: Iterable[str] = ('ops_per_second', 'latency_p50_ms', 'peak_memory_bytes')) -> List[Dict[str, Any]]:
+    """
+    Compares two runs benchmark by benchmark.
+
+    Returns:
+        List[Dict[str, Any]]: One entry per benchmark and metric present in both runs, with the relative change
+        (positive is better) and whether it is a regression, i.e. worse by more than threshold.
+    """
+    comparisons = []
+
+    for key, current_result in current['results'].items():
+        baseline_result = baseline['results'].get(key)
+
+        if baseline_result is None:
+            continue
+
+        for metric in metrics:
+            if metric not in baseline_result or metric not in current_result:
+                continue
+
+            old, new = baseline_result[metric], current_result[metric]
+
+            if old == 0 or old == float('inf'):
+                continue
+
+            higher_is_better = COMPARED_METRICS.get(metric, True)
+            change = (new - old) / old if higher_is_better else (old - new) / old
+
+            regression = change < -threshold
+
+            if metric == 'peak_memory_bytes' and abs(new - old) < MEMORY_NOISE_BYTES:
+                regression = False
+
+            comparisons.append({'benchmark': key, 'metric': metric, 'baseline': old, 'current': new,
+                                'change': change, 'regression': regression})
+
+    return comparisons
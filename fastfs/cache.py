@@ -0,0 +1,251 @@
+import copy
+import os
+import pickle
+import sys
+import threading
+
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Any, Dict, Hashable, List, Tuple, Union
+
+
+RETURN_MODES = ('copy', 'view')
+
+
+def _estimate_size(obj: Any) -> int:
+    """Approximates the memory used by a decoded object, including nested containers."""
+    total = 0
+    seen = set()
+    stack = [obj]
+
+    while stack:
+        item = stack.pop()
+
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+
+        # Arrays report their buffer size through nbytes
+        nbytes = getattr(item, 'nbytes', None)
+        if isinstance(nbytes, int):
+            total += nbytes
+            continue
+
+        total += sys.getsizeof(item)
+
+        # Frozen dicts are mappingproxy objects, sized like the dict they wrap
+        if isinstance(item, (dict, MappingProxyType)):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+
+    return total
+
+
+# Shared as they are, they can't be changed in place
+_IMMUTABLE_TYPES = (str, bytes, int, float, complex, bool, type(None), range)
+
+
+def _freeze(obj: Any, unfrozen: List[Any]) -> Any:
+    """
+    Returns a read-only view of JSON/YAML-like data and NumPy arrays: dicts become mappingproxy, lists and tuples
+    become tuples, sets become frozensets and arrays are made read-only. Objects it can't make read-only are
+    returned as-is and appended to unfrozen.
+    """
+    if isinstance(obj, _IMMUTABLE_TYPES):
+        return obj
+    elif isinstance(obj, dict):
+        return MappingProxyType({key: _freeze(value, unfrozen) for key, value in obj.items()})
+    elif isinstance(obj, (list, tuple)):
+        return tuple(_freeze(item, unfrozen) for item in obj)
+    elif isinstance(obj, (set, frozenset)):
+        return frozenset(_freeze(item, unfrozen) for item in obj)
+    elif hasattr(obj, 'setflags'):
+        # NumPy scalars have setflags too, but no item assignment
+        if not hasattr(obj, '__setitem__'):
+            return obj
+
+        # Elements of object arrays could still be changed in place
+        if obj.dtype.hasobject:
+            unfrozen.append(obj)
+            return obj
+
+        return _freeze_array(obj)
+
+    unfrozen.append(obj)
+
+    return obj
+
+
+def _freeze_array(array: Any) -> Any:
+    # A read-only array could still be written through its base, so every array down to the buffer is frozen
+    chain = [array]
+
+    while hasattr(chain[-1].base, 'setflags'):
+        chain.append(chain[-1].base)
+
+    owner = chain[-1].base
+
+    if owner is not None:
+        try:
+            with memoryview(owner) as view:
+                writable = not view.readonly
+        except (TypeError, ValueError):
+            writable = True
+
+        # The buffer (e.g. a bytearray or an mmap) could be written directly, the array gets its own copy instead
+        if writable:
+            chain = [array.copy()]
+
+    for item in chain:
+        item.setflags(write=False)
+
+    return chain[0]
+
+
+def _encode(value: Any) -> Union[None, bytes]:
+    # Unpickling a copy is several times faster than deepcopy, and the cached bytes are sized exactly
+    try:
+        return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        return None
+
+
+class ReadCache():
+    """
+    A memory-bounded LRU cache of decoded files.
+
+    Entries are keyed by absolute path and reader, and are only returned while the file's
+    (st_mtime_ns, st_size, st_ino) still match the values seen when the entry was stored.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024, return_mode: str = 'copy'):
+        if return_mode not in RETURN_MODES:
+            raise ValueError(
+                f"Unknown return mode {return_mode}. Supported modes: {', '.join(RETURN_MODES)}")
+
+        self.max_bytes = max_bytes
+        self.return_mode = return_mode
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._entries = OrderedDict()
+        self._paths = {}
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def file_signature(stat_result: os.stat_result) -> Tuple[int, int, int]:
+        return stat_result.st_mtime_ns, stat_result.st_size, stat_result.st_ino
+
+    def get(self, file_path: str, reader: Hashable, signature: Tuple[int, int, int]) -> Tuple[bool, Any]:
+        """
+        Looks up a decoded file.
+
+        Returns:
+            Tuple[bool, Any]: (True, value) on a hit, (False, None) on a miss or a stale entry.
+        """
+        key = (os.path.abspath(file_path), reader)
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None or entry[0] != signature:
+                self.misses += 1
+                return False, None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            value, restore = entry[1], entry[3]
+
+        if restore is not None:
+            value = restore(value)
+
+        return True, value
+
+    def put(self, file_path: str, reader: Hashable, signature: Tuple[int, int, int], value: Any) -> Any:
+        """
+        Stores a decoded file, evicting the least recently used entries to stay under max_bytes.
+
+        Returns:
+            Any: The value to hand to the caller. In 'view' mode this is the read-only view that was cached.
+        """
+        restore = pickle.loads
+
+        if self.return_mode == 'view':
+            unfrozen = []
+            frozen = _freeze(value, unfrozen)
+
+            # Values holding objects that can't be made read-only are copied on every hit, like in 'copy' mode
+            if not unfrozen:
+                value = cached_value = frozen
+                restore = None
+
+        if restore is not None:
+            cached_value = _encode(value)
+
+            if cached_value is None:
+                cached_value = copy.deepcopy(value)
+                restore = copy.deepcopy
+
+        size = _estimate_size(cached_value)
+
+        # Never let a single file flush the whole cache
+        if size > self.max_bytes:
+            return value
+
+        file_path = os.path.abspath(file_path)
+        key = (file_path, reader)
+
+        with self._lock:
+            self._remove(key)
+
+            self._entries[key] = (signature, cached_value, size, restore)
+            self._paths.setdefault(file_path, set()).add(reader)
+            self._total_bytes += size
+
+            while self._total_bytes > self.max_bytes:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+
+        return value
+
+    def _remove(self, key: Tuple[str, Hashable]):
+        entry = self._entries.pop(key, None)
+
+        if entry is None:
+            return
+
+        self._total_bytes -= entry[2]
+
+        readers = self._paths.get(key[0])
+        if readers is not None:
+            readers.discard(key[1])
+            if not readers:
+                del self._paths[key[0]]
+
+    def invalidate(self, file_path: str):
+        """Drops every cached entry for the given file."""
+        file_path = os.path.abspath(file_path)
+
+        with self._lock:
+            for reader in list(self._paths.get(file_path, ())):
+                self._remove((file_path, reader))
+
+    def clear(self):
+        """Drops all cached entries. The hit/miss/eviction counters are kept."""
+        with self._lock:
+            self._entries.clear()
+            self._paths.clear()
+            self._total_bytes = 0
+
+    def stats(self) -> Dict[str, Union[int, str]]:
+        """Returns the hit/miss/eviction counters and the current cache size."""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                    'entries': len(self._entries), 'bytes': self._total_bytes, 'max_bytes': self.max_bytes,
+                    'return_mode': self.return_mode}
@@ -0,0 +1,169 @@
+import io
+import os
+
+from contextlib import contextmanager
+from typing import IO, Any, Callable, Iterator, Tuple, Union
+
+from fastfs.dependencies import import_optional
+
+
+# Compression name -> file extensions, the first one is used when fastfs names a file
+COMPRESSIONS = {
+    'gzip': ('.gz',),
+    'bz2': ('.bz2',),
+    'xz': ('.xz', '.lzma'),
+    'zstd': ('.zst', '.zstd'),
+    'lz4': ('.lz4',),
+}
+
+# Levels used when none is given. gzip defaults to 9 in the stdlib, which is much slower for little gain.
+DEFAULT_LEVELS = {
+    'gzip': 6,
+    'bz2': 9,
+    'xz': 6,
+    'zstd': 3,
+    'lz4': 0,
+}
+
+_EXTENSIONS = {extension: name for name, extensions in COMPRESSIONS.items()
+               for extension in extensions}
+
+
+def split_compression_extension(file_name: str) -> Tuple[str, Union[None, str]]:
+    """Splits 'data.json.gz' into ('data.json', 'gzip'). Names without a compression extension get None."""
+    root, extension = os.path.splitext(file_name)
+    compression = _EXTENSIONS.get(extension.lower())
+
+    if compression is None:
+        return file_name, None
+
+    return root, compression
+
+
+def resolve_compression(file_name: str, compression: Union[None, str] = 'infer') -> Union[None, str]:
+    """
+    Returns the compression to use for a file: None for uncompressed files, otherwise a COMPRESSIONS name.
+
+    'infer' picks it from the file extension. A compression may also be given by name or extension ('gz').
+    """
+    if compression is None:
+        return None
+
+    if compression == 'infer':
+        return split_compression_extension(file_name)[1]
+
+    if compression in COMPRESSIONS:
+        return compression
+
+    name = _EXTENSIONS.get('.' + compression.lstrip('.').lower())
+
+    if name is None:
+        raise ValueError(
+            f"Unknown compression {compression}. Supported compressions: {', '.join(COMPRESSIONS)}")
+
+    return name
+
+
+def compression_extension(compression: str) -> str:
+    return COMPRESSIONS[resolve_compression('', compression)][0]
+
+
+def _open_gzip(raw: IO[bytes], mode: str, level: int) -> IO[bytes]:
+    import gzip
+
+    # No file name or timestamp in the header, so equal data compresses to equal bytes
+    return gzip.GzipFile(filename='', fileobj=raw, mode=mode, compresslevel=level, mtime=0)
+
+
+def _open_bz2(raw: IO[bytes], mode: str, level: int) -> IO[bytes]:
+    import bz2
+
+    return bz2.BZ2File(raw, mode=mode, compresslevel=level)
+
+
+def _open_xz(raw: IO[bytes], mode: str, level: int) -> IO[bytes]:
+    import lzma
+
+    if 'r' in mode:
+        return lzma.LZMAFile(raw, mode=mode)
+
+    return lzma.LZMAFile(raw, mode=mode, preset=level)
+
+
+def _open_zstd(raw: IO[bytes], mode: str, level: int) -> IO[bytes]:
+    zstandard = import_optional('zstandard')
+
+    if 'r' in mode:
+        # Appends add frames, read all of them. Buffered for readline() and peek().
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(
+            raw, read_across_frames=True, closefd=False))
+
+    return zstandard.ZstdCompressor(level=level).stream_writer(raw, closefd=False)
+
+
+def _open_lz4(raw: IO[bytes], mode: str, level: int) -> IO[bytes]:
+    lz4_frame = import_optional('lz4.frame', 'lz4')
+
+    return lz4_frame.LZ4FrameFile(raw, mode=mode, compression_level=level)
+
+
+_OPENERS = {
+    'gzip': _open_gzip,
+    'bz2': _open_bz2,
+    'xz': _open_xz,
+    'zstd': _open_zstd,
+    'lz4': _open_lz4,
+}
+
+
+def wrap_stream(raw: IO[bytes], mode: str, compression: str, level: Union[None, int] = None,
+                encoding: Union[None, str] = None) -> IO[Any]:
+    """
+    Returns a (de)compressing stream over a binary file object, in text mode if mode has no 'b'.
+    Closing the returned stream finishes the compressed data but leaves raw open.
+    """
+    binary_mode = mode.replace('t', '').replace('b', '') + 'b'
+
+    if level is None:
+        level = DEFAULT_LEVELS[compression]
+
+    stream = _OPENERS[compression](raw, binary_mode, level)
+
+    if 'b' in mode:
+        return stream
+
+    return io.TextIOWrapper(stream, encoding=encoding)
+
+
+@contextmanager
+def open_file(file: Union[str, int], mode: str, encoding: Union[None, str] = None, compression: Union[None, str] = None,
+              level: Union[None, int] = None, on_written: Union[None, Callable[[IO[Any]], Any]] = None) -> Iterator[IO[Any]]:
+    """
+    Opens a file name or descriptor like open(), compressing or decompressing on the fly when compression is given.
+
+    on_written is called with the underlying OS file once the with-block completes without an error and all
+    data, including the compression trailer, has been written to it.
+    """
+    if compression is None:
+        with open(file, mode, encoding=encoding) as stream:
+            yield stream
+
+            if on_written is not None:
+                on_written(stream)
+        return
+
+    with open(file, mode.replace('t', '').replace('b', '') + 'b') as raw:
+        with wrap_stream(raw, mode, compression, level, encoding) as stream:
+            yield stream
+
+        if on_written is not None:
+            on_written(raw)
+
+
+def is_plain_file(file: Any) -> bool:
+    """True for files read straight from the OS, False for decompressing streams."""
+    # Unwrap instrumentation proxies and buffered readers
+    file = getattr(file, 'wrapped', file)
+    file = getattr(file, 'raw', file)
+
+    return isinstance(file, io.FileIO)
@@ -9,3 +9,9 @@ class FileTypes(Enum):
     HDF5 = 'hdf5'
     INI = 'ini'
     YAML = ('yaml', 'yml')
+
+
+class Durability(Enum):
+    NONE = 'none'  # leave flushing to the OS
+    FILE = 'file'  # fdatasync the file after writing
+    FULL = 'full'  # fdatasync the file and fsync its directory
@@ -0,0 +1,211 @@
+"""
+DataFrame storage formats, picked by file extension.
+
+Binary formats keep dtypes and skip text parsing: pickle needs nothing beyond pandas, feather and parquet need
+pyarrow, HDF5 needs PyTables. Parquet, HDF5 and CSV can be read in chunks and, like feather, by column.
+Files with an extension not listed in DATAFRAME_FORMATS are written as CSV, as they always have been.
+"""
+import os
+
+from typing import TYPE_CHECKING, Any, Iterator, List, Union
+
+from fastfs.dependencies import import_optional
+from fastfs.exceptions import UnsupportedFileType
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+DATAFRAME_FORMATS = {
+    '.csv': 'csv',
+    '.pickle': 'pickle',
+    '.pkl': 'pickle',
+    '.json': 'json',
+    '.feather': 'feather',
+    '.parquet': 'parquet',
+    '.pq': 'parquet',
+    '.h5': 'hdf5',
+    '.hdf5': 'hdf5',
+    '.hdf': 'hdf5',
+}
+
+# The HDF5 group DataFrames are stored under
+DEFAULT_HDF5_KEY = 'data'
+
+# The number of rows per chunk, per parquet row group and per feather record batch
+DEFAULT_CHUNK_SIZE = 65536
+
+
+def dataframe_format(file_name: str) -> Union[None, str]:
+    return DATAFRAME_FORMATS.get(os.path.splitext(file_name)[1].lower())
+
+
+def unsupported_type(file_name: str) -> UnsupportedFileType:
+    return UnsupportedFileType(os.path.splitext(file_name)[1],
+                               supported_types=', '.join(sorted(DATAFRAME_FORMATS)))
+
+
+def write(file_name: str, dataframe: 'pd.DataFrame', file_format: str, sep: str = ',',
+          header: Union[bool, List[str]] = True, index: bool = True, compression: Any = 'infer',
+          key: str = DEFAULT_HDF5_KEY, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """Writes dataframe in file_format. compression 'infer' keeps each format's default codec."""
+    if file_format == 'csv':
+        dataframe.to_csv(file_name, sep=sep, header=header, index=index, compression=compression)
+    elif file_format == 'pickle':
+        dataframe.to_pickle(file_name, compression=compression)
+    elif file_format == 'json':
+        # The default orient can't leave the index out, a fresh range index is written instead
+        (dataframe if index else dataframe.reset_index(drop=True)).to_json(file_name)
+    elif file_format == 'feather':
+        pa = import_optional('pyarrow')
+        feather = import_optional('pyarrow.feather', 'pyarrow')
+
+        # The index is stored as a column, not as range metadata, so partial reads get the right index too
+        table = pa.Table.from_pandas(dataframe, preserve_index=index)
+        options = {} if compression == 'infer' else {'compression': compression}
+
+        feather.write_feather(table, file_name, chunksize=chunk_size, **options)
+    elif file_format == 'parquet':
+        import_optional('pyarrow')
+
+        options = {} if compression == 'infer' else {'compression': compression}
+
+        dataframe.to_parquet(file_name, engine='pyarrow', index=index,
+                             row_group_size=chunk_size, **options)
+    elif file_format == 'hdf5':
+        import_optional('tables', 'tables')
+
+        options = {} if compression == 'infer' else {'complib': compression, 'complevel': 5}
+
+        # The table format can be queried by column and row range, unlike the fixed format
+        dataframe.to_hdf(file_name, key=key, mode='w', format='table', index=index, **options)
+    else:
+        raise unsupported_type(file_name)
+
+
+def read(file_name: str, file_format: str, sep: str = ',', columns: Union[None, List[str]] = None,
+         row_groups: Union[None, List[int]] = None, key: str = DEFAULT_HDF5_KEY) -> 'pd.DataFrame':
+    """Reads a DataFrame in file_format, only loading the selected columns (and row groups) where possible."""
+    pd = import_optional('pandas')
+
+    if row_groups is not None and file_format != 'parquet':
+        raise ValueError('row_groups is only supported for parquet files.')
+
+    if file_format == 'csv':
+        return pd.read_csv(file_name, sep=sep, usecols=columns)
+    elif file_format == 'pickle':
+        dataframe = pd.read_pickle(file_name)
+    elif file_format == 'json':
+        dataframe = pd.read_json(file_name)
+    elif file_format == 'feather':
+        feather = import_optional('pyarrow.feather', 'pyarrow')
+
+        if columns is not None:
+            pa = import_optional('pyarrow')
+
+            # Only the schema at the end of the file is read here
+            with pa.memory_map(file_name) as source:
+                columns = _with_index_columns(pa.ipc.open_file(source).schema, columns)
+
+        # Memory-mapped, uncompressed columns are not copied until pandas converts them
+        return feather.read_table(file_name, columns=columns, memory_map=True).to_pandas()
+    elif file_format == 'parquet':
+        parquet = import_optional('pyarrow.parquet', 'pyarrow')
+
+        parquet_file = parquet.ParquetFile(file_name, memory_map=True)
+
+        try:
+            if row_groups is None:
+                table = parquet_file.read(columns=columns, use_pandas_metadata=True)
+            else:
+                table = parquet_file.read_row_groups(row_groups, columns=columns, use_pandas_metadata=True)
+        finally:
+            parquet_file.close()
+
+        return table.to_pandas()
+    elif file_format == 'hdf5':
+        import_optional('tables', 'tables')
+
+        return pd.read_hdf(file_name, key=key, columns=columns)
+    else:
+        raise unsupported_type(file_name)
+
+    # Formats without column access are loaded whole and projected afterwards
+    return dataframe if columns is None else dataframe[columns]
+
+
+def _with_index_columns(schema: Any, columns: List[str]) -> List[str]:
+    # Unlike parquet, feather column selection leaves out the columns the pandas index is stored in
+    metadata = schema.pandas_metadata or {}
+    index_columns = [name for name in metadata.get('index_columns', []) if isinstance(name, str)]
+
+    return columns + [name for name in index_columns if name not in columns]
+
+
+def _rechunk(pa: Any, batches: Iterator[Any], chunk_size: int) -> Iterator[Any]:
+    # Slices of arrow tables are zero-copy, so batches of any size are regrouped without copying
+    pending = []
+    rows = 0
+
+    for batch in batches:
+        pending.append(batch)
+        rows += batch.num_rows
+
+        while rows >= chunk_size:
+            table = pa.Table.from_batches(pending)
+
+            yield table.slice(0, chunk_size)
+
+            rest = table.slice(chunk_size)
+            pending = rest.to_batches()
+            rows = rest.num_rows
+
+    if rows:
+        yield pa.Table.from_batches(pending)
+
+
+def iterate(file_name: str, file_format: str, chunk_size: int = DEFAULT_CHUNK_SIZE, sep: str = ',',
+            columns: Union[None, List[str]] = None, key: str = DEFAULT_HDF5_KEY) -> Iterator['pd.DataFrame']:
+    """Yields DataFrames of up to chunk_size rows, holding one chunk (and what the format decodes at once) in memory."""
+    pd = import_optional('pandas')
+    chunk_size = max(1, chunk_size)
+
+    if file_format == 'csv':
+        with pd.read_csv(file_name, sep=sep, usecols=columns, chunksize=chunk_size) as reader:
+            yield from reader
+    elif file_format == 'parquet':
+        parquet = import_optional('pyarrow.parquet', 'pyarrow')
+
+        parquet_file = parquet.ParquetFile(file_name, memory_map=True)
+
+        try:
+            for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=columns, use_pandas_metadata=True):
+                yield batch.to_pandas()
+        finally:
+            parquet_file.close()
+    elif file_format == 'feather':
+        pa = import_optional('pyarrow')
+
+        # Feather files are Arrow IPC files, record batches are read one at a time from the memory map
+        with pa.memory_map(file_name) as source:
+            reader = pa.ipc.open_file(source)
+            batches = (reader.get_batch(idx) for idx in range(reader.num_record_batches))
+
+            if columns is not None:
+                selected = _with_index_columns(reader.schema, columns)
+                batches = (batch.select(selected) for batch in batches)
+
+            for table in _rechunk(pa, batches, chunk_size):
+                yield table.to_pandas()
+    elif file_format == 'hdf5':
+        import_optional('tables', 'tables')
+
+        with pd.HDFStore(file_name, mode='r') as store:
+            yield from store.select(key, columns=columns, chunksize=chunk_size)
+    elif file_format in ('pickle', 'json'):
+        dataframe = read(file_name, file_format, columns=columns)
+
+        for start in range(0, len(dataframe), chunk_size):
+            yield dataframe.iloc[start:start + chunk_size]
+    else:
+        raise unsupported_type(file_name)
@@ -1,26 +1,49 @@
-
+from functools import wraps
 from typing import Any
 
 
 def path_replace(func):
+    @wraps(func)
     def wrapper(self, file_path, *args, **kwargs):
         file_path = self._path_replace(file_path)
         return func(self, file_path, *args, **kwargs)
     return wrapper
 
 
-def safe_write(write_mode='w'):
+def safe_write(write_mode='w', compression='infer'):
+    # compression is the default of the decorated function: 'infer' for structured formats, None for raw data
+    # whose extension says nothing about how fastfs should transform it
     def decorator(func):
+        @wraps(func)
         def wrapper(self, file_name: str, file_data: Any, *args, **kwargs):
-            self._safe_write_func(file_name, func, file_data,
-                                  write_mode, *args, **kwargs)
+            kwargs.setdefault('compression', compression)
+            return self._safe_write_func(file_name, func, file_data,
+                                         write_mode, *args, **kwargs)
         return wrapper
     return decorator
 
 
-def safe_read(read_mode='r', context_manager=True):
+def safe_read(read_mode='r', context_manager=True, cacheable=False, compression='infer'):
     def decorator(func):
+        @wraps(func)
         def wrapper(self, file_name: str, *args, **kwargs):
+            kwargs.setdefault('compression', compression)
+
+            # Only plain reads are cached, extra arguments could change the decoded result.
+            # The compression and JSON backend only change how the same data is stored and decoded.
+            if cacheable and self._read_cache is not None and not args and kwargs.keys() <= {'compression', 'backend'}:
+                return self._cached_read_func(file_name, func, read_mode, **kwargs)
             return self._safe_read_func(file_name, func, read_mode, context_manager, *args, **kwargs)
         return wrapper
     return decorator
+
+
+def safe_iter(read_mode='r'):
+    # For generator functions: the file stays open while the caller iterates and is closed
+    # when the generator finishes, is closed early or is garbage collected.
+    def decorator(func):
+        @wraps(func)
+        def wrapper(self, file_name: str, *args, **kwargs):
+            return self._safe_iter_func(file_name, func, read_mode, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,29 @@
+# Optional dependencies are imported on first use rather than when fastfs is imported,
+# so `import fastfs` stays cheap for programs that never touch YAML, HDF5 or DataFrames.
+import importlib
+
+from types import ModuleType
+from typing import Union
+
+from fastfs.exceptions import MissingDependencyError
+
+
+def import_optional(module_name: str, package_name: Union[None, str] = None) -> ModuleType:
+    """
+    Imports an optional dependency.
+
+    Args:
+        module_name: The module to import, e.g. 'yaml'.
+        package_name: The name to install it by, e.g. 'PyYAML'. Defaults to module_name.
+
+    Returns:
+        ModuleType: The imported module. Later calls are served from sys.modules.
+
+    Raises:
+        MissingDependencyError: If the module is not installed.
+    """
+    try:
+        return importlib.import_module(module_name)
+    except ImportError as exc:
+        raise MissingDependencyError(
+            package_name if package_name is not None else module_name) from exc
@@ -0,0 +1,113 @@
+"""
+Content digests for skipping writes whose data is already on disk.
+
+A digest record is stored next to each file written with skip_if_unchanged: in the user.fastfs.digest extended
+attribute where the file system supports it, otherwise in a hidden sidecar file '.<name>.digest' in the same
+directory. The record holds the digest of the uncompressed contents together with the size and modification time
+the file had right after the write, so a file changed by anything else no longer matches its record and is
+rewritten. Sidecars are left out of get_directory_info and removed by delete_file.
+
+Digests are XXH3-128 when xxhash is installed, BLAKE2b otherwise.
+"""
+import os
+
+from typing import Union
+
+from fastfs.dependencies import import_optional
+from fastfs.exceptions import MissingDependencyError
+
+
+XATTR_NAME = 'user.fastfs.digest'
+SIDECAR_SUFFIX = '.digest'
+
+_SUPPORTS_XATTR = hasattr(os, 'getxattr')
+
+_hash_function = None
+
+
+def _select_hash_function():
+    try:
+        xxhash = import_optional('xxhash')
+    except MissingDependencyError:
+        import hashlib
+
+        return 'blake2b', lambda data: hashlib.blake2b(data, digest_size=16).hexdigest()
+
+    return 'xxh3_128', lambda data: xxhash.xxh3_128_hexdigest(data)
+
+
+def content_digest(data: Union[bytes, bytearray, memoryview], compression: Union[None, str] = None) -> str:
+    """Returns the digest of data as 'algorithm:compression:hexdigest'."""
+    global _hash_function
+
+    if _hash_function is None:
+        _hash_function = _select_hash_function()
+
+    algorithm, hash_data = _hash_function
+
+    return f'{algorithm}:{compression or "none"}:{hash_data(data)}'
+
+
+def sidecar_path(file_name: str) -> str:
+    directory_name, base_name = os.path.split(file_name)
+    return os.path.join(directory_name, f'.{base_name}{SIDECAR_SUFFIX}')
+
+
+def sidecar_target(name: str) -> Union[None, str]:
+    """Returns the name of the file a sidecar named name would belong to, None if name is not a sidecar's."""
+    if len(name) > len(SIDECAR_SUFFIX) + 1 and name.startswith('.') and name.endswith(SIDECAR_SUFFIX):
+        return name[1:-len(SIDECAR_SUFFIX)]
+
+    return None
+
+
+def remove_digest(file_name: str):
+    """Removes the sidecar of a deleted file, the extended attribute went with the file."""
+    try:
+        os.remove(sidecar_path(file_name))
+    except FileNotFoundError:
+        pass
+
+
+def _stat_record(digest: str, stat_result: os.stat_result) -> str:
+    return f'{digest}:{stat_result.st_size}:{stat_result.st_mtime_ns}'
+
+
+def _read_record(file_name: str) -> Union[None, str]:
+    if _SUPPORTS_XATTR:
+        try:
+            return os.getxattr(file_name, XATTR_NAME).decode('ascii')
+        except OSError:
+            pass
+
+    try:
+        with open(sidecar_path(file_name), encoding='ascii') as file:
+            return file.read()
+    except (OSError, ValueError):
+        return None
+
+
+def is_unchanged(file_name: str, digest: str) -> bool:
+    """True if file_name was written by fastfs with contents matching digest and was not modified since."""
+    try:
+        stat_result = os.stat(file_name)
+    except OSError:
+        return False
+
+    return _read_record(file_name) == _stat_record(digest, stat_result)
+
+
+def store_digest(file_name: str, digest: str):
+    """Records digest for file_name as it is on disk now."""
+    record = _stat_record(digest, os.stat(file_name))
+
+    if _SUPPORTS_XATTR:
+        try:
+            os.setxattr(file_name, XATTR_NAME, record.encode('ascii'))
+            return
+        except OSError:
+            # e.g. tmpfs without user xattrs, some network file systems
+            pass
+
+    with open(sidecar_path(file_name), 'w', encoding='ascii') as file:
+        file.write(record)
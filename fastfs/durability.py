@@ -0,0 +1,95 @@
+import os
+import shutil
+import tempfile
+import threading
+
+from typing import Set
+
+from fastfs.data_types import Durability
+
+
+_umask = None
+
+
+def _read_umask() -> int:
+    # os.umask can only be read by setting it, which would race with other threads creating files meanwhile.
+    # Linux reports it in /proc, elsewhere it is read off the mode of a probe file.
+    try:
+        with open('/proc/self/status') as file:
+            for line in file:
+                if line.startswith('Umask:'):
+                    return int(line.split()[1], 8)
+    except (OSError, ValueError):
+        pass
+
+    directory_name = tempfile.mkdtemp()
+
+    try:
+        probe = os.path.join(directory_name, 'probe')
+        os.close(os.open(probe, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o777))
+
+        return 0o777 & ~os.stat(probe).st_mode
+    finally:
+        shutil.rmtree(directory_name, ignore_errors=True)
+
+
+def default_file_mode() -> int:
+    """Returns the permission bits open() would give a new file, so atomic writes don't end up 0600."""
+    global _umask
+
+    if _umask is None:
+        _umask = _read_umask()
+
+    return 0o666 & ~_umask
+
+
+def sync_file(fd: int):
+    """Flushes a file's data to disk, skipping metadata where the platform allows it."""
+    if hasattr(os, 'fdatasync'):
+        os.fdatasync(fd)
+    else:
+        os.fsync(fd)
+
+
+def sync_directory(directory_name: str):
+    """Flushes a directory's entries to disk, making renames and new files inside it durable."""
+    # Directories can't be opened for fsync on Windows, where renames are journaled by NTFS
+    if os.name == 'nt':
+        return
+
+    fd = os.open(directory_name or '.', os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def parse_durability(durability) -> Durability:
+    if isinstance(durability, Durability):
+        return durability
+
+    try:
+        return Durability(durability)
+    except ValueError as exc:
+        supported = ", ".join(level.value for level in Durability)
+        raise ValueError(
+            f"Unknown durability {durability}. Supported values: {supported}") from exc
+
+
+class WriteBatch():
+    """Collects the directories touched by a group of writes, so each is fsynced once at the end."""
+
+    def __init__(self):
+        self.directories: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def add(self, directory_name: str):
+        with self._lock:
+            self.directories.add(directory_name)
+
+    def sync(self):
+        with self._lock:
+            directories, self.directories = self.directories, set()
+
+        for directory_name in directories:
+            sync_directory(directory_name)
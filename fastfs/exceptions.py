@@ -1,3 +1,12 @@
+from typing import Any, Dict, Union
+
+
+def _rebuild_exception(exc_class, message: str):
+    exc = exc_class.__new__(exc_class)
+    FastFsException.__init__(exc, message)
+    return exc
+
+
 class FastFsException(Exception):
     """Base exception class for fastfs library."""
 
@@ -5,6 +14,11 @@ class FastFsException(Exception):
         self.message = message
         super().__init__(self.message)
 
+    def __reduce__(self):
+        # Subclasses take different __init__ arguments than their message, so rebuild
+        # from the message directly. Needed to send exceptions back from worker processes.
+        return _rebuild_exception, (self.__class__, self.message), self.__dict__
+
 
 class UnsupportedFileType(FastFsException):
     """Raised when an unsupported file type is used."""
@@ -74,8 +88,15 @@ class FileReadError(FastFsException):
 
 
 class BulkReadDirectoryError(FastFsException):
-    """Raised when there is an error from the bulk_read_directory function in AbstractFileManager."""
+    """Raised when there is an error from the bulk_read_directory function in AbstractFileManager.
 
-    def __init__(self, explanation: str):
+    If individual files failed to read, `errors` maps each failed file name to its exception and
+    `data` holds the files that were read successfully.
+    """
+
+    def __init__(self, explanation: str, errors: Union[None, Dict[str, Exception]] = None,
+                 data: Union[None, Dict[str, Any]] = None):
         self.message = f"There was an error during bulk directory read. {explanation}"
+        self.errors = errors if errors is not None else {}
+        self.data = data if data is not None else {}
         super().__init__(self.message)
@@ -0,0 +1,125 @@
+from collections import deque
+
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, List, Tuple, Union
+
+# concurrent.futures (and multiprocessing behind the process pool) is only imported once a pool is needed
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+
+EXECUTOR_TYPES = ('thread', 'process')
+
+
+def create_executor(executor: str = 'thread', workers: Union[None, int] = None) -> 'Executor':
+    """
+    Creates a new thread or process pool.
+
+    Args:
+        executor: Either 'thread' (overlaps file I/O) or 'process' (spreads CPU-bound decoding across cores).
+        workers: The maximum number of workers. Defaults to the concurrent.futures default.
+
+    Returns:
+        Executor: The new executor. The caller is responsible for shutting it down.
+    """
+    if executor == 'thread':
+        from concurrent.futures import ThreadPoolExecutor
+        return ThreadPoolExecutor(max_workers=workers)
+    elif executor == 'process':
+        from concurrent.futures import ProcessPoolExecutor
+        return ProcessPoolExecutor(max_workers=workers)
+
+    raise ValueError(
+        f"Unknown executor {executor}. Supported executors: {', '.join(EXECUTOR_TYPES)}")
+
+
+def _capture(func: Callable, args: tuple) -> Tuple[Any, Union[None, Exception]]:
+    try:
+        return func(*args), None
+    except Exception as exc:
+        return None, exc
+
+
+def _capture_chunk(func: Callable, args_chunk: List[tuple]) -> List[Tuple[Any, Union[None, Exception]]]:
+    return [_capture(func, args) for args in args_chunk]
+
+
+def run_batch(func: Callable, args_ls: Iterable[tuple], executor: Union[str, 'Executor'] = 'thread',
+              workers: int = 1, chunksize: Union[None, int] = None) -> List[Tuple[Any, Union[None, Exception]]]:
+    """
+    Calls func(*args) for every args tuple, optionally in parallel.
+
+    Exceptions raised by func are collected rather than raised, so one failing call does not stop the batch.
+
+    Args:
+        func: The function to call. Must be a picklable, module-level function for the 'process' executor.
+        args_ls: The positional arguments of each call.
+        executor: 'thread', 'process' or an existing Executor instance (which is not shut down afterwards).
+        workers: The number of workers. If 1 and no Executor instance is given, calls run sequentially.
+        chunksize: Calls sent to a worker process at a time. Defaults to an even split across workers.
+
+    Returns:
+        List[Tuple[Any, Union[None, Exception]]]: A (result, exception) pair per call, in the same order as args_ls.
+    """
+    args_ls = list(args_ls)
+
+    # Anything but an executor name is an Executor instance
+    owns_executor = isinstance(executor, str)
+
+    if owns_executor and (workers is None or workers <= 1):
+        return [_capture(func, args) for args in args_ls]
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    pool = create_executor(executor, workers) if owns_executor else executor
+
+    try:
+        if isinstance(pool, ProcessPoolExecutor):
+            # Batch calls to amortize the inter-process round trip over many small files
+            if chunksize is None:
+                chunksize = max(1, len(args_ls) // (4 * (workers or 1)))
+
+            chunks = [args_ls[i:i + chunksize]
+                      for i in range(0, len(args_ls), chunksize)]
+
+            results = []
+            for chunk_results in pool.map(_capture_chunk, [func] * len(chunks), chunks):
+                results.extend(chunk_results)
+            return results
+
+        return list(pool.map(_capture, [func] * len(args_ls), args_ls))
+    finally:
+        if owns_executor:
+            pool.shutdown()
+
+
+def imap_bounded(pool: 'Executor', func: Callable, args_ls: Iterable[tuple], window: int) -> Iterator[Any]:
+    """
+    Lazily calls func(*args) on the pool, yielding results in order.
+
+    Unlike Executor.map, at most `window` calls are submitted ahead of the consumer, so memory stays bounded
+    for long or infinite inputs. Pending calls are cancelled if the consumer stops early.
+
+    Args:
+        pool: The executor to submit calls to.
+        func: The function to call.
+        args_ls: The positional arguments of each call.
+        window: The maximum number of calls in flight.
+
+    Yields:
+        Any: The result of each call. Exceptions raised by func are re-raised when their result is reached.
+    """
+    window = max(1, window)
+    pending = deque()
+
+    try:
+        for args in args_ls:
+            pending.append(pool.submit(func, *args))
+
+            if len(pending) >= window:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
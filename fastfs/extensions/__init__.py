@@ -1,59 +1,183 @@
-from typing import Any, Union, List, Callable
+from typing import Any, Dict, Iterator, Union, List, Callable, Tuple
 
+from fastfs.dataframes import DEFAULT_CHUNK_SIZE, DEFAULT_HDF5_KEY
 from fastfs.global_instance import fast_file_manager
+from fastfs.hdf5 import HDF5Dataset
 
 
-def write_yaml(file_name: str, data: Any):
+def write_yaml(file_name: str, data: Any,
+               compression: Union[None, str] = 'infer', compression_level: Union[None, int] = None,
+               skip_if_unchanged: bool = False) -> bool:
     """
     Writes data to a YAML file.
 
     Args:
         file_name: The name/path of the file to write the YAML data to.
         data: The data to write as a YAML object.
+        compression: 'infer' picks the compression from the file extension ('.gz', '.bz2', '.xz', '.zst', '.lz4').
+                     It can also be given by name ('gzip', 'bz2', 'xz', 'zstd', 'lz4'), or None to never compress.
+        compression_level: The compression level. Defaults to a fast level for each compression.
+        skip_if_unchanged: If True, the data is serialized in memory and compared with the digest recorded when the
+                           file was last written this way. The write is skipped if they match, see fastfs.digests.
+
+    Returns:
+        bool: False if the write was skipped because the file was unchanged, True otherwise.
     """
-    fast_file_manager.write_yaml(file_name, data)
+    return fast_file_manager.write_yaml(file_name, data, compression=compression, compression_level=compression_level,
+                                        skip_if_unchanged=skip_if_unchanged)
 
 
-def read_yaml(file_name: str) -> Any:
+def read_yaml(file_name: str, compression: Union[None, str] = 'infer') -> Any:
     """
     Reads data from a YAML file.
 
     Args:
         file_name: The name/path of the YAML file to read from.
+        compression: 'infer' detects the compression from the file extension. It can also be given by name,
+                     or None to read the file as-is.
 
     Returns:
         Any: The data read from the YAML file.
     """
-    return fast_file_manager.read_yaml(file_name)
+    return fast_file_manager.read_yaml(file_name, compression=compression)
 
 
-def write_hdf5(file_name: str, data: Any):
+def write_hdf5(file_name: str, data: Any, dataset: str = 'data', mode: str = 'w',
+               compression: Union[None, str] = None, compression_level: Union[None, int] = None,
+               shuffle: Union[None, bool] = None, chunks: Union[None, bool, Tuple[int, ...]] = None,
+               resizable: bool = False):
     """
     Writes data to an HDF5 file.
 
     Args:
         file_name: The name/path of the file to write the HDF5 data to.
-        data: The data to write as an HDF5 object.
+        data: The data to write as an HDF5 dataset, e.g. a NumPy array. A dict writes one dataset per key, keys may
+              be paths like 'features/train'.
+        dataset: The name of the dataset when data is not a dict.
+        mode: 'w' replaces the file, 'a' adds the datasets to an existing file, replacing datasets of the same name.
+        compression: 'gzip' or 'lzf' to compress the dataset chunk by chunk, or None to store it uncompressed.
+        compression_level: The gzip level, 0-9.
+        shuffle: Whether to apply the shuffle filter, which makes numeric data compress better. Defaults to True
+                 with compression.
+        chunks: The chunk shape, True to let h5py choose one, or None for a contiguous dataset unless compression
+                or resizable need chunks. Reads of a slice only decompress the chunks it touches.
+        resizable: If True, the dataset can grow along its first axis with append_hdf5.
+    """
+    fast_file_manager.write_hdf5(file_name, data, dataset=dataset, mode=mode, compression=compression,
+                                 compression_level=compression_level, shuffle=shuffle, chunks=chunks,
+                                 resizable=resizable)
+
+
+def append_hdf5(file_name: str, data: Any, dataset: str = 'data', compression: Union[None, str] = None,
+                compression_level: Union[None, int] = None, shuffle: Union[None, bool] = None,
+                chunks: Union[None, bool, Tuple[int, ...]] = None) -> int:
     """
-    fast_file_manager.write_hdf5(file_name, data)
+    Appends rows along the first axis of an HDF5 dataset. The file and the dataset are created if they don't exist,
+    so a matrix larger than memory can be written one batch of rows at a time.
 
+    Args:
+        file_name: The name/path of the HDF5 file.
+        data: The rows to append, e.g. a NumPy array whose shape matches the dataset's except along the first axis.
+        dataset: The name of the dataset.
+        compression: 'gzip' or 'lzf'. Like chunks and shuffle, only used when the dataset is created.
+        compression_level: The gzip level, 0-9.
+        shuffle: Whether to apply the shuffle filter. Defaults to True with compression.
+        chunks: The chunk shape, or None to let h5py choose one.
 
-def read_hdf5(file_name: str) -> Any:
+    Returns:
+        int: The number of rows in the dataset after the append.
+    """
+    return fast_file_manager.append_hdf5(file_name, data, dataset=dataset, compression=compression,
+                                         compression_level=compression_level, shuffle=shuffle, chunks=chunks)
+
+
+def read_hdf5(file_name: str, dataset: Union[None, str, List[str]] = 'data', slice: Any = None) -> Any:
     """
     Reads data from an HDF5 file.
 
     Args:
         file_name: The name/path of the HDF5 file to read from.
+        dataset: The name of the dataset to read, a list of names, or None for all datasets in the file.
+        slice: An optional NumPy-style index, e.g. slice(1000, 2000) or np.s_[:, 3]. Only the selected elements are
+               read from the file. With several datasets, it applies to each of them.
+
+    Returns:
+        Any: The data read from the dataset, or a dict mapping dataset names to their data for several datasets.
+
+    Raises:
+        KeyError: If a dataset doesn't exist.
+    """
+    return fast_file_manager.read_hdf5(file_name, dataset=dataset, slice=slice)
+
+
+def list_hdf5_datasets(file_name: str) -> List[str]:
+    """
+    Lists the datasets of an HDF5 file.
+
+    Args:
+        file_name: The name/path of the HDF5 file.
 
     Returns:
-        Any: The data read from the HDF5 file.
+        List[str]: The paths of all datasets, including those in groups, e.g. 'features/train'.
     """
-    return fast_file_manager.read_hdf5(file_name)
+    return fast_file_manager.list_hdf5_datasets(file_name)
 
 
-def write_dataframe(file_name: str, dataframe: 'pd.DataFrame', sep: str = ',', header: Union[bool, List[str]] = True, index: bool = True):
+def open_hdf5(file_name: str, dataset: str = 'data', mode: str = 'r', compression: Union[None, str] = None,
+              compression_level: Union[None, int] = None, shuffle: Union[None, bool] = None,
+              chunks: Union[None, bool, Tuple[int, ...]] = None) -> HDF5Dataset:
     """
-    Writes a pandas dataframe to a CSV file. If the extension provided in 'file_name' is not '.csv' it will be changed to that.
+    Opens an HDF5 dataset without reading it, for datasets larger than memory.
+
+    Args:
+        file_name: The name/path of the HDF5 file.
+        dataset: The name of the dataset.
+        mode: 'r' to read, or 'a' to also append rows with handle.append(rows).
+        compression: Used, like compression_level, shuffle and chunks, if an append creates a dataset, see
+                     append_hdf5.
+        compression_level: The gzip level, 0-9.
+        shuffle: Whether to apply the shuffle filter.
+        chunks: The chunk shape.
+
+    Returns:
+        HDF5Dataset: A handle reading only what is sliced, handle[1000:2000], and streaming blocks of rows with
+                     handle.iter_rows(). Close it, or use it as a context manager, to close the file.
+
+    Raises:
+        KeyError: If the dataset doesn't exist.
+    """
+    return fast_file_manager.open_hdf5(file_name, dataset=dataset, mode=mode, compression=compression,
+                                       compression_level=compression_level, shuffle=shuffle, chunks=chunks)
+
+
+def iter_hdf5(file_name: str, dataset: str = 'data', rows: Union[None, int] = None, start: int = 0,
+              stop: Union[None, int] = None) -> Iterator[Any]:
+    """
+    Iterates over an HDF5 dataset in blocks of rows along its first axis, holding one block in memory at a time.
+
+    Args:
+        file_name: The name/path of the HDF5 file.
+        dataset: The name of the dataset.
+        rows: The number of rows per block. Defaults to whole chunks adding up to about 16 MiB, so every chunk is
+              read and decompressed once.
+        start: The first row.
+        stop: The row to stop at, or None for the end of the dataset.
+
+    Returns:
+        Iterator[Any]: Arrays of up to rows rows each. The file is closed when the iteration ends.
+    """
+    return fast_file_manager.iter_hdf5(file_name, dataset=dataset, rows=rows, start=start, stop=stop)
+
+
+def write_dataframe(file_name: str, dataframe: 'pd.DataFrame', sep: str = ',', header: Union[bool, List[str]] = True,
+                    index: bool = True, compression: Any = 'infer', key: str = DEFAULT_HDF5_KEY,
+                    chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    Writes a pandas DataFrame in the format of the file extension: '.csv', '.pickle'/'.pkl', '.json', '.feather',
+    '.parquet'/'.pq' or '.h5'/'.hdf5'/'.hdf'. Other extensions are changed to '.csv'.
+
+    The binary formats keep the dtypes and load much faster than CSV. Feather and parquet require pyarrow, HDF5
+    requires tables (PyTables).
 
     Args:
         file_name: The name/path of the file to write the data to.
@@ -61,19 +185,72 @@ def write_dataframe(file_name: str, dataframe: 'pd.DataFrame', sep: str = ',', h
         sep (optional): The delimiter character for the csv output file.
         header (optional): Write out the column names. If a list of strings is given it is assumed to be aliases for the column names.
         index (optional): Write row names (index).
+        compression (optional): The codec, e.g. 'zstd' or 'snappy' for parquet and feather, 'blosc' or 'zlib' for
+                                HDF5, 'gzip' for pickle and CSV. 'infer' keeps the default of each format.
+        key (optional): The group the DataFrame is stored under in HDF5 files.
+        chunk_size (optional): The number of rows per parquet row group and per feather record batch, the units
+                               read_dataframe(row_groups=...) and iter_dataframe read.
     """
 
-    fast_file_manager.write_dataframe(
-        file_name, dataframe, sep=sep, header=header, index=index)
+    fast_file_manager.write_dataframe(file_name, dataframe, sep=sep, header=header, index=index,
+                                      compression=compression, key=key, chunk_size=chunk_size)
 
 
-def read_dataframe(file_name: str, sep: str = ','):
+def read_dataframe(file_name: str, sep: str = ',', columns: Union[None, List[str]] = None,
+                   row_groups: Union[None, List[int]] = None, key: str = DEFAULT_HDF5_KEY) -> 'pd.DataFrame':
     """
-    Reads a pandas dataframe from a CSV, JSON, or PICKLE file.
+    Reads a pandas DataFrame from a file in any of the formats write_dataframe writes, picked by extension.
 
     Args:
         file_name: The name/path of the file to read the data from.
         sep (optional): The delimiter character if the input file is a CSV.
+        columns (optional): The columns to read. Parquet, feather, HDF5 and CSV files only read these columns,
+                            pickle and JSON files are read whole and projected.
+        row_groups (optional): The indices of the parquet row groups to read.
+        key (optional): The group the DataFrame is stored under in HDF5 files.
+    """
+
+    return fast_file_manager.read_dataframe(file_name, sep=sep, columns=columns, row_groups=row_groups, key=key)
+
+
+def iter_dataframe(file_name: str, chunk_size: int = DEFAULT_CHUNK_SIZE, sep: str = ',',
+                   columns: Union[None, List[str]] = None, key: str = DEFAULT_HDF5_KEY) -> Iterator['pd.DataFrame']:
+    """
+    Iterates over a DataFrame file in chunks of rows, for files larger than memory.
+
+    Parquet files are read batch by batch, feather files record batch by record batch from a memory map, HDF5 and
+    CSV files in row ranges. Pickle and JSON files have no row access and are loaded whole, then sliced.
+
+    Args:
+        file_name: The name/path of the file to read the data from.
+        chunk_size (optional): The number of rows per chunk.
+        sep (optional): The delimiter character if the input file is a CSV.
+        columns (optional): The columns to read.
+        key (optional): The group the DataFrame is stored under in HDF5 files.
+
+    Returns:
+        Iterator[pd.DataFrame]: DataFrames of up to chunk_size rows. The file is closed when the iteration ends.
+    """
+
+    return fast_file_manager.iter_dataframe(file_name, chunk_size=chunk_size, sep=sep, columns=columns, key=key)
+
+
+def read_csv_columns(file_name: str, dtypes: Union[None, Dict[str, Any]] = None,
+                     usecols: Union[None, List[Union[str, int]]] = None) -> Dict[str, 'np.ndarray']:
+    """
+    Reads a CSV file into one typed NumPy array per column. Requires numpy, but not pandas.
+
+    Column types are inferred per column in this order: int64, float64, bool ('true'/'false'), datetime64
+    (ISO 8601), falling back to fixed-width strings. Empty cells become nan/NaT. Blank lines are skipped, and a file
+    with a header but no rows returns empty arrays, int64 unless dtypes says otherwise.
+
+    Args:
+        file_name: The name/path of the CSV file to read from. The first line must be the header.
+        dtypes (optional): A dict mapping column names to NumPy dtypes, overriding the inferred types.
+        usecols (optional): A list of column names or indices to read. Other columns are discarded as rows are read.
+
+    Returns:
+        Dict[str, np.ndarray]: The columns, keyed by header, in file order.
     """
 
-    return fast_file_manager.read_dataframe(file_name, sep=sep)
+    return fast_file_manager.read_csv_columns(file_name, dtypes=dtypes, usecols=usecols)
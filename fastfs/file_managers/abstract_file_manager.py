@@ -1,15 +1,32 @@
 from fastfs.file_managers.base_file_manager import BaseFileExtensionManager
 from fastfs.data_types import FileTypes
-from fastfs.decorators import safe_read, safe_write, path_replace
+from fastfs.decorators import safe_read, safe_write, safe_iter, path_replace
 
-from fastfs.exceptions import DirectoryNotFound, BulkReadDirectoryError, UnsupportedFileType
+from fastfs.exceptions import DirectoryNotFound, BulkReadDirectoryError, UnsupportedFileType, InvalidFileDataError, FileWriteError
+from fastfs.executors import run_batch, create_executor, imap_bounded
+from fastfs.scan import scan_directory, default_size_cache_path
+from fastfs.compression import compression_extension, open_file, resolve_compression, split_compression_extension
+from fastfs.listing_index import SORT_KEYS
+from fastfs.pack import PACK_TYPES, PackReader, write_batch
+from fastfs.lines import DEFAULT_BUFFER_SIZE, DEFAULT_CHUNK_SIZE, LineWriter, count_lines, iter_line_batches, iter_lines, split_line_ranges, tail_lines, write_lines
+from fastfs.jsonl import DEFAULT_BATCH_SIZE, decode_line, decode_lines, decode_offset, iter_line_chunks, write_records
 
-from typing import Any, List, Union, Callable
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Tuple, Union, Callable
 
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+import io
+import itertools
 import json
 import os
+import queue
+import threading
 import time
 
+from collections import deque
+from contextlib import ExitStack
+
 
 class AbstractFileManager(BaseFileExtensionManager):
 
@@ -18,7 +35,8 @@ class AbstractFileManager(BaseFileExtensionManager):
         return os.path.splitext(file_name)[1]
 
     @path_replace
-    def get_directory_info(self, directory_name):
+    def get_directory_info(self, directory_name: str, workers: int = 1, size_cache: Union[bool, str] = False,
+                           largest: int = 10) -> Dict[str, Any]:
         info = {}
 
         # Check if directory exists
@@ -26,9 +44,6 @@ class AbstractFileManager(BaseFileExtensionManager):
             # Get the absolute path of the directory
             info["absolute_path"] = os.path.abspath(directory_name)
 
-            # Get the number of files in the directory
-            info["num_files"] = len(os.listdir(directory_name))
-
             # Get the creation time of the directory
             creation_time = os.path.getctime(directory_name)
             info["creation_time"] = time.ctime(creation_time)
@@ -37,14 +52,32 @@ class AbstractFileManager(BaseFileExtensionManager):
             modification_time = os.path.getmtime(directory_name)
             info["modification_time"] = time.ctime(modification_time)
 
+            if size_cache is True:
+                cache_path = default_size_cache_path(directory_name)
+            elif size_cache:
+                cache_path = size_cache
+            else:
+                cache_path = None
+
+            # Walk the tree with scandir, reusing cached results for unchanged directories
+            summary, num_entries = scan_directory(
+                directory_name, largest=largest, workers=workers, cache_path=cache_path)
+
+            # Get the number of files in the directory
+            info["num_files"] = num_entries
+
             # Get the size of the directory
-            total_size = 0
-            for dirpath, dirnames, filenames in os.walk(directory_name):
-                for f in filenames:
-                    fp = os.path.join(dirpath, f)
-                    if not os.path.islink(fp):
-                        total_size += os.path.getsize(fp)
-            info["total_size"] = total_size
+            info["total_size"] = summary['size']
+
+            # Aggregates over every file in the tree
+            info["total_files"] = summary['files']
+            info["extensions"] = summary['extensions']
+            info["largest_files"] = [(file_name, size)
+                                     for size, file_name in summary['largest']]
+            info["oldest_modification_time"] = time.ctime(
+                summary['oldest']) if summary['oldest'] is not None else None
+            info["newest_modification_time"] = time.ctime(
+                summary['newest']) if summary['newest'] is not None else None
 
         else:
             raise DirectoryNotFound(directory_name)
@@ -80,10 +113,43 @@ class AbstractFileManager(BaseFileExtensionManager):
         return info
 
     @safe_write()
-    def write_lines(self, file, lines: list):
+    def write_lines(self, file, lines: Iterable[str], buffer_size: int = DEFAULT_BUFFER_SIZE):
+        # '\n' becomes os.linesep through the text layer
+        write_lines(file, lines, buffer_size)
 
-        for line in lines:
-            file.write(line + os.linesep)
+    @safe_write(write_mode='a')
+    def append_lines(self, file, lines: Iterable[str], buffer_size: int = DEFAULT_BUFFER_SIZE):
+        write_lines(file, lines, buffer_size)
+
+    @path_replace
+    def open_line_writer(self, file_name: str, append: bool = True, buffer_size: int = DEFAULT_BUFFER_SIZE,
+                         encoding: str = 'utf-8', compression: Union[None, str] = 'infer',
+                         compression_level: Union[None, int] = None) -> LineWriter:
+        compression = resolve_compression(file_name, compression)
+        directory_mtime_ns = self._directory_mtime_ns(file_name)
+        stack = ExitStack()
+
+        try:
+            file = stack.enter_context(open_file(file_name, 'a' if append else 'w', encoding, compression,
+                                                 compression_level, on_written=self._sync_written_file))
+        except OSError as exc:
+            raise FileWriteError from exc
+        finally:
+            self._file_changed(file_name, directory_mtime_ns)
+
+        def on_close():
+            # Only the file's contents change while it is open, the directory was dealt with above
+            directory_mtime_ns = self._directory_mtime_ns(file_name)
+
+            try:
+                stack.close()
+                self._sync_written_directory(file_name)
+            except OSError as exc:
+                raise FileWriteError from exc
+            finally:
+                self._file_changed(file_name, directory_mtime_ns)
+
+        return LineWriter(file, buffer_size, on_close)
 
     @safe_read()
     def read_lines(self, file):
@@ -91,65 +157,398 @@ class AbstractFileManager(BaseFileExtensionManager):
 
         return lines
 
-    @safe_read(context_manager=False)
-    def iter_lines(self, file):
-        for line in file:
-            yield line
+    @safe_iter(read_mode='rb')
+    def iter_lines(self, file, chunk_size: int = DEFAULT_CHUNK_SIZE, start: int = 0, end: Union[None, int] = None,
+                   binary: bool = False, keepends: bool = True,
+                   batches: bool = False) -> Iterator[Union[str, bytes, List[Union[str, bytes]]]]:
+        if batches:
+            return iter_line_batches(file, chunk_size, start, end, binary, keepends)
+
+        return iter_lines(file, chunk_size, start, end, binary, keepends)
+
+    @safe_read(read_mode='rb')
+    def tail_lines(self, file, n: int = 10) -> List[str]:
+        return tail_lines(file, n)
+
+    @safe_read(read_mode='rb')
+    def count_lines(self, file) -> int:
+        return count_lines(file)
+
+    @safe_read(read_mode='rb')
+    def split_line_ranges(self, file, k: int) -> List[Tuple[int, int]]:
+        return split_line_ranges(file, k)
+
+    @safe_write(write_mode='wb')
+    def write_jsonl(self, file, records: Iterable[Any], batch_size: int = DEFAULT_BATCH_SIZE,
+                    backend: Union[None, str] = None):
+        write_records(file, records, self._get_json_backend(backend), batch_size)
+
+    @safe_write(write_mode='ab')
+    def append_jsonl(self, file, records: Iterable[Any], batch_size: int = DEFAULT_BATCH_SIZE,
+                     backend: Union[None, str] = None):
+        # Records are encoded a batch at a time, so a record that can't be encoded stops
+        # the append after the batches before it were written
+        write_records(file, records, self._get_json_backend(backend), batch_size)
+
+    @safe_iter(read_mode='rb')
+    def iter_jsonl(self, file, workers: int = 0, chunk_size: int = DEFAULT_BATCH_SIZE,
+                   with_offsets: bool = False, backend: Union[None, str] = None) -> Iterator[Any]:
+        backend = backend if backend is not None else self._json_backend
+        offsets = deque()
+        chunks = iter_line_chunks(file, chunk_size, offsets)
+
+        if workers <= 0:
+            decoded_chunks = (decode_lines(chunk, backend) for chunk in chunks)
+            pool = None
+        else:
+            # Lines are split here and decoded in worker processes, a bounded number of chunks ahead
+            pool = create_executor('process', workers)
+            decoded_chunks = imap_bounded(pool, decode_lines, ((chunk, backend) for chunk in chunks),
+                                          window=2 * workers)
+
+        try:
+            for records in decoded_chunks:
+                chunk_offsets = offsets.popleft()
+
+                if with_offsets:
+                    yield from zip(chunk_offsets, records)
+                else:
+                    yield from records
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+
+    @safe_read(read_mode='rb')
+    def read_jsonl(self, file, start: int = 0, stop: Union[None, int] = None,
+                   offsets: Union[None, Iterable[int]] = None, backend: Union[None, str] = None) -> List[Any]:
+        loads = self._get_json_backend(backend).loads
+
+        if offsets is None:
+            # Lines outside the range are skipped without being decoded
+            lines = itertools.islice(enumerate(file), start, stop)
+
+            return [decode_line(line, line_number, loads) for line_number, line in lines if line.strip()]
+
+        if start != 0 or stop is not None:
+            raise ValueError('Records are selected either by line range or by offsets, not both.')
+
+        records = []
+
+        for offset in offsets:
+            file.seek(offset)
+            records.append(decode_offset(file.readline(), offset, loads))
+
+        return records
+
+    def _serialize_by_type(self, data_type: FileTypes, file_data: Any) -> bytes:
+        # Runs the undecorated write function against an in-memory buffer, so the
+        # validation and error handling stay identical to write_json/write_pickle/...
+        if data_type == FileTypes.BINARY:
+            write_func, buffer = BaseFileExtensionManager.write_binary, io.BytesIO()
+        elif data_type == FileTypes.PICKLE:
+            write_func, buffer = BaseFileExtensionManager.write_pickle, io.BytesIO()
+        elif data_type == FileTypes.JSON:
+            write_func, buffer = BaseFileExtensionManager.write_json, io.BytesIO()
+        elif data_type == FileTypes.CSV:
+            write_func, buffer = BaseFileExtensionManager.write_csv, io.StringIO(
+                newline='')
+        else:
+            raise UnsupportedFileType(data_type.name, supported_types=", ".join(
+                file_type.name for file_type in BULK_WRITE_TYPES))
 
-        file.close()
+        try:
+            write_func.__wrapped__(self, buffer, file_data)
+        except InvalidFileDataError as exc:
+            raise FileWriteError from exc
 
-    @path_replace
-    def bulk_write_directory(self, directory_name: str, file_data_ls: List[Any], data_type: Union[FileTypes, str],
-                             file_prefix: Union[None, str] = None):
+        payload = buffer.getvalue()
 
-        if isinstance(data_type, str):
-            try:
-                data_type = FileTypes[data_type.upper()]
-            except KeyError as exc:
-                raise UnsupportedFileType(data_type) from exc
+        if isinstance(payload, str):
+            payload = payload.encode('utf-8')
 
-        if data_type not in FileTypes:
-            supported_types = ", ".join(FileTypes.__members__.keys())
-            raise UnsupportedFileType(
-                data_type, supported_types=supported_types)
+        return payload
 
-        # First, create the directory if it doesn't exist
-        self.touch_directory(directory_name)
+    @path_replace
+    def bulk_write_directory(self, directory_name: str, file_data_ls: List[Any], data_type: Union[FileTypes, str],
+                             file_prefix: Union[None, str] = None, workers: int = 1,
+                             serialize_workers: int = 0, queue_size: int = 64, compression: Union[None, str] = None,
+                             compression_level: Union[None, int] = None, pack: bool = False,
+                             skip_if_unchanged: bool = False) -> Dict[str, Any]:
+
+        data_type = _parse_bulk_write_type(data_type)
 
         file_extension = data_type.value
 
-        # Then, iterate over the file data and write each file
-        for idx, file_data in enumerate(file_data_ls):
+        # Types with several extensions use the first one, e.g. '.pickle'
+        if isinstance(file_extension, tuple):
+            file_extension = file_extension[0]
+
+        if compression is not None:
+            file_extension += compression_extension(compression)
 
+        def file_path(idx):
             full_path = f'{directory_name}/{idx}'
 
             if file_prefix is not None:
                 full_path += f'-{file_prefix}'
 
-            full_path += f'.{file_extension}'
+            return full_path + f'.{file_extension}'
+
+        start_time = time.perf_counter()
+
+        if pack:
+            if compression is not None:
+                raise ValueError('Packed items are stored uncompressed, so that they can be memory-mapped.')
+
+            if skip_if_unchanged:
+                raise ValueError('skip_if_unchanged is not supported for packs, they are always rewritten whole.')
+
+            # The items keep the names they would have had as files, for include_file_names
+            keys = [os.path.basename(file_path(idx)) for idx in range(len(file_data_ls))]
+            stats = self.write_pack(directory_name, file_data_ls, data_type, keys=keys,
+                                    serialize_workers=serialize_workers)
+
+            return _throughput({'files': stats['items'], 'bytes': stats['bytes']}, start_time)
+
+        # First, create the directory if it doesn't exist
+        self.touch_directory(directory_name)
 
-            if data_type == FileTypes.JSON:
-                self.write_json(full_path, file_data)
-            elif data_type == FileTypes.PICKLE:
-                self.write_pickle(full_path, file_data)
-            elif data_type == FileTypes.CSV:
-                self.write_csv(full_path, file_data)
-            elif data_type == FileTypes.BINARY:
-                self.write_binary(full_path, file_data)
+        # Serializing happens in this thread (or in worker processes) while writer threads drain
+        # a bounded queue, so item N+1 is encoded while item N is being written.
+        write_queue = queue.Queue(maxsize=max(1, queue_size))
+        errors = []
+        stats = {'files': 0, 'bytes': 0}
+        rewritten = []
+        stats_lock = threading.Lock()
+
+        def writer(batch):
+            # Join the batch so durable writes fsync the directory once for the whole batch
+            with self.write_batch(batch):
+                while True:
+                    item = write_queue.get()
+
+                    if item is None:
+                        return
+
+                    if errors:
+                        continue
+
+                    idx, full_path, payload = item
+
+                    try:
+                        written = self.write_binary(full_path, payload, compression=compression,
+                                                    compression_level=compression_level,
+                                                    skip_if_unchanged=skip_if_unchanged)
+                    except Exception as exc:
+                        errors.append(exc)
+                        continue
+
+                    if not written:
+                        continue
+
+                    with stats_lock:
+                        stats['files'] += 1
+                        stats['bytes'] += len(payload)
+                        rewritten.append((idx, full_path))
+
+        serialize_pool = None
+
+        with self.write_batch() as batch:
+            writer_threads = [threading.Thread(target=writer, args=(batch,), daemon=True)
+                              for _ in range(max(1, workers))]
+
+            for thread in writer_threads:
+                thread.start()
+
+            try:
+                serialize_args = ((self, data_type, file_data)
+                                  for file_data in file_data_ls)
+
+                if serialize_workers > 0:
+                    serialize_pool = create_executor('process', serialize_workers)
+                    payloads = imap_bounded(serialize_pool, _bulk_serialize_file, serialize_args,
+                                            window=2 * serialize_workers)
+                else:
+                    payloads = (_bulk_serialize_file(*args)
+                                for args in serialize_args)
+
+                for idx, payload in enumerate(payloads):
+                    if errors:
+                        break
+
+                    write_queue.put((idx, file_path(idx), payload))
+            finally:
+                for _ in writer_threads:
+                    write_queue.put(None)
+
+                for thread in writer_threads:
+                    thread.join()
+
+                if serialize_pool is not None:
+                    serialize_pool.shutdown(cancel_futures=True)
+
+        if errors:
+            raise errors[0]
+
+        if skip_if_unchanged:
+            # Writer threads finish out of order
+            stats['rewritten'] = [full_path for _, full_path in sorted(rewritten)]
+            stats['skipped'] = len(file_data_ls) - len(rewritten)
+
+        # Report throughput so callers can tune workers/serialize_workers
+        return _throughput(stats, start_time)
+
+    def _deserialize_by_type(self, data_type: FileTypes, payload: memoryview) -> Any:
+        # The counterpart of _serialize_by_type, through the undecorated read functions
+        if data_type == FileTypes.BINARY:
+            return bytes(payload)
+        elif data_type == FileTypes.PICKLE:
+            read_func, buffer = BaseFileExtensionManager.read_pickle, io.BytesIO(payload)
+        elif data_type == FileTypes.JSON:
+            read_func, buffer = BaseFileExtensionManager.read_json, io.BytesIO(payload)
+        elif data_type == FileTypes.CSV:
+            read_func, buffer = BaseFileExtensionManager.read_csv, io.StringIO(
+                str(payload, 'utf-8'), newline='')
+        else:
+            raise UnsupportedFileType(data_type.name, supported_types=", ".join(
+                file_type.name for file_type in BULK_WRITE_TYPES))
+
+        return read_func.__wrapped__(self, buffer)
+
+    def _pack_items(self, file_data_ls: List[Any], data_type: FileTypes, keys: Union[None, List[Union[None, str]]],
+                    serialize_workers: int) -> Iterator[Tuple[int, bytes, Union[None, str]]]:
+        if keys is not None and len(keys) != len(file_data_ls):
+            raise ValueError('keys must have one key (or None) per item.')
+
+        type_idx = PACK_TYPES.index(data_type)
+        serialize_args = ((self, data_type, file_data) for file_data in file_data_ls)
+
+        if serialize_workers <= 0:
+            for idx, args in enumerate(serialize_args):
+                yield type_idx, _bulk_serialize_file(*args), keys[idx] if keys is not None else None
+            return
+
+        pool = create_executor('process', serialize_workers)
+
+        try:
+            payloads = imap_bounded(pool, _bulk_serialize_file, serialize_args, window=2 * serialize_workers)
+
+            for idx, payload in enumerate(payloads):
+                yield type_idx, payload, keys[idx] if keys is not None else None
+        finally:
+            pool.shutdown(cancel_futures=True)
+
+    def _write_pack(self, file_name: str, write_mode: str, file_data_ls: List[Any], data_type: Union[FileTypes, str],
+                    keys: Union[None, List[Union[None, str]]], serialize_workers: int) -> Dict[str, int]:
+        stats = {}
+        items = self._pack_items(file_data_ls, _parse_bulk_write_type(data_type), keys, serialize_workers)
+
+        # Packs are memory-mapped by readers, they are never compressed
+        self._safe_write_func(file_name, _write_pack_batch, (items, stats), write_mode, compression=None)
+
+        return stats
 
     @path_replace
-    def bulk_read_directory(self, directory_name: str, skip_unsupported_data_type: bool = False,
-                            sort_by: Callable = None, sort_reverse=False,
-                            file_prefix: Union[None, str] = None, include_file_names: bool = False) -> List[Any]:
+    def write_pack(self, file_name: str, file_data_ls: List[Any], data_type: Union[FileTypes, str],
+                   keys: Union[None, List[Union[None, str]]] = None, serialize_workers: int = 0) -> Dict[str, int]:
+        # A new pack goes through the regular write path, so it is written atomically when enabled
+        return self._write_pack(file_name, 'wb', file_data_ls, data_type, keys, serialize_workers)
+
+    @path_replace
+    def append_pack(self, file_name: str, file_data_ls: List[Any], data_type: Union[FileTypes, str],
+                    keys: Union[None, List[Union[None, str]]] = None, serialize_workers: int = 0) -> Dict[str, int]:
+        # Read access is needed to check the footer of the existing pack
+        return self._write_pack(file_name, 'a+b', file_data_ls, data_type, keys, serialize_workers)
+
+    @path_replace
+    def open_pack(self, file_name: str) -> PackReader:
+        return PackReader(file_name, self._deserialize_by_type)
+
+    def _pack_order(self, pack_reader: PackReader, sort_by: Union[None, str, Callable],
+                    sort_reverse: bool) -> List[Tuple[str, int]]:
+        keys = pack_reader.keys()
+        latest = {key: idx for idx, key in enumerate(keys) if key is not None}
+        taken = set(latest)
+        order = []
+
+        for idx, key in enumerate(keys):
+            if key is not None:
+                # A key written again refers to the newer item, like pack_reader[key]
+                if latest[key] == idx:
+                    order.append((key, idx))
+
+                continue
+
+            # Items without a key are named by their position, made unique if a key already has that name
+            name = str(idx)
+            suffix = 1
+
+            while name in taken:
+                name = f'{idx}_{suffix}'
+                suffix += 1
+
+            taken.add(name)
+            order.append((name, idx))
+
+        if isinstance(sort_by, str):
+            sort_by = SORT_KEYS[sort_by]
+
+        if sort_by is not None:
+            order.sort(key=lambda item: sort_by(item[0]), reverse=sort_reverse)
+        elif sort_reverse:
+            order.reverse()
+
+        return order
+
+    def _bulk_read_pack(self, file_name: str, sort_by: Union[None, str, Callable], sort_reverse: bool,
+                        include_file_names: bool) -> Union[List[Any], Dict[str, Any]]:
         data = {}
+        errors = {}
+
+        with self.open_pack(file_name) as pack_reader:
+            order = self._pack_order(pack_reader, sort_by, sort_reverse)
+
+            for name, idx in order:
+                try:
+                    data[name] = pack_reader[idx]
+                except Exception as exc:
+                    errors[name] = exc
+
+        if errors:
+            raise BulkReadDirectoryError(
+                f'{len(errors)} of {len(order)} items could not be read.',
+                errors=errors, data=data) from next(iter(errors.values()))
+
+        if include_file_names:
+            return data
+        else:
+            return list(data.values())
+
+    def _iter_pack(self, file_name: str, sort_by: Union[None, str, Callable],
+                   sort_reverse: bool) -> Iterator[Tuple[str, Any]]:
+        with self.open_pack(file_name) as pack_reader:
+            for name, idx in self._pack_order(pack_reader, sort_by, sort_reverse):
+                yield name, pack_reader[idx]
+
+    def _read_by_extension(self, file_name: str, file_extension: str) -> Any:
+        if file_extension == 'json':
+            return self.read_json(file_name)
+        elif file_extension == 'pickle':
+            return self.read_pickle(file_name)
+        # ...add other data types as needed...
+
+        raise UnsupportedFileType(f'.{file_extension}')
+
+    def _bulk_read_args(self, directory_name: str, skip_unsupported_data_type: bool, sort_by: Callable,
+                        sort_reverse: bool, file_prefix: Union[None, str]) -> List[tuple]:
+        # Shared file selection and ordering for bulk_read_directory and iter_directory
 
         if sort_by == None:
 
             if file_prefix == None:
-                def sort_by(file_name): return int(
-                    file_name.replace(self.get_file_extension(file_name), ''))
+                sort_by = 'numeric'
             else:
-                def sort_by(file_name): return int(file_name.split("-")[0])
+                sort_by = 'numeric_prefix'
 
         sorted_file_names = self.sorted_ls(
             directory_name, sort_by=sort_by, reverse=sort_reverse)
@@ -158,26 +557,137 @@ class AbstractFileManager(BaseFileExtensionManager):
             raise BulkReadDirectoryError(
                 'Duplicate files found. File names should be unique.')
 
+        read_args = []
+
         for file_name in sorted_file_names:
 
+            # 'data.json.gz' is read as JSON, decompressed on the fly
             file_extension = self.get_file_extension(
-                file_name).replace('.', '')
-
-            if file_extension == 'json':
-                data[file_name] = self.read_json(
-                    f"{directory_name}/{file_name}")
-            elif file_extension == 'pickle':
-                data[file_name] = self.read_pickle(
-                    f"{directory_name}/{file_name}")
-            # ...add other data types as needed...
-            else:
+                split_compression_extension(file_name)[0]).replace('.', '')
+
+            if file_extension not in BULK_READ_EXTENSIONS:
 
                 if skip_unsupported_data_type:
                     continue
 
                 raise UnsupportedFileType(f'.{file_extension}')
 
+            read_args.append(
+                (self, f"{directory_name}/{file_name}", file_extension))
+
+        return read_args
+
+    @path_replace
+    def bulk_read_directory(self, directory_name: str, skip_unsupported_data_type: bool = False,
+                            sort_by: Callable = None, sort_reverse=False,
+                            file_prefix: Union[None, str] = None, include_file_names: bool = False,
+                            workers: int = 1, executor: Union[str, 'Executor'] = 'thread') -> List[Any]:
+
+        # Packs written by bulk_write_directory(pack=True) are read in place of a directory
+        if os.path.isfile(directory_name):
+            return self._bulk_read_pack(directory_name, sort_by, sort_reverse, include_file_names)
+
+        data = {}
+
+        read_args = self._bulk_read_args(
+            directory_name, skip_unsupported_data_type, sort_by, sort_reverse, file_prefix)
+
+        results = run_batch(_bulk_read_file, read_args,
+                            executor=executor, workers=workers)
+
+        errors = {}
+
+        for (_, file_path, _), (file_data, exc) in zip(read_args, results):
+            file_name = os.path.basename(file_path)
+
+            if exc is None:
+                data[file_name] = file_data
+            else:
+                errors[file_name] = exc
+
+        if errors:
+            raise BulkReadDirectoryError(
+                f'{len(errors)} of {len(read_args)} files could not be read.',
+                errors=errors, data=data) from next(iter(errors.values()))
+
         if include_file_names:
             return data
         else:
             return list(data.values())
+
+    @path_replace
+    def iter_directory(self, directory_name: str, skip_unsupported_data_type: bool = False,
+                       sort_by: Callable = None, sort_reverse=False,
+                       file_prefix: Union[None, str] = None, prefetch: int = 8) -> Iterator[Tuple[str, Any]]:
+
+        if os.path.isfile(directory_name):
+            yield from self._iter_pack(directory_name, sort_by, sort_reverse)
+            return
+
+        read_args = self._bulk_read_args(
+            directory_name, skip_unsupported_data_type, sort_by, sort_reverse, file_prefix)
+
+        if prefetch <= 0:
+            for args in read_args:
+                yield os.path.basename(args[1]), _bulk_read_file(*args)
+            return
+
+        # Only `prefetch` files are read ahead of the consumer, so at most one window of
+        # decoded objects is held in memory at a time
+        pool = create_executor('thread', prefetch)
+
+        try:
+            results = imap_bounded(
+                pool, _bulk_read_file, read_args, window=prefetch)
+
+            for args, file_data in zip(read_args, results):
+                yield os.path.basename(args[1]), file_data
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+BULK_READ_EXTENSIONS = ('json', 'pickle')
+
+BULK_WRITE_TYPES = (FileTypes.JSON, FileTypes.PICKLE,
+                    FileTypes.CSV, FileTypes.BINARY)
+
+
+def _parse_bulk_write_type(data_type: Union[FileTypes, str]) -> FileTypes:
+    if isinstance(data_type, str):
+        try:
+            data_type = FileTypes[data_type.upper()]
+        except KeyError as exc:
+            raise UnsupportedFileType(data_type) from exc
+
+    if data_type not in BULK_WRITE_TYPES:
+        supported_types = ", ".join(
+            file_type.name for file_type in BULK_WRITE_TYPES)
+        raise UnsupportedFileType(
+            data_type.name, supported_types=supported_types)
+
+    return data_type
+
+
+def _throughput(stats: Dict[str, float], start_time: float) -> Dict[str, float]:
+    seconds = max(time.perf_counter() - start_time, 1e-9)
+
+    stats['seconds'] = seconds
+    stats['files_per_second'] = stats['files'] / seconds
+    stats['mb_per_second'] = stats['bytes'] / 1e6 / seconds
+
+    return stats
+
+
+def _write_pack_batch(file_manager: AbstractFileManager, file, batch: Tuple[Iterator[tuple], Dict[str, int]]):
+    items, stats = batch
+    stats['items'], stats['bytes'] = write_batch(file, items)
+
+
+def _bulk_read_file(file_manager: AbstractFileManager, file_name: str, file_extension: str) -> Any:
+    # Module-level so that it can be sent to worker processes
+    return file_manager._read_by_extension(file_name, file_extension)
+
+
+def _bulk_serialize_file(file_manager: AbstractFileManager, data_type: FileTypes, file_data: Any) -> bytes:
+    # Module-level so that it can be sent to worker processes
+    return file_manager._serialize_by_type(data_type, file_data)
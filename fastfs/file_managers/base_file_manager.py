@@ -1,17 +1,77 @@
+import io
 import os
 
-from typing import Any, Callable, Union, List, Dict, Tuple
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Callable, Iterator, Union, List, Dict, Tuple
 
+import itertools
+import mmap as mmap_lib
+import atexit
 import shutil
+import stat
+import tempfile
+import threading
 import configparser
 
-import json
 import pickle
 import csv
 
 
-from fastfs.exceptions import FileWriteError, FileReadError, FileNotFound, InvalidFileDataError, CorruptFileError
-from fastfs.decorators import path_replace, safe_read, safe_write
+from fastfs.exceptions import FileWriteError, FileReadError, FileNotFound, InvalidFileDataError, CorruptFileError, MissingDependencyError
+from fastfs.decorators import path_replace, safe_read, safe_write, safe_iter
+from fastfs.cache import ReadCache
+from fastfs.instrumentation import HistogramAggregator, OperationRecord
+from fastfs import digests, pickle_buffers
+from fastfs.json_backends import DECODE_ERRORS, ENCODE_ERRORS, JsonBackend, get_json_backend
+from fastfs.compression import is_plain_file, open_file, resolve_compression, wrap_stream
+from fastfs.data_types import Durability
+from fastfs.durability import WriteBatch, default_file_mode, parse_durability, sync_file, sync_directory
+from fastfs.listing_index import ListingIndexes, SORT_KEYS
+
+
+# The number of resolved paths remembered by _resolve_fs_path
+PATH_CACHE_SIZE = 65536
+
+
+# Raised as FileWriteError by writes, other errors (e.g. a ValueError for data of the wrong type) propagate as they are
+WRITE_ERRORS = (OSError, PermissionError, IsADirectoryError, InvalidFileDataError)
+
+
+@lru_cache(maxsize=PATH_CACHE_SIZE)
+def _resolve_fs_path(local_fs: str, file_path: str) -> str:
+    # Pure function of the fastfs directory and the path, so results can be cached across calls
+
+    if file_path == '.fastfs':
+        return file_path
+
+    if os.path.isabs(file_path):
+        return file_path
+
+    if not file_path.startswith(os.path.join('.', local_fs)):
+        return os.path.join('.', local_fs, file_path)
+
+    return file_path
+
+
+def _parse_bool(value: Union[str, bool]) -> bool:
+    if isinstance(value, bool):
+        return value
+
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def _select_csv_columns(headers: List[str], usecols: Union[None, List[Union[str, int]]]
+                        ) -> Tuple[List[str], Union[None, List[int]]]:
+    # Returns the headers of the used columns and their indices, None when every column is used
+    if usecols is None:
+        return headers, None
+
+    try:
+        indices = [col if isinstance(col, int) else headers.index(col) for col in usecols]
+        return [headers[idx] for idx in indices], indices
+    except (ValueError, IndexError) as exc:
+        raise InvalidFileDataError(f'Columns {usecols} not found in the CSV header.') from exc
 
 
 class BaseFileManager():
@@ -20,17 +80,66 @@ class BaseFileManager():
 
         self._fs_active = False
 
+        # Parsed .fastfs contents, reused until the file's mtime or size changes
+        self._config = None
+        self._config_signature = None
+        self._config_loaded = False
+
+        self._atomic_writes = False
+        self._durability = Durability.NONE
+        self._write_batch_local = threading.local()
+
+        self._listing_indexes = None
+
+        # Called with an OperationRecord after every read and write, see enable_instrumentation
+        self._instruments = ()
+
+    def __getstate__(self):
+        # Thread-local state can't be pickled, worker processes get a fresh one.
+        # Instruments stay in the parent, their records couldn't be collected from workers anyway.
+        state = self.__dict__.copy()
+        del state['_write_batch_local']
+        state['_listing_indexes'] = None
+        state['_instruments'] = ()
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._write_batch_local = threading.local()
+
+    def _config_snapshot(self) -> Union[None, Dict[Any, Any]]:
+        try:
+            stat_result = os.stat('.fastfs')
+        except FileNotFoundError:
+            self._config, self._config_signature = None, None
+            return None
+
+        signature = (stat_result.st_mtime_ns, stat_result.st_size)
+
+        if self._config is None or signature != self._config_signature:
+            self._config = self.read_ini('.fastfs')
+            self._config_signature = signature
+
+        return self._config
+
     def _read_local_fs(self):
-        if not os.path.exists('.fastfs'):
-            return None, False
+        fast_fs_config = self._config_snapshot()
 
-        fast_fs_config = self.read_ini('.fastfs')
+        if fast_fs_config is None or 'directory' not in fast_fs_config:
+            return None, False
 
-        local_fs = fast_fs_config['fastfs_directory']
-        fs_active = fast_fs_config['fastfs_active']
+        local_fs = fast_fs_config['directory']
+        fs_active = _parse_bool(fast_fs_config.get('active', True))
 
         return local_fs, fs_active
 
+    def reload_config(self):
+        # Set first, reading .fastfs goes through _path_replace itself
+        self._config_loaded = True
+        self._config_signature = None
+
+        self._local_fs, self._fs_active = self._read_local_fs()
+
     @property
     def local_fs(self):
         if self._local_fs is None:
@@ -39,23 +148,18 @@ class BaseFileManager():
 
     def _path_replace(self, file_path: str) -> str:
 
+        # Pick up the .fastfs written by an earlier process on first use
+        if not self._config_loaded:
+            self.reload_config()
+
         # If fastfs
         if not self._fs_active:
             return file_path
 
-        if file_path == '.fastfs':
-            return file_path
-
-        if self.local_fs is None:
-            return file_path
-
-        if os.path.isabs(file_path):
+        if self._local_fs is None:
             return file_path
 
-        if not file_path.startswith(os.path.join('.', self.local_fs)):
-            return os.path.join('.', self.local_fs, file_path)
-
-        return file_path
+        return _resolve_fs_path(self._local_fs, file_path)
 
     def create_fs(self, directory_name: str, active: bool = True):
 
@@ -66,37 +170,265 @@ class BaseFileManager():
         self.write_ini('.fastfs', config)
         self._local_fs = directory_name
         self._fs_active = active
+        self._config_loaded = True
+        self._config_signature = None
+
+    def set_write_options(self, atomic: Union[None, bool] = None, durability: Union[None, str, Durability] = None):
+        if atomic is not None:
+            self._atomic_writes = atomic
+
+        if durability is not None:
+            self._durability = parse_durability(durability)
+
+    @contextmanager
+    def write_batch(self, batch: Union[None, WriteBatch] = None):
+        # Writes made on this thread inside the block defer their directory fsync to the end of
+        # the outermost batch. Worker threads join an existing batch by passing it in.
+        local = self._write_batch_local
+        previous = getattr(local, 'batch', None)
+        owner = batch is None and previous is None
+
+        if batch is None:
+            batch = previous if previous is not None else WriteBatch()
+
+        local.batch = batch
+
+        try:
+            yield batch
+        finally:
+            local.batch = previous
+
+            if owner:
+                batch.sync()
+
+    def _sync_written_file(self, file):
+        if self._durability == Durability.NONE:
+            return
+
+        file.flush()
+        sync_file(file.fileno())
+
+    def _sync_written_directory(self, file_name: str):
+        if self._durability != Durability.FULL:
+            return
+
+        directory_name = os.path.dirname(file_name)
+        batch = getattr(self._write_batch_local, 'batch', None)
+
+        if batch is not None:
+            batch.add(directory_name)
+        else:
+            sync_directory(directory_name)
 
     @path_replace
-    def _safe_write_func(self, file_name: str, func: Callable, file_data: Any,
-                         write_mode='w', encoding='utf-8', *args, **kwargs):
+    def _safe_write_func(self, file_name: str, func: Callable, file_data: Any, write_mode='w', *args,
+                         encoding='utf-8', compression='infer', compression_level=None, skip_if_unchanged=False,
+                         **kwargs) -> bool:
+
+        compression = resolve_compression(file_name, compression)
+
+        if skip_if_unchanged:
+            return self._write_if_changed(file_name, func, file_data, write_mode, *args, encoding=encoding,
+                                          compression=compression, compression_level=compression_level, **kwargs)
+
+        self._run_write(file_name, func, file_data, write_mode, *args, encoding=encoding, compression=compression,
+                        compression_level=compression_level, **kwargs)
+
+        return True
+
+    def _run_write(self, file_name: str, func: Callable, file_data: Any, write_mode: str, *args, **kwargs):
+        if self._instruments:
+            self._instrumented_call('write', self._write_file, file_name, func, file_data, write_mode, *args, **kwargs)
+        else:
+            self._write_file(file_name, func, file_data, write_mode, *args, **kwargs)
+
+    def _serialize(self, func: Callable, file_data: Any, write_mode: str, encoding: str, *args, **kwargs) -> bytes:
+        # Produces the bytes the write would put in an uncompressed file
+        buffer = io.BytesIO()
+
+        if 'b' in write_mode:
+            func(self, buffer, file_data, *args, **kwargs)
+            return buffer.getvalue()
+
+        # Same encoding and newline translation as a file opened with open()
+        text = io.TextIOWrapper(buffer, encoding=encoding)
+        func(self, text, file_data, *args, **kwargs)
+        text.flush()
+
+        payload = buffer.getvalue()
+        text.detach()
+
+        return payload
+
+    def _write_if_changed(self, file_name: str, func: Callable, file_data: Any, write_mode: str, *args,
+                          encoding: str, compression: Union[None, str], compression_level: Union[None, int],
+                          **kwargs) -> bool:
+        if 'a' in write_mode:
+            raise ValueError('skip_if_unchanged is not supported for appends.')
+
+        # Serialization errors are reported like those of the normal write path, which serializes into the file
+        try:
+            payload = self._serialize(func, file_data, write_mode, encoding, *args, **kwargs)
+        except WRITE_ERRORS as exc:
+            raise FileWriteError from exc
+
+        digest = digests.content_digest(payload, compression)
+
+        if digests.is_unchanged(file_name, digest):
+            return False
+
+        def write_payload(manager, file, data):
+            file.write(data)
+
+        # Instruments report the write under the name of the serializing function
+        write_payload.__name__ = func.__name__
+
+        self._run_write(file_name, write_payload, payload, 'wb', encoding=None, compression=compression,
+                        compression_level=compression_level)
+
+        try:
+            digests.store_digest(file_name, digest)
+        except OSError as exc:
+            raise FileWriteError from exc
+
+        return True
+
+    def _write_file(self, file_name: str, func: Callable, file_data: Any, write_mode: str, *args,
+                    encoding: str, compression: Union[None, str], compression_level: Union[None, int], **kwargs):
+        directory_mtime_ns = self._directory_mtime_ns(file_name)
 
         try:
 
             encoding = None if 'b' in write_mode else encoding
 
-            # Open the file in write mode
-            with open(file_name, write_mode, encoding=encoding) as file:
-                # Call the decorated function
-                func(self, file, file_data, *args, **kwargs)
-        except (OSError, PermissionError, IsADirectoryError, InvalidFileDataError) as exc:
+            # Appends can't be done through a temporary file
+            if self._atomic_writes and 'a' not in write_mode:
+                self._atomic_write(file_name, func, file_data, write_mode, encoding,
+                                   compression, compression_level, *args, **kwargs)
+            else:
+                # Open the file in write mode
+                with open_file(file_name, write_mode, encoding, compression, compression_level,
+                               on_written=self._sync_written_file) as file:
+                    # Call the decorated function
+                    func(self, file, file_data, *args, **kwargs)
+
+            self._sync_written_directory(file_name)
+        except WRITE_ERRORS as exc:
             raise FileWriteError from exc
+        finally:
+            # The file may have been (partially) rewritten even if the write failed
+            self._file_changed(file_name, directory_mtime_ns)
+
+    def _atomic_write(self, file_name: str, func: Callable, file_data: Any, write_mode: str, encoding: Union[None, str],
+                      compression: Union[None, str], compression_level: Union[None, int], *args, **kwargs):
+        # Write to a hidden temporary file next to the destination and rename it over the
+        # destination, so readers only ever see the old or the new contents, never a partial file.
+        directory_name = os.path.dirname(file_name)
+
+        fd, temp_file_name = tempfile.mkstemp(
+            prefix=f'.{os.path.basename(file_name)}.', suffix='.tmp', dir=directory_name or '.')
+
+        try:
+            with open_file(fd, write_mode, encoding, compression, compression_level,
+                           on_written=self._sync_written_file) as file:
+                func(self, file, file_data, *args, **kwargs)
+
+            try:
+                mode = os.stat(file_name).st_mode
+            except FileNotFoundError:
+                mode = default_file_mode()
+
+            os.chmod(temp_file_name, stat.S_IMODE(mode))
+            os.replace(temp_file_name, file_name)
+        except BaseException:
+            try:
+                os.remove(temp_file_name)
+            except OSError:
+                pass
+            raise
+
+    def _directory_mtime_ns(self, file_name: str) -> Union[None, int]:
+        """Called before fastfs writes or deletes a file, the result is passed on to _file_changed."""
+        if self._listing_indexes is not None:
+            return self._listing_indexes.directory_mtime_ns(file_name)
+
+        return None
+
+    def _file_changed(self, file_name: str, directory_mtime_ns: Union[None, int] = None):
+        """
+        Called after fastfs writes or deletes a file. Subclasses hook in here to drop stale state.
+
+        directory_mtime_ns is what _directory_mtime_ns returned before the change. Without it, an indexed directory
+        is listed again on its next use.
+        """
+        if self._listing_indexes is not None:
+            self._listing_indexes.file_changed(file_name, directory_mtime_ns)
+
+    def enable_instrumentation(self, instrument: Union[None, Callable[[OperationRecord], Any]] = None) -> Callable[[OperationRecord], Any]:
+        # Instruments are called with the OperationRecord of every read and write, several can be enabled at once
+        if instrument is None:
+            instrument = HistogramAggregator()
+
+        self._instruments = self._instruments + (instrument,)
+
+        return instrument
+
+    def disable_instrumentation(self, instrument: Union[None, Callable[[OperationRecord], Any]] = None):
+        if instrument is None:
+            self._instruments = ()
+        else:
+            self._instruments = tuple(
+                enabled for enabled in self._instruments if enabled is not instrument)
+
+    @property
+    def instruments(self) -> Tuple[Callable[[OperationRecord], Any], ...]:
+        return self._instruments
+
+    def _record_operation(self, operation: OperationRecord):
+        operation.finish()
+
+        for instrument in self._instruments:
+            instrument(operation)
+
+    def _instrumented_call(self, kind: str, run: Callable, file_name: str, func: Callable, *args, **kwargs):
+        operation = OperationRecord(func.__name__, kind, file_name)
+
+        try:
+            return run(file_name, operation.wrap(func), *args, **kwargs)
+        except BaseException as exc:
+            operation.error = exc
+            raise
+        finally:
+            self._record_operation(operation)
 
     @path_replace
-    def _safe_read_func(self, file_name: str, func: Callable, read_mode='r',
-                        context_manager=True, encoding='utf-8', *args, **kwargs):
+    def _safe_read_func(self, file_name: str, func: Callable, read_mode='r', context_manager=True, *args,
+                        encoding='utf-8', compression='infer', **kwargs):
+
+        compression = resolve_compression(file_name, compression)
+
+        if self._instruments:
+            return self._instrumented_call('read', self._read_file, file_name, func, read_mode, context_manager,
+                                           *args, encoding=encoding, compression=compression, **kwargs)
+
+        return self._read_file(file_name, func, read_mode, context_manager, *args, encoding=encoding,
+                               compression=compression, **kwargs)
+
+    def _read_file(self, file_name: str, func: Callable, read_mode: str, context_manager: bool, *args,
+                   encoding: str, compression: Union[None, str], **kwargs):
 
         try:
 
             encoding = None if 'b' in read_mode else encoding
 
             if context_manager:
-                with open(file_name, read_mode, encoding=encoding) as file:
+                with open_file(file_name, read_mode, encoding, compression) as file:
                     # Call the decorated function
                     return func(self, file, *args, **kwargs)
 
             else:
-                file = open(file_name, read_mode, encoding=encoding)
+                file = open(file_name, read_mode, encoding=encoding) if compression is None else \
+                    wrap_stream(open(file_name, 'rb'), read_mode, compression, encoding=encoding)
 
                 return func(self, file, *args, **kwargs)
 
@@ -105,6 +437,46 @@ class BaseFileManager():
         except (OSError, PermissionError, IsADirectoryError) as exc:
             raise FileReadError from exc
 
+    @path_replace
+    def _safe_iter_func(self, file_name: str, func: Callable, read_mode='r', *args, encoding='utf-8',
+                        compression='infer', **kwargs):
+
+        compression = resolve_compression(file_name, compression)
+
+        if self._instruments:
+            return self._instrumented_iter(file_name, func, read_mode, *args, encoding=encoding,
+                                           compression=compression, **kwargs)
+
+        return self._iter_file(file_name, func, read_mode, *args, encoding=encoding, compression=compression, **kwargs)
+
+    def _instrumented_iter(self, file_name: str, func: Callable, *args, **kwargs):
+        operation = OperationRecord(func.__name__, 'iter', file_name)
+
+        try:
+            yield from self._iter_file(file_name, operation.wrap_iter(func), *args, **kwargs)
+        except GeneratorExit:
+            raise
+        except BaseException as exc:
+            operation.error = exc
+            raise
+        finally:
+            self._record_operation(operation)
+
+    def _iter_file(self, file_name: str, func: Callable, read_mode: str, *args, encoding: str,
+                   compression: Union[None, str], **kwargs):
+
+        try:
+
+            encoding = None if 'b' in read_mode else encoding
+
+            with open_file(file_name, read_mode, encoding, compression) as file:
+                yield from func(self, file, *args, **kwargs)
+
+        except FileNotFoundError as exc:
+            raise FileNotFound(file_name) from exc
+        except (OSError, PermissionError, IsADirectoryError) as exc:
+            raise FileReadError from exc
+
     @path_replace
     def is_hidden_file(self, file_name):
         name = os.path.basename(os.path.abspath(file_name))
@@ -122,9 +494,9 @@ class BaseFileManager():
         return os.path.exists(file_name)
 
     def get_fs_directory(self, absolute_path=False):
-        if self.file_exists('.fastfs'):
-            config = self.read_ini('.fastfs')
+        config = self._config_snapshot()
 
+        if config is not None:
             path = config['directory']
 
             if absolute_path:
@@ -136,21 +508,50 @@ class BaseFileManager():
 
     @path_replace
     def delete_file(self, file_name: str):
+        directory_mtime_ns = self._directory_mtime_ns(file_name)
+
         os.remove(file_name)
+        # A skip_if_unchanged digest kept in a sidecar file would otherwise outlive its file
+        digests.remove_digest(file_name)
+        self._file_changed(file_name, directory_mtime_ns)
 
     @path_replace
     def delete_directory(self, directory_name: str):
         shutil.rmtree(directory_name)
 
+        if self._listing_indexes is not None:
+            self._listing_indexes.directory_removed(directory_name)
+
+    def enable_listing_index(self, persist: bool = True) -> ListingIndexes:
+        if self._listing_indexes is None:
+            self._listing_indexes = ListingIndexes(persist=persist)
+
+            if persist:
+                atexit.register(self.save_listing_indexes)
+
+        return self._listing_indexes
+
+    def disable_listing_index(self):
+        self.save_listing_indexes()
+        self._listing_indexes = None
+
+    def save_listing_indexes(self):
+        if self._listing_indexes is not None:
+            self._listing_indexes.save()
+
     @path_replace
     def ls(self, directory: str, show_hidden=False):
 
+        if self._listing_indexes is not None:
+            return self._listing_indexes.get(directory).names(show_hidden=show_hidden)
+
         files = os.listdir(directory)
 
         if show_hidden:
             return files
         else:
-            return [file for file in files if not self.is_hidden_file(file)]
+            # listdir returns base names, so there is no need to resolve each one through is_hidden_file
+            return [file for file in files if not file.startswith('.')]
 
     def _remove_extension(self, file_name):
         root, ext = os.path.splitext(file_name)
@@ -158,20 +559,27 @@ class BaseFileManager():
             return file_name
         return root
 
-    def sorted_ls(self, directory: str, sort_by: Callable[[str], Any], reverse: bool = False) -> List[str]:
+    def sorted_ls(self, directory: str, sort_by: Union[str, Callable[[str], Any]], reverse: bool = False) -> List[str]:
+
+        # Sorting by a SORT_KEYS name reuses the keys parsed when the index was built
+        if self._listing_indexes is not None:
+            return self._listing_indexes.get(self._path_replace(directory)).sorted_names(sort_by, reverse=reverse)
+
+        if isinstance(sort_by, str):
+            sort_by = SORT_KEYS[sort_by]
 
         ls = self.ls(directory)
 
         return sorted(ls, key=sort_by, reverse=reverse)
 
-    @safe_write()
+    @safe_write(compression=None)
     def write_file(self, file, file_data):
         if not isinstance(file_data, str):
             file_data = str(file_data)
 
         file.write(file_data)
 
-    @safe_read()
+    @safe_read(compression=None)
     def read_file(self, file):
         return file.read()
 
@@ -242,32 +650,157 @@ class BaseFileManager():
 
 
 class BaseFileExtensionManager(BaseFileManager):
+    def __init__(self):
+        super().__init__()
 
-    @safe_write(write_mode='wb')
+        self._read_cache = None
+        self._json_backend = 'auto'
+
+    def __getstate__(self):
+        # The cache holds a lock and can be large, worker processes start without one
+        state = super().__getstate__()
+        state['_read_cache'] = None
+        return state
+
+    def enable_read_cache(self, max_bytes: int = 256 * 1024 * 1024, return_mode: str = 'copy') -> ReadCache:
+        self._read_cache = ReadCache(
+            max_bytes=max_bytes, return_mode=return_mode)
+        return self._read_cache
+
+    def disable_read_cache(self):
+        self._read_cache = None
+
+    @property
+    def read_cache(self) -> Union[None, ReadCache]:
+        return self._read_cache
+
+    @path_replace
+    def invalidate_read_cache(self, file_name: Union[None, str] = None):
+        if self._read_cache is None:
+            return
+
+        if file_name is None:
+            self._read_cache.clear()
+        else:
+            self._read_cache.invalidate(file_name)
+
+    def _file_changed(self, file_name: str, directory_mtime_ns: Union[None, int] = None):
+        super()._file_changed(file_name, directory_mtime_ns)
+
+        if self._read_cache is not None:
+            self._read_cache.invalidate(file_name)
+
+    def set_json_backend(self, backend: str = 'auto'):
+        # Resolved right away, so a missing library is reported here rather than on the next read
+        get_json_backend(backend)
+        self._json_backend = backend
+
+    @property
+    def json_backend(self) -> JsonBackend:
+        return get_json_backend(self._json_backend)
+
+    def _get_json_backend(self, backend: Union[None, str]) -> JsonBackend:
+        return get_json_backend(backend if backend is not None else self._json_backend)
+
+    @path_replace
+    def _cached_read_func(self, file_name: str, func: Callable, read_mode='r', compression='infer', **kwargs):
+        read_cache = self._read_cache
+
+        try:
+            signature = ReadCache.file_signature(os.stat(file_name))
+        except FileNotFoundError as exc:
+            raise FileNotFound(file_name) from exc
+        except OSError as exc:
+            raise FileReadError from exc
+
+        hit, value = read_cache.get(file_name, func.__name__, signature)
+
+        if hit:
+            if self._instruments:
+                operation = OperationRecord(func.__name__, 'read', file_name)
+                operation.cache_hit = True
+                self._record_operation(operation)
+
+            return value
+
+        value = self._safe_read_func(file_name, func, read_mode, compression=compression, **kwargs)
+
+        return read_cache.put(file_name, func.__name__, signature, value)
+
+    @safe_write(write_mode='wb', compression=None)
     def write_binary(self, file, file_data: bytes):
         if not isinstance(file_data, bytes):
             raise ValueError("Data should be bytes for writing binary.")
         file.write(file_data)
 
-    @safe_read(read_mode='rb')
-    def read_binary(self, file):
+    @safe_read(read_mode='rb', compression=None)
+    def read_binary(self, file, mmap: bool = False) -> Union[bytes, memoryview]:
+        if mmap:
+            return self._map_file(file)
+
         return file.read()
 
+    def _map_file(self, file) -> memoryview:
+        # Compressed files are mapped decompressed, i.e. read into memory
+        if not is_plain_file(file):
+            return memoryview(file.read())
+
+        # Empty files can't be mapped
+        if os.fstat(file.fileno()).st_size == 0:
+            return memoryview(b'')
+
+        # The mmap duplicates the file descriptor, so it outlives the closed file object. The returned
+        # memoryview keeps the mapping alive, and it is unmapped once the view is released or collected.
+        mapping = mmap_lib.mmap(file.fileno(), 0, access=mmap_lib.ACCESS_READ)
+        return memoryview(mapping)
+
+    @safe_read(read_mode='rb', compression=None)
+    def map_binary(self, file) -> memoryview:
+        return self._map_file(file)
+
+    @safe_read(read_mode='rb', compression=None)
+    def read_binary_into(self, file, buffer: Union[bytearray, memoryview], offset: int = 0) -> int:
+        if offset:
+            file.seek(offset)
+
+        view = memoryview(buffer).cast('B')
+        total = 0
+
+        # readinto may return fewer bytes than requested, keep going until the buffer is full or EOF
+        while total < len(view):
+            read_size = file.readinto(view[total:])
+
+            if not read_size:
+                break
+
+            total += read_size
+
+        return total
+
     @safe_write(write_mode='wb')
-    def write_pickle(self, file, file_data):
+    def write_pickle(self, file, file_data, out_of_band: bool = False):
 
         try:
-            pickle.dump(file_data, file)
+            if out_of_band:
+                pickle_buffers.dump(file_data, file)
+            else:
+                pickle.dump(file_data, file)
         except pickle.PicklingError as exc:
             raise InvalidFileDataError(
                 'Object may not be serializable.') from exc
-        except (OverflowError, MemoryError, AttributeError) as exc:
+        except (OverflowError, MemoryError, AttributeError, BufferError) as exc:
             raise FileWriteError from exc
 
-    @safe_read(read_mode='rb')
-    def read_pickle(self, file):
+    @safe_read(read_mode='rb', cacheable=True)
+    def read_pickle(self, file, mmap: bool = False):
 
         try:
+            # Pickles with out-of-band buffers are recognized by their header
+            if file.read(len(pickle_buffers.MAGIC)) == pickle_buffers.MAGIC:
+                return pickle_buffers.load(file, mmap=mmap)
+
+            file.seek(0)
+
             return pickle.load(file)
         except pickle.UnpicklingError as exc:
             raise CorruptFileError('Failed to unpickle the file.') from exc
@@ -284,25 +817,24 @@ class BaseFileExtensionManager(BaseFileManager):
             raise CorruptFileError(
                 'An error occured while unpickling.') from exc
 
-    @safe_write()
-    def write_json(self, file, file_data):
+    @safe_write(write_mode='wb')
+    def write_json(self, file, file_data, backend: Union[None, str] = None):
 
         try:
-            json.dump(file_data, file)
-        except TypeError as exc:
-            raise InvalidFileDataError(
-                'Failed to serialize the data.') from exc
-        except OverflowError as exc:
+            # Encoded in one call and written as bytes, no text layer in between
+            file.write(self._get_json_backend(backend).dumps(file_data))
+        except RecursionError as exc:
             raise InvalidFileDataError(
                 'The data is too deeply nested.') from exc
-        except json.JSONDecodeError as exc:
-            raise InvalidFileDataError('Could not encode JSON.') from exc
+        except ENCODE_ERRORS as exc:
+            raise InvalidFileDataError(
+                'Failed to serialize the data.') from exc
 
-    @safe_read()
-    def read_json(self, file):
+    @safe_read(read_mode='rb', cacheable=True)
+    def read_json(self, file, backend: Union[None, str] = None):
         try:
-            return json.load(file)
-        except json.JSONDecodeError as exc:
+            return self._get_json_backend(backend).loads(file.read())
+        except DECODE_ERRORS as exc:
             raise InvalidFileDataError('Could not decode JSON.') from exc
 
     @safe_write()
@@ -347,3 +879,47 @@ class BaseFileExtensionManager(BaseFileManager):
             raise InvalidFileDataError('Failed to read CSV data.') from exc
         except (AttributeError, TypeError) as exc:
             raise InvalidFileDataError('The data is not readable.') from exc
+
+    @safe_read()
+    def _read_csv_headers(self, file, usecols: Union[None, List[Union[str, int]]] = None) -> List[str]:
+        try:
+            headers = next(csv.reader(file), [])
+        except csv.Error as exc:
+            raise InvalidFileDataError('Failed to read CSV data.') from exc
+
+        return _select_csv_columns(headers, usecols)[0] if headers else headers
+
+    @safe_iter()
+    def iter_csv(self, file, batch_size: int = 10000, as_dicts: bool = False,
+                 usecols: Union[None, List[Union[str, int]]] = None) -> Iterator[Union[Tuple[List[str], List[List[str]]], List[dict]]]:
+        try:
+            reader = csv.reader(file)
+            headers = next(reader, None)  # First line should be headers
+
+            if headers is None:
+                return
+
+            headers, indices = _select_csv_columns(headers, usecols)
+
+            # Blank lines are skipped like csv.DictReader does
+            rows_iter = (row for row in reader if row)
+
+            # Unused columns are dropped as each row is read, so a batch only ever holds the used ones
+            if indices is not None:
+                rows_iter = ([row[idx] for idx in indices] for row in rows_iter)
+
+            while True:
+                rows = list(itertools.islice(rows_iter, batch_size))
+
+                if not rows:
+                    return
+
+                if as_dicts:
+                    yield [dict(zip(headers, row)) for row in rows]
+                else:
+                    yield headers, rows
+
+        except csv.Error as exc:
+            raise InvalidFileDataError('Failed to read CSV data.') from exc
+        except (AttributeError, TypeError, IndexError) as exc:
+            raise InvalidFileDataError('The data is not readable.') from exc
@@ -1,108 +1,293 @@
 from fastfs.file_managers.abstract_file_manager import AbstractFileManager
 from fastfs.decorators import safe_read, safe_write, path_replace
 
-from typing import Any, List, Union
+import itertools
+import os
 
-from fastfs.exceptions import InvalidFileDataError, CorruptFileError, FileNotFound, MissingDependencyError, FileWriteError, FileReadError, UnsupportedFileType
+from typing import Any, Dict, Iterator, List, Tuple, Union
 
+from fastfs.exceptions import InvalidFileDataError, CorruptFileError, FileNotFound, FileWriteError, FileReadError
+from fastfs.dependencies import import_optional
+from fastfs import dataframes
+from fastfs.dataframes import DEFAULT_CHUNK_SIZE, DEFAULT_HDF5_KEY, dataframe_format, unsupported_type
+from fastfs.hdf5 import HDF5Dataset, append_rows, as_rows, check_options, create_dataset, dataset_names, dataset_options
 
-try:
-    import yaml
-except ImportError:
-    yaml = None
 
-try:
-    import h5py
-except ImportError:
-    h5py = None
+def _infer_column(np, values: 'np.ndarray') -> 'np.ndarray':
+    # Tries each type on the whole column at once, from the most to the least specific.
+    # Empty cells are treated as missing values (nan/NaT).
+    missing = values == ''
+    has_missing = bool(missing.any())
 
+    if not has_missing:
+        try:
+            return values.astype(np.int64)
+        except (ValueError, OverflowError):
+            pass
+
+    filled = np.where(missing, 'nan', values) if has_missing else values
+
+    try:
+        return filled.astype(np.float64)
+    except ValueError:
+        pass
+
+    if not has_missing:
+        lowered = np.char.lower(values)
+        is_true = lowered == 'true'
+
+        if (is_true | (lowered == 'false')).all():
+            return is_true
 
-try:
-    import pandas as pd
-except ImportError:
-    pd = None
+    try:
+        return values.astype('datetime64')
+    except ValueError:
+        pass
+
+    return values
+
+
+def _dataset(h5_file: 'h5py.File', file_name: str, name: str) -> 'h5py.Dataset':
+    try:
+        return h5_file[name]
+    except KeyError:
+        raise KeyError(f'No dataset {name} in {file_name}.') from None
 
 
 class ExtensionFileManager(AbstractFileManager):
 
     @safe_write()
     def write_yaml(self, file, data: Any):
-        try:
-            if yaml is None:
-                raise MissingDependencyError("PyYAML")
+        yaml = import_optional('yaml', 'PyYAML')
 
+        try:
             yaml.dump(data, file)
         except yaml.YAMLError as exc:
             raise InvalidFileDataError('Failed to write YAML data.') from exc
 
-    @safe_read()
+    @safe_read(cacheable=True)
     def read_yaml(self, file):
-        try:
-            if yaml is None:
-                raise MissingDependencyError("PyYAML")
+        yaml = import_optional('yaml', 'PyYAML')
 
+        try:
             return yaml.safe_load(file)
         except yaml.YAMLError as exc:
             raise CorruptFileError('Failed to read YAML data.') from exc
 
     @path_replace
-    def write_hdf5(self, file_name: str, data: Any):
+    def write_hdf5(self, file_name: str, data: Any, dataset: str = 'data', mode: str = 'w',
+                   compression: Union[None, str] = None, compression_level: Union[None, int] = None,
+                   shuffle: Union[None, bool] = None, chunks: Union[None, bool, Tuple[int, ...]] = None,
+                   resizable: bool = False):
+        check_options(compression, compression_level)
+
+        if mode not in ('w', 'a'):
+            raise ValueError("mode must be 'w' to replace the file or 'a' to add datasets to it.")
+
+        # A dict writes one dataset per key
+        datasets = data if isinstance(data, dict) else {dataset: data}
+        directory_mtime_ns = self._directory_mtime_ns(file_name)
+
         try:
-            if h5py is None:
-                raise MissingDependencyError("hyp5")
+            h5py = import_optional('h5py')
+            np = import_optional('numpy')
 
-            with h5py.File(file_name, 'w') as f:
-                f.create_dataset('data', data=data)
+            with h5py.File(file_name, mode) as f:
+                for name, values in datasets.items():
+                    values = np.asarray(values)
+                    options = dataset_options(values.shape, compression, compression_level, shuffle, chunks,
+                                              resizable)
+
+                    create_dataset(f, name, values, **options)
         except (OSError, PermissionError, IsADirectoryError, InvalidFileDataError) as exc:
             raise FileWriteError from exc
+        finally:
+            self._file_changed(file_name, directory_mtime_ns)
 
     @path_replace
-    def read_hdf5(self, file_name: str):
+    def append_hdf5(self, file_name: str, data: Any, dataset: str = 'data', compression: Union[None, str] = None,
+                    compression_level: Union[None, int] = None, shuffle: Union[None, bool] = None,
+                    chunks: Union[None, bool, Tuple[int, ...]] = None) -> int:
+        check_options(compression, compression_level)
+        directory_mtime_ns = self._directory_mtime_ns(file_name)
+
         try:
-            if h5py is None:
-                raise MissingDependencyError("hyp5")
+            h5py = import_optional('h5py')
+            rows = as_rows(data)
+
+            # The storage options only apply when the dataset is created by this append
+            options = dataset_options(rows.shape, compression, compression_level, shuffle, chunks, resizable=True)
+
+            with h5py.File(file_name, 'a') as f:
+                return append_rows(f, dataset, rows, options)
+        except (OSError, PermissionError, IsADirectoryError, InvalidFileDataError) as exc:
+            raise FileWriteError from exc
+        finally:
+            self._file_changed(file_name, directory_mtime_ns)
+
+    @path_replace
+    def read_hdf5(self, file_name: str, dataset: Union[None, str, List[str]] = 'data', slice: Any = None):
+        try:
+            h5py = import_optional('h5py')
+
+            with h5py.File(file_name, 'r') as f:
+                if dataset is None:
+                    dataset = dataset_names(f)
+
+                # Only the selected elements are read, the rest of the dataset stays on disk
+                index = () if slice is None else slice
+
+                if isinstance(dataset, str):
+                    return _dataset(f, file_name, dataset)[index]
+
+                return {name: _dataset(f, file_name, name)[index] for name in dataset}
+        except FileNotFoundError as exc:
+            raise FileNotFound(file_name) from exc
+        except (OSError, PermissionError, IsADirectoryError) as exc:
+            raise FileReadError from exc
+
+    @path_replace
+    def list_hdf5_datasets(self, file_name: str) -> List[str]:
+        try:
+            h5py = import_optional('h5py')
 
             with h5py.File(file_name, 'r') as f:
-                return f['data'][()]
+                return dataset_names(f)
         except FileNotFoundError as exc:
             raise FileNotFound(file_name) from exc
         except (OSError, PermissionError, IsADirectoryError) as exc:
             raise FileReadError from exc
 
     @path_replace
-    def write_dataframe(self, file_name: str, dataframe: 'pd.DataFrame', sep: str = ',', header: Union[bool, List[str]] = True, index: bool = True):
+    def open_hdf5(self, file_name: str, dataset: str = 'data', mode: str = 'r', compression: Union[None, str] = None,
+                  compression_level: Union[None, int] = None, shuffle: Union[None, bool] = None,
+                  chunks: Union[None, bool, Tuple[int, ...]] = None) -> HDF5Dataset:
+        check_options(compression, compression_level)
+
+        if mode not in ('r', 'a'):
+            raise ValueError("mode must be 'r' to read or 'a' to read and append.")
+
+        h5py = import_optional('h5py')
+
+        try:
+            f = h5py.File(file_name, mode)
+        except FileNotFoundError as exc:
+            raise FileNotFound(file_name) from exc
+        except (OSError, PermissionError, IsADirectoryError) as exc:
+            raise FileReadError from exc
+
         try:
-            if pd is None:
-                raise MissingDependencyError("pandas")
+            h5_dataset = _dataset(f, file_name, dataset)
+        except BaseException:
+            f.close()
+            raise
 
-            file_extension = self.get_file_extension(file_name)
+        append_options = None
 
-            if file_extension != '.csv':
-                file_name = file_name.replace(file_extension, '.csv')
+        if mode == 'a':
+            append_options = dataset_options(h5_dataset.shape, compression, compression_level, shuffle, chunks,
+                                             resizable=True)
 
-            dataframe.to_csv(file_name, sep=sep, header=header, index=index)
+        return HDF5Dataset(file_name, f, h5_dataset, append_options)
 
+    def iter_hdf5(self, file_name: str, dataset: str = 'data', rows: Union[None, int] = None, start: int = 0,
+                  stop: Union[None, int] = None) -> Iterator[Any]:
+        with self.open_hdf5(file_name, dataset) as handle:
+            yield from handle.iter_rows(rows, start, stop)
+
+    @path_replace
+    def write_dataframe(self, file_name: str, dataframe: 'pd.DataFrame', sep: str = ',',
+                        header: Union[bool, List[str]] = True, index: bool = True, compression: Any = 'infer',
+                        key: str = DEFAULT_HDF5_KEY, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        # Only checks that pandas is installed, the writers are DataFrame methods
+        import_optional('pandas')
+
+        file_format = dataframe_format(file_name)
+
+        # Extensions without a DataFrame format keep being written as CSV
+        if file_format is None:
+            file_name = os.path.splitext(file_name)[0] + '.csv'
+            file_format = 'csv'
+
+        directory_mtime_ns = self._directory_mtime_ns(file_name)
+
+        try:
+            dataframes.write(file_name, dataframe, file_format, sep=sep, header=header, index=index,
+                             compression=compression, key=key, chunk_size=chunk_size)
         except (OSError, PermissionError, IsADirectoryError, InvalidFileDataError) as exc:
             raise FileWriteError from exc
+        finally:
+            self._file_changed(file_name, directory_mtime_ns)
 
     @path_replace
-    def read_dataframe(self, file_name: str, sep: str = ',') -> 'pd.DataFrame':
+    def read_dataframe(self, file_name: str, sep: str = ',', columns: Union[None, List[str]] = None,
+                       row_groups: Union[None, List[int]] = None, key: str = DEFAULT_HDF5_KEY) -> 'pd.DataFrame':
+        file_format = dataframe_format(file_name)
+
+        if file_format is None:
+            raise unsupported_type(file_name)
+
         try:
-            if pd is None:
-                raise MissingDependencyError("pandas")
+            return dataframes.read(file_name, file_format, sep=sep, columns=columns, row_groups=row_groups, key=key)
+        except FileNotFoundError as exc:
+            raise FileNotFound(file_name) from exc
+        except (OSError, PermissionError, IsADirectoryError) as exc:
+            raise FileReadError from exc
 
-            file_extension = self.get_file_extension(file_name)
+    @path_replace
+    def iter_dataframe(self, file_name: str, chunk_size: int = DEFAULT_CHUNK_SIZE, sep: str = ',',
+                       columns: Union[None, List[str]] = None, key: str = DEFAULT_HDF5_KEY) -> Iterator['pd.DataFrame']:
+        file_format = dataframe_format(file_name)
 
-            if file_extension == '.csv':
-                return pd.read_csv(file_name, sep=sep)
-            elif file_extension in ('.pickle', '.pkl'):
-                return pd.read_pickle(file_name)
-            elif file_extension == '.json':
-                return pd.read_json(file_name)
-            else:
-                raise UnsupportedFileType(file_extension)
+        if file_format is None:
+            raise unsupported_type(file_name)
 
+        try:
+            yield from dataframes.iterate(file_name, file_format, chunk_size, sep=sep, columns=columns, key=key)
         except FileNotFoundError as exc:
             raise FileNotFound(file_name) from exc
         except (OSError, PermissionError, IsADirectoryError) as exc:
             raise FileReadError from exc
+
+    @path_replace
+    def read_csv_columns(self, file_name: str, dtypes: Union[None, Dict[str, Any]] = None,
+                         usecols: Union[None, List[Union[str, int]]] = None,
+                         batch_size: int = 65536) -> Dict[str, 'np.ndarray']:
+        np = import_optional('numpy')
+
+        dtypes = dtypes if dtypes is not None else {}
+
+        headers = None
+        chunks = None
+
+        # Each batch is converted to compact fixed-width string arrays right away, so the
+        # per-cell Python strings of only one batch are alive at a time
+        for headers, rows in self.iter_csv(file_name, batch_size=batch_size, usecols=usecols):
+            if chunks is None:
+                chunks = [[] for _ in headers]
+
+            columns = itertools.zip_longest(*rows, fillvalue='')
+
+            for column_chunks, values in zip(chunks, columns):
+                column_chunks.append(np.array(values, dtype=str))
+
+        # A file without rows still returns its columns, as empty arrays
+        if headers is None:
+            headers = self._read_csv_headers(file_name, usecols=usecols)
+            chunks = [[np.array([], dtype=str)] for _ in headers]
+
+        data = {}
+
+        for header, column_chunks in zip(headers, chunks):
+            values = np.concatenate(column_chunks)
+
+            if header in dtypes:
+                try:
+                    data[header] = values.astype(dtypes[header])
+                except (ValueError, TypeError) as exc:
+                    raise InvalidFileDataError(
+                        f'Column {header} could not be converted to {dtypes[header]}.') from exc
+            else:
+                data[header] = _infer_column(np, values)
+
+        return data
@@ -0,0 +1,255 @@
+"""
+HDF5 helpers: dataset creation options, appends along the first axis and lazy, out-of-core dataset access.
+
+Datasets are only read when they are sliced, so a handle on a dataset larger than memory costs nothing until rows
+are requested. Chunked datasets are stored and compressed chunk by chunk, and iteration follows the chunk layout so
+every chunk is decompressed once.
+"""
+import math
+
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Tuple, Union
+
+from fastfs.dependencies import import_optional
+from fastfs.exceptions import FileReadError, FileWriteError, InvalidFileDataError
+
+if TYPE_CHECKING:
+    import h5py
+    import numpy as np
+
+
+# Dataset filters that ship with every h5py build
+HDF5_COMPRESSIONS = ('gzip', 'lzf')
+
+# The approximate size of the blocks of rows read per step when iterating over a dataset
+DEFAULT_BLOCK_BYTES = 16 * 1024 * 1024
+
+
+def check_options(compression: Union[None, str], compression_level: Union[None, int]):
+    if compression is not None and compression not in HDF5_COMPRESSIONS:
+        raise ValueError(
+            f"Unsupported HDF5 compression {compression}. Supported compressions: {', '.join(HDF5_COMPRESSIONS)}")
+
+    if compression_level is not None and compression != 'gzip':
+        raise ValueError('compression_level is only supported with gzip.')
+
+
+def dataset_options(shape: Tuple[int, ...], compression: Union[None, str] = None,
+                    compression_level: Union[None, int] = None, shuffle: Union[None, bool] = None,
+                    chunks: Union[None, bool, Tuple[int, ...]] = None, resizable: bool = False) -> Dict[str, Any]:
+    """Returns the create_dataset keyword arguments for the given storage options."""
+    options: Dict[str, Any] = {}
+
+    if compression is not None:
+        options['compression'] = compression
+
+        if compression_level is not None:
+            options['compression_opts'] = compression_level
+
+        # Grouping the bytes of each element by significance makes numeric data compress much better
+        options['shuffle'] = True if shuffle is None else shuffle
+    elif shuffle:
+        options['shuffle'] = True
+
+    if resizable:
+        if not shape:
+            raise InvalidFileDataError('Scalars can not be stored in a resizable dataset.')
+
+        options['maxshape'] = (None,) + tuple(shape[1:])
+
+    # Filters and resizing need a chunked layout, h5py picks a chunk shape if none is given
+    if chunks is not None:
+        options['chunks'] = chunks
+    elif options:
+        options['chunks'] = True
+
+    return options
+
+
+def create_dataset(h5_file: 'h5py.File', name: str, data: Any, **options) -> 'h5py.Dataset':
+    # Replaces a dataset of the same name, so files opened for appending can be rewritten dataset by dataset
+    if name in h5_file:
+        del h5_file[name]
+
+    try:
+        return h5_file.create_dataset(name, data=data, **options)
+    except (TypeError, ValueError) as exc:
+        raise InvalidFileDataError(f'Failed to write dataset {name}.') from exc
+
+
+def append_rows(h5_file: 'h5py.File', name: str, data: 'np.ndarray', options: Dict[str, Any]) -> int:
+    """
+    Appends data along the first axis of a resizable dataset, creating it with options if it doesn't exist.
+
+    Returns:
+        int: The number of rows in the dataset after the append.
+    """
+    if name not in h5_file:
+        create_dataset(h5_file, name, data, **options)
+        return len(data)
+
+    dataset = h5_file[name]
+
+    if dataset.maxshape[0] is not None:
+        raise InvalidFileDataError(
+            f'Dataset {name} has a fixed size. Only datasets created by append_hdf5, or written with '
+            'resizable=True, can be appended to.')
+
+    if data.shape[1:] != dataset.shape[1:]:
+        raise InvalidFileDataError(
+            f'Rows of shape {data.shape[1:]} can not be appended to dataset {name} with rows of shape '
+            f'{dataset.shape[1:]}.')
+
+    start = dataset.shape[0]
+    dataset.resize(start + len(data), axis=0)
+
+    try:
+        dataset[start:] = data
+    except (TypeError, ValueError) as exc:
+        dataset.resize(start, axis=0)
+        raise InvalidFileDataError(f'Failed to append to dataset {name}.') from exc
+
+    return start + len(data)
+
+
+def dataset_names(h5_file: 'h5py.File') -> List[str]:
+    """Returns the paths of all datasets in a file, including those in groups, e.g. 'features/train'."""
+    h5py = import_optional('h5py')
+    names = []
+
+    def visit(name, item):
+        if isinstance(item, h5py.Dataset):
+            names.append(name)
+
+    h5_file.visititems(visit)
+
+    return names
+
+
+def block_rows(dataset: 'h5py.Dataset', rows: Union[None, int] = None) -> int:
+    """The number of rows per block: rows if given, else about DEFAULT_BLOCK_BYTES worth of whole chunks."""
+    if rows is not None:
+        return max(1, rows)
+
+    row_bytes = dataset.dtype.itemsize * math.prod(dataset.shape[1:])
+    rows = max(1, DEFAULT_BLOCK_BYTES // max(1, row_bytes))
+
+    if dataset.chunks is not None:
+        chunk_rows = dataset.chunks[0]
+        rows = max(chunk_rows, rows // chunk_rows * chunk_rows)
+
+    return rows
+
+
+def iter_rows(dataset: 'h5py.Dataset', rows: Union[None, int] = None, start: int = 0,
+              stop: Union[None, int] = None) -> Iterator['np.ndarray']:
+    """Yields blocks of rows of a dataset along its first axis, reading one block at a time."""
+    if not dataset.shape:
+        raise ValueError('Scalar datasets have no rows to iterate over.')
+
+    length = dataset.shape[0] if stop is None else min(stop, dataset.shape[0])
+    step = block_rows(dataset, rows)
+
+    for position in range(start, length, step):
+        yield dataset[position:min(position + step, length)]
+
+
+class HDF5Dataset():
+    """
+    A lazily read dataset of an open HDF5 file, returned by open_hdf5.
+
+    Nothing is read until the dataset is sliced: handle[1000:2000] or handle[:, 3] reads only those elements, and
+    iter_rows() streams the dataset in blocks. Handles opened with mode 'a' can append rows along the first axis.
+    Close the handle, or use it as a context manager, to close the file.
+    """
+
+    def __init__(self, file_name: str, h5_file: 'h5py.File', dataset: 'h5py.Dataset',
+                 append_options: Union[None, Dict[str, Any]] = None):
+        self.file_name = file_name
+        self._file = h5_file
+        self._dataset = dataset
+        self._append_options = append_options
+
+    @property
+    def dataset(self) -> 'h5py.Dataset':
+        """The underlying h5py dataset, for anything the handle doesn't cover."""
+        return self._dataset
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return self._dataset.shape
+
+    @property
+    def dtype(self) -> 'np.dtype':
+        return self._dataset.dtype
+
+    @property
+    def chunks(self) -> Union[None, Tuple[int, ...]]:
+        return self._dataset.chunks
+
+    @property
+    def compression(self) -> Union[None, str]:
+        return self._dataset.compression
+
+    @property
+    def closed(self) -> bool:
+        return not self._file.id.valid
+
+    def __len__(self) -> int:
+        return len(self._dataset)
+
+    def __getitem__(self, index: Any) -> Any:
+        try:
+            return self._dataset[index]
+        except OSError as exc:
+            raise FileReadError from exc
+
+    def iter_rows(self, rows: Union[None, int] = None, start: int = 0,
+                  stop: Union[None, int] = None) -> Iterator['np.ndarray']:
+        """
+        Yields blocks of rows along the first axis. rows defaults to whole chunks adding up to about 16 MiB, so
+        every chunk is read and decompressed once.
+        """
+        try:
+            yield from iter_rows(self._dataset, rows, start, stop)
+        except OSError as exc:
+            raise FileReadError from exc
+
+    def append(self, data: Any) -> int:
+        """Appends rows along the first axis and returns the new number of rows."""
+        if self._append_options is None:
+            raise ValueError("The dataset was opened read-only, open it with mode='a' to append.")
+
+        try:
+            length = append_rows(self._file, self._dataset.name, as_rows(data), self._append_options)
+        except (OSError, InvalidFileDataError) as exc:
+            raise FileWriteError from exc
+
+        return length
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        if not self.closed:
+            self._file.close()
+
+    def __enter__(self) -> 'HDF5Dataset':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __repr__(self) -> str:
+        if self.closed:
+            return f'<HDF5Dataset {self.file_name!r} closed>'
+
+        return f'<HDF5Dataset {self.file_name!r} {self._dataset.name} shape={self.shape} dtype={self.dtype}>'
+
+
+def as_rows(data: Any) -> 'np.ndarray':
+    array = import_optional('numpy').asarray(data)
+
+    if not array.shape:
+        raise InvalidFileDataError('Appended data must have at least one dimension.')
+
+    return array
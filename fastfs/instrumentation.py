@@ -0,0 +1,341 @@
+import heapq
+import itertools
+import json
+import math
+import os
+import threading
+import time
+
+from typing import Any, Callable, Dict, Iterator, List, Union
+
+
+# Latency histogram resolution: buckets per power of two, i.e. percentiles are accurate to about 19%
+BUCKETS_PER_OCTAVE = 4
+
+
+class OperationRecord():
+    """
+    One read, write or iteration made through a fastfs reader/writer.
+
+    open_seconds covers opening the file (and creating the temporary file of atomic writes). io_seconds is the
+    time spent in the file object's read/write calls, codec_seconds the rest of the reader/writer, i.e. decoding
+    or encoding. bytes is the position of the underlying binary file when the reader/writer returned.
+    """
+
+    __slots__ = ('operation', 'kind', 'path', 'start', 'total_seconds', 'open_seconds', 'io_seconds',
+                 'func_seconds', 'bytes', 'error', 'cache_hit', 'thread_id')
+
+    def __init__(self, operation: str, kind: str, path: str):
+        self.operation = operation
+        self.kind = kind
+        self.path = path
+
+        self.start = time.perf_counter()
+        self.total_seconds = None
+        self.open_seconds = 0.0
+        self.io_seconds = 0.0
+        self.func_seconds = 0.0
+
+        self.bytes = 0
+        self.error = None
+        self.cache_hit = False
+        self.thread_id = threading.get_ident()
+
+    @property
+    def codec_seconds(self) -> float:
+        return max(0.0, self.func_seconds - self.io_seconds)
+
+    def finish(self):
+        if self.total_seconds is None:
+            # The consumer's time between items isn't part of an iteration
+            self.total_seconds = self.open_seconds + self.func_seconds if self.kind == 'iter' else \
+                time.perf_counter() - self.start
+
+    def wrap(self, func: Callable) -> Callable:
+        """Wraps a reader/writer so it gets a timed file object and its own time is recorded."""
+        def timed_func(manager, file, *args, **kwargs):
+            self.open_seconds = time.perf_counter() - self.start
+            timed_file = TimedFile(file, self)
+
+            start = time.perf_counter()
+            try:
+                return func(manager, timed_file, *args, **kwargs)
+            finally:
+                self._finish_file(timed_file, start)
+
+        return timed_func
+
+    def wrap_iter(self, func: Callable) -> Callable:
+        """Like wrap, for generator functions. Only the time spent producing each item is recorded."""
+        def timed_iter(manager, file, *args, **kwargs) -> Iterator[Any]:
+            self.open_seconds = time.perf_counter() - self.start
+            timed_file = TimedFile(file, self)
+
+            iterator = func(manager, timed_file, *args, **kwargs)
+
+            try:
+                while True:
+                    start = time.perf_counter()
+                    try:
+                        item = next(iterator)
+                    except StopIteration:
+                        return
+                    finally:
+                        self.func_seconds += time.perf_counter() - start
+                        self.bytes = timed_file.position()
+
+                    yield item
+            finally:
+                iterator.close()
+
+        return timed_iter
+
+    def _finish_file(self, timed_file: 'TimedFile', start: float):
+        if self.kind == 'write':
+            # Count the buffered data, and the time to hand it to the OS, as written
+            try:
+                timed_file.flush()
+            except (OSError, ValueError):
+                pass
+
+        self.func_seconds += time.perf_counter() - start
+        self.bytes = timed_file.position()
+
+
+class TimedFile():
+    """A file object proxy adding the time spent in read and write calls to an OperationRecord."""
+
+    def __init__(self, file, record: OperationRecord):
+        self._file = file
+        self._record = record
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._file, name)
+
+    @property
+    def wrapped(self):
+        return self._file
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        start = time.perf_counter()
+        try:
+            return next(self._file)
+        finally:
+            self._record.io_seconds += time.perf_counter() - start
+
+    def _timed(self, method: Callable, *args) -> Any:
+        start = time.perf_counter()
+        try:
+            return method(*args)
+        finally:
+            self._record.io_seconds += time.perf_counter() - start
+
+    def read(self, *args):
+        return self._timed(self._file.read, *args)
+
+    def readinto(self, buffer):
+        return self._timed(self._file.readinto, buffer)
+
+    def readline(self, *args):
+        return self._timed(self._file.readline, *args)
+
+    def readlines(self, *args):
+        return self._timed(self._file.readlines, *args)
+
+    def write(self, data):
+        return self._timed(self._file.write, data)
+
+    def writelines(self, lines):
+        return self._timed(self._file.writelines, lines)
+
+    def flush(self):
+        return self._timed(self._file.flush)
+
+    def position(self) -> int:
+        # Text files report opaque cookies from tell(), their binary buffer reports bytes
+        try:
+            return getattr(self._file, 'buffer', self._file).tell()
+        except (OSError, ValueError):
+            return 0
+
+
+class _OperationStats():
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.cache_hits = 0
+        self.bytes = 0
+
+        self.total_seconds = 0.0
+        self.open_seconds = 0.0
+        self.io_seconds = 0.0
+        self.codec_seconds = 0.0
+        self.max_seconds = 0.0
+
+        self.buckets: Dict[int, int] = {}
+
+    def add(self, record: OperationRecord):
+        self.count += 1
+        self.errors += record.error is not None
+        self.cache_hits += record.cache_hit
+        self.bytes += record.bytes
+
+        self.total_seconds += record.total_seconds
+        self.open_seconds += record.open_seconds
+        self.io_seconds += record.io_seconds
+        self.codec_seconds += record.codec_seconds
+        self.max_seconds = max(self.max_seconds, record.total_seconds)
+
+        bucket = _bucket(record.total_seconds)
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def percentile(self, percentile: float) -> float:
+        rank = math.ceil(self.count * percentile / 100)
+        seen = 0
+
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+
+            if seen >= rank:
+                return min(_bucket_upper_bound(bucket), self.max_seconds)
+
+        return self.max_seconds
+
+    def summary(self) -> Dict[str, Union[int, float]]:
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'cache_hits': self.cache_hits,
+            'bytes': self.bytes,
+            'total_seconds': self.total_seconds,
+            'open_seconds': self.open_seconds,
+            'io_seconds': self.io_seconds,
+            'codec_seconds': self.codec_seconds,
+            'mean_seconds': self.total_seconds / self.count,
+            'p50_seconds': self.percentile(50),
+            'p90_seconds': self.percentile(90),
+            'p99_seconds': self.percentile(99),
+            'max_seconds': self.max_seconds,
+        }
+
+
+def _bucket(seconds: float) -> int:
+    microseconds = max(seconds * 1e6, 1.0)
+    return int(math.log2(microseconds) * BUCKETS_PER_OCTAVE)
+
+
+def _bucket_upper_bound(bucket: int) -> float:
+    return 2 ** ((bucket + 1) / BUCKETS_PER_OCTAVE) / 1e6
+
+
+class HistogramAggregator():
+    """
+    Aggregates operation records in memory: counts, bytes, time per phase and a latency histogram
+    per operation, plus the slowest individual operations.
+    """
+
+    def __init__(self, slowest: int = 10):
+        self.max_slowest = slowest
+
+        self._stats: Dict[str, _OperationStats] = {}
+        self._slowest = []
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def __call__(self, record: OperationRecord):
+        with self._lock:
+            stats = self._stats.get(record.operation)
+
+            if stats is None:
+                stats = self._stats[record.operation] = _OperationStats()
+
+            stats.add(record)
+
+            if self.max_slowest > 0:
+                item = (record.total_seconds, next(self._counter), record.operation, record.path)
+
+                if len(self._slowest) < self.max_slowest:
+                    heapq.heappush(self._slowest, item)
+                else:
+                    heapq.heappushpop(self._slowest, item)
+
+    def summary(self) -> Dict[str, Dict[str, Union[int, float]]]:
+        """Returns the aggregated statistics of each operation, by operation name (e.g. 'read_json')."""
+        with self._lock:
+            return {operation: stats.summary() for operation, stats in self._stats.items()}
+
+    def slowest(self) -> List[Dict[str, Any]]:
+        """Returns the slowest operations seen, slowest first."""
+        with self._lock:
+            slowest = sorted(self._slowest, reverse=True)
+
+        return [{'operation': operation, 'path': path, 'seconds': seconds}
+                for seconds, _, operation, path in slowest]
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+            self._slowest.clear()
+
+
+class ChromeTraceExporter():
+    """
+    Collects operation records as Chrome trace events, viewable in chrome://tracing or Perfetto.
+
+    At most max_events are kept, later events are counted in dropped.
+    """
+
+    def __init__(self, max_events: int = 1000000):
+        self.max_events = max_events
+        self.dropped = 0
+
+        self._events = []
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def __call__(self, record: OperationRecord):
+        event = {
+            'name': record.operation,
+            'cat': record.kind,
+            'ph': 'X',
+            'ts': record.start * 1e6,
+            'dur': record.total_seconds * 1e6,
+            'pid': self._pid,
+            'tid': record.thread_id,
+            'args': {
+                'path': record.path,
+                'bytes': record.bytes,
+                'open_us': record.open_seconds * 1e6,
+                'io_us': record.io_seconds * 1e6,
+                'codec_us': record.codec_seconds * 1e6,
+                'cache_hit': record.cache_hit,
+            },
+        }
+
+        if record.error is not None:
+            event['args']['error'] = repr(record.error)
+
+        with self._lock:
+            if len(self._events) < self.max_events:
+                self._events.append(event)
+            else:
+                self.dropped += 1
+
+    @property
+    def events(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._events)
+
+    def save(self, file_name: str):
+        """Writes the collected events as a Chrome trace JSON file."""
+        with open(file_name, 'w', encoding='utf-8') as file:
+            json.dump({'traceEvents': self.events, 'displayTimeUnit': 'ms'}, file)
+
+    def clear(self):
+        with self._lock:
+            self._events.clear()
+            self.dropped = 0
@@ -0,0 +1,242 @@
+"""
+JSON backends: the stdlib json module and faster drop-in libraries behind one interface.
+
+A backend's dumps returns UTF-8 bytes and its loads accepts bytes, so files are written and read in binary mode
+without a text layer in between. 'auto' picks the first installed backend of AUTO_BACKENDS, and falls back to the
+stdlib for data the faster library rejects (e.g. integers beyond 64 bits, NaN in input), would write differently
+(NaN and Infinity, which orjson writes as null) or would read differently (integers beyond 64 bits, which orjson
+reads as floats), so it accepts and round-trips everything the stdlib does.
+
+Known differences of the third-party backends: orjson writes NaN and Infinity as null and reads integers beyond
+64 bits as floats.
+"""
+import json
+import math
+import re
+import threading
+
+from typing import Any, Callable, Dict, List
+
+from fastfs.dependencies import import_optional
+from fastfs.exceptions import MissingDependencyError
+
+
+# Tried in order by 'auto'
+AUTO_BACKENDS = ('orjson', 'ujson', 'simdjson', 'json')
+
+# What the backends raise for data they can't encode or decode
+ENCODE_ERRORS = (TypeError, ValueError, OverflowError, RecursionError)
+DECODE_ERRORS = (ValueError, RecursionError)
+
+# Runs of digits long enough to hold an integer outside 64 bits, which orjson reads as a float
+_LONG_DIGITS = re.compile(rb'-?[0-9]{19,}')
+# Mapping every digit to 0 lets a substring search find such runs far faster than the regex scanning every byte
+_DIGITS_TO_ZERO = bytes.maketrans(b'123456789', b'000000000')
+_LONG_ZEROS = b'0' * 19
+_INT_RANGE = range(-2 ** 63, 2 ** 64)
+
+
+class JsonBackend():
+    """
+    A JSON implementation.
+
+    Args:
+        name: The name the backend is selected by.
+        dumps: Encodes an object to UTF-8 bytes.
+        loads: Decodes bytes (or str) to an object.
+    """
+
+    def __init__(self, name: str, dumps: Callable[[Any], bytes], loads: Callable[[Any], Any]):
+        self.name = name
+        self.dumps = dumps
+        self.loads = loads
+
+    def __repr__(self) -> str:
+        return f'JsonBackend({self.name!r})'
+
+
+def _has_non_finite_float(obj: Any) -> bool:
+    pending = [obj]
+
+    while pending:
+        item = pending.pop()
+
+        if isinstance(item, float):
+            if not math.isfinite(item):
+                return True
+        elif isinstance(item, dict):
+            # Float keys are written as strings, "null" for non-finite ones
+            pending.extend(item.keys())
+            pending.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            pending.extend(item)
+
+    return False
+
+
+def _has_wide_integer(data: Any) -> bool:
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    elif not isinstance(data, (bytes, bytearray)):
+        data = bytes(data)
+
+    if _LONG_ZEROS not in data.translate(_DIGITS_TO_ZERO):
+        return False
+
+    # Digits inside strings or float fractions match too, those are only decoded by the stdlib unnecessarily
+    return any(int(match.group()) not in _INT_RANGE for match in _LONG_DIGITS.finditer(data))
+
+
+class _FallbackJsonBackend(JsonBackend):
+    # Retries with the stdlib whatever the faster backend rejects, so 'auto' never accepts less than json does
+
+    def __init__(self, backend: JsonBackend, fallback: JsonBackend):
+        super().__init__(backend.name, self._dumps, self._loads)
+
+        self._backend = backend
+        self._fallback = fallback
+
+    def _dumps(self, obj: Any) -> bytes:
+        try:
+            data = self._backend.dumps(obj)
+        except ENCODE_ERRORS:
+            return self._fallback.dumps(obj)
+
+        # Non-finite floats come out as null, so the data is only searched for them when null was written
+        if b'null' in data and _has_non_finite_float(obj):
+            return self._fallback.dumps(obj)
+
+        return data
+
+    def _loads(self, data: Any) -> Any:
+        if _has_wide_integer(data):
+            return self._fallback.loads(data)
+
+        try:
+            return self._backend.loads(data)
+        except DECODE_ERRORS:
+            return self._fallback.loads(data)
+
+
+def _json_backend() -> JsonBackend:
+    # A shared decoder skips the per-call setup of json.loads, which adds up over many small documents
+    decode = json.JSONDecoder().decode
+
+    def loads(data: Any) -> Any:
+        if not isinstance(data, str):
+            data = str(data, 'utf-8')
+
+        return decode(data)
+
+    return JsonBackend('json', lambda obj: json.dumps(obj).encode('utf-8'), loads)
+
+
+def _orjson_backend() -> JsonBackend:
+    orjson = import_optional('orjson')
+
+    # Like the stdlib, write int, float, bool and None dict keys as strings
+    option = orjson.OPT_NON_STR_KEYS
+
+    return JsonBackend('orjson', lambda obj: orjson.dumps(obj, option=option), orjson.loads)
+
+
+def _ujson_backend() -> JsonBackend:
+    ujson = import_optional('ujson')
+
+    def dumps(obj: Any) -> bytes:
+        return ujson.dumps(obj, escape_forward_slashes=False).encode('utf-8')
+
+    return JsonBackend('ujson', dumps, ujson.loads)
+
+
+def _simdjson_backend() -> JsonBackend:
+    simdjson = import_optional('simdjson', 'pysimdjson')
+
+    # simdjson only parses, encoding goes through the stdlib
+    return JsonBackend('simdjson', _json_backend().dumps, simdjson.loads)
+
+
+_FACTORIES: Dict[str, Callable[[], JsonBackend]] = {
+    'json': _json_backend,
+    'orjson': _orjson_backend,
+    'ujson': _ujson_backend,
+    'simdjson': _simdjson_backend,
+}
+
+_backends: Dict[str, JsonBackend] = {}
+_lock = threading.Lock()
+
+
+def register_json_backend(name: str, dumps: Callable[[Any], bytes], loads: Callable[[Any], Any]):
+    """
+    Registers a JSON backend, or replaces one, so it can be selected by name.
+
+    Args:
+        name: The name to select the backend by.
+        dumps: Encodes an object to UTF-8 bytes.
+        loads: Decodes bytes to an object.
+    """
+    with _lock:
+        _FACTORIES[name] = lambda: JsonBackend(name, dumps, loads)
+        _backends.pop(name, None)
+        _backends.pop('auto', None)
+
+
+def _create_backend(name: str) -> JsonBackend:
+    if name != 'auto':
+        try:
+            factory = _FACTORIES[name]
+        except KeyError:
+            raise ValueError(
+                f"Unknown JSON backend {name}. Supported backends: auto, {', '.join(_FACTORIES)}") from None
+
+        return factory()
+
+    fallback = get_json_backend('json')
+
+    for candidate in AUTO_BACKENDS:
+        try:
+            backend = get_json_backend(candidate)
+        except MissingDependencyError:
+            continue
+
+        return backend if backend is fallback else _FallbackJsonBackend(backend, fallback)
+
+    return fallback
+
+
+def get_json_backend(name: str = 'auto') -> JsonBackend:
+    """
+    Returns a JSON backend by name. Backends are imported on first use.
+
+    Args:
+        name: 'auto', 'json', 'orjson', 'ujson', 'simdjson' or the name of a registered backend.
+
+    Raises:
+        MissingDependencyError: If the backend's library is not installed.
+        ValueError: If there is no backend with that name.
+    """
+    backend = _backends.get(name)
+
+    if backend is None:
+        backend = _create_backend(name)
+
+        with _lock:
+            backend = _backends.setdefault(name, backend)
+
+    return backend
+
+
+def available_json_backends() -> List[str]:
+    """Returns the names of the backends whose libraries are installed."""
+    available = []
+
+    for name in list(_FACTORIES):
+        try:
+            get_json_backend(name)
+        except MissingDependencyError:
+            continue
+
+        available.append(name)
+
+    return available
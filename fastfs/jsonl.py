@@ -0,0 +1,105 @@
+"""
+JSON Lines helpers: one JSON value per line, so records can be appended and streamed without parsing the whole file.
+
+Lines are handled as bytes. JSON escapes control characters inside strings, so a b'\\n' always ends a record.
+"""
+import itertools
+
+from typing import IO, Any, Callable, Deque, Iterable, Iterator, List, Tuple
+
+from fastfs.exceptions import InvalidFileDataError
+from fastfs.json_backends import DECODE_ERRORS, ENCODE_ERRORS, JsonBackend, get_json_backend
+
+
+# The number of records encoded and written per write call
+DEFAULT_BATCH_SIZE = 1000
+
+
+def encode_records(records: Iterable[Any], backend: JsonBackend) -> bytes:
+    """Encodes records into one JSON Lines chunk, each record followed by a newline."""
+    try:
+        lines = [backend.dumps(record) for record in records]
+    except RecursionError as exc:
+        raise InvalidFileDataError('A record is too deeply nested.') from exc
+    except ENCODE_ERRORS as exc:
+        raise InvalidFileDataError('Failed to serialize a record.') from exc
+
+    if not lines:
+        return b''
+
+    lines.append(b'')
+
+    return b'\n'.join(lines)
+
+
+def write_records(file: IO[bytes], records: Iterable[Any], backend: JsonBackend,
+                  batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """
+    Writes records to a binary file with one write call per batch, so memory stays bounded for any iterable.
+
+    Returns:
+        int: The number of records written.
+    """
+    records = iter(records)
+    count = 0
+
+    while True:
+        batch = list(itertools.islice(records, max(1, batch_size)))
+
+        if not batch:
+            return count
+
+        file.write(encode_records(batch, backend))
+        count += len(batch)
+
+
+def decode_line(line: bytes, line_number: int, loads: Callable[[bytes], Any]) -> Any:
+    try:
+        return loads(line)
+    except DECODE_ERRORS as exc:
+        raise InvalidFileDataError(f'Could not decode JSON on line {line_number + 1}.') from exc
+
+
+def decode_offset(line: bytes, offset: int, loads: Callable[[bytes], Any]) -> Any:
+    try:
+        return loads(line)
+    except DECODE_ERRORS as exc:
+        raise InvalidFileDataError(f'Could not decode JSON at offset {offset}.') from exc
+
+
+def decode_lines(lines: List[Tuple[int, bytes]], backend: str) -> List[Any]:
+    """
+    Decodes (line number, line) pairs. A module-level function taking the backend by name, so chunks can be
+    decoded in worker processes.
+    """
+    loads = get_json_backend(backend).loads
+
+    return [decode_line(line, line_number, loads) for line_number, line in lines]
+
+
+def iter_line_chunks(file: IO[bytes], chunk_size: int, offsets: Deque[List[int]]) -> Iterator[List[Tuple[int, bytes]]]:
+    """
+    Splits a binary file into chunks of (line number, line) pairs, skipping blank lines.
+
+    The byte offset of each chunk's lines is appended to offsets as the chunk is produced, so callers that decode
+    chunks ahead of time can still match them up in order.
+    """
+    offset = 0
+    chunk, chunk_offsets = [], []
+
+    for line_number, line in enumerate(file):
+        if line.strip():
+            chunk.append((line_number, line))
+            chunk_offsets.append(offset)
+
+            if len(chunk) >= chunk_size:
+                offsets.append(chunk_offsets)
+                yield chunk
+
+                chunk, chunk_offsets = [], []
+
+        offset += len(line)
+
+    if chunk:
+        offsets.append(chunk_offsets)
+        yield chunk
@@ -0,0 +1,359 @@
+"""
+Line-oriented text helpers.
+
+Lines are joined into large chunks and written with one call per chunk, so writing many lines costs one join per
+chunk instead of a string concatenation and a write call per line. Reading works the other way around: files are
+read as large binary blocks ending on a line break and each block is split in one call.
+
+Lines are separated by b'\n'. When lines are decoded, '\r\n' and '\r' line breaks are translated to '\n' like
+files opened in text mode.
+"""
+import collections
+import functools
+import io
+import itertools
+import mmap
+import os
+
+from typing import IO, Any, Callable, Iterable, Iterator, List, Tuple, Union
+
+from fastfs.compression import is_plain_file
+from fastfs.exceptions import FileWriteError, InvalidFileDataError
+
+
+# The approximate number of characters joined before each write call
+DEFAULT_BUFFER_SIZE = 1024 * 1024
+
+# The number of bytes read per call when iterating over lines. Blocks this size stay in the CPU cache while
+# they are decoded and split, larger ones are slower
+DEFAULT_CHUNK_SIZE = 256 * 1024
+
+# The number of bytes read per step when seeking backward for the last lines
+TAIL_CHUNK_SIZE = 64 * 1024
+
+# Lines taken for the first chunk, later chunks are sized from the average line length seen so far
+_FIRST_CHUNK_LINES = 1024
+
+
+def join_lines(lines: List[str]) -> str:
+    """Joins lines into one chunk, each line followed by a newline."""
+    if not lines:
+        return ''
+
+    try:
+        return '\n'.join(lines) + '\n'
+    except TypeError as exc:
+        raise InvalidFileDataError('Lines must be strings.') from exc
+
+
+def write_lines(file: IO[str], lines: Iterable[str], buffer_size: int = DEFAULT_BUFFER_SIZE) -> int:
+    """
+    Writes lines to a text file in chunks of about buffer_size characters. Any iterable works, only one chunk
+    is held in memory at a time.
+
+    Returns:
+        int: The number of lines written.
+    """
+    lines = iter(lines)
+    chunk_lines = _FIRST_CHUNK_LINES
+    count = 0
+
+    while True:
+        chunk = list(itertools.islice(lines, chunk_lines))
+
+        if not chunk:
+            return count
+
+        text = join_lines(chunk)
+        file.write(text)
+        count += len(chunk)
+
+        # Aim the next chunk at buffer_size characters without measuring every line
+        chunk_lines = max(1, len(chunk) * max(1, buffer_size) // len(text))
+
+
+class LineWriter():
+    """
+    A persistent handle appending lines to a file, returned by open_line_writer.
+
+    Lines are buffered and written in chunks of about buffer_size characters. flush() writes the buffered lines
+    to the file, close() also finishes the file. Use it as a context manager so buffered lines are never lost.
+    A LineWriter is not thread-safe.
+    """
+
+    def __init__(self, file: IO[str], buffer_size: int, on_close: Callable[[], None]):
+        self._file = file
+        self._buffer_size = max(1, buffer_size)
+        self._on_close = on_close
+        self._buffer: List[str] = []
+        self._buffered = 0
+        self.closed = False
+
+    def _check_open(self):
+        if self.closed:
+            raise ValueError('The line writer is closed.')
+
+    def _write_buffer(self):
+        if self._buffer:
+            lines = self._buffer
+            self._buffer = []
+            self._buffered = 0
+
+            try:
+                self._file.write(join_lines(lines))
+            except (OSError, InvalidFileDataError) as exc:
+                raise FileWriteError from exc
+
+    def write(self, line: str):
+        """Appends one line, without its newline."""
+        self._check_open()
+
+        self._buffer.append(line)
+        self._buffered += len(line) + 1
+
+        if self._buffered >= self._buffer_size:
+            self._write_buffer()
+
+    def write_lines(self, lines: Iterable[str]) -> int:
+        """Appends lines from any iterable. Returns the number of lines written."""
+        self._check_open()
+        self._write_buffer()
+
+        try:
+            return write_lines(self._file, lines, self._buffer_size)
+        except (OSError, InvalidFileDataError) as exc:
+            raise FileWriteError from exc
+
+    def flush(self):
+        """Writes buffered lines to the file, so other readers see them."""
+        self._check_open()
+        self._write_buffer()
+
+        try:
+            self._file.flush()
+        except OSError as exc:
+            raise FileWriteError from exc
+
+    def close(self):
+        if self.closed:
+            return
+
+        self.closed = True
+
+        try:
+            self._write_buffer()
+        finally:
+            self._on_close()
+
+    def __enter__(self) -> 'LineWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __repr__(self) -> str:
+        state = 'closed' if self.closed else 'open'
+        return f'<LineWriter {getattr(self._file, "name", None)!r} {state}>'
+
+
+def iter_line_blocks(file: IO[bytes], chunk_size: int = DEFAULT_CHUNK_SIZE, start: int = 0,
+                     end: Union[None, int] = None) -> Iterator[bytes]:
+    """
+    Reads a binary file from start to end in blocks of whole lines. Every block ends with b'\n', except the last
+    one if the file (or range) doesn't end with a line break.
+    """
+    if start:
+        file.seek(start)
+
+    remaining = None if end is None else max(0, end - start)
+    chunk_size = max(1, chunk_size)
+    partial: List[bytes] = []
+
+    while True:
+        size = chunk_size if remaining is None else min(chunk_size, remaining)
+        chunk = file.read(size) if size else b''
+
+        if not chunk:
+            if partial:
+                yield b''.join(partial)
+            return
+
+        if remaining is not None:
+            remaining -= len(chunk)
+
+        cut = chunk.rfind(b'\n') + 1
+
+        # A line longer than the chunk, keep reading until it ends
+        if not cut:
+            partial.append(chunk)
+            continue
+
+        if partial:
+            partial.append(chunk[:cut])
+            block = b''.join(partial)
+        else:
+            block = chunk[:cut]
+
+        partial = [chunk[cut:]] if cut < len(chunk) else []
+
+        yield block
+
+
+def _decode(block: bytes) -> str:
+    try:
+        text = block.decode('utf-8')
+    except UnicodeDecodeError as exc:
+        raise InvalidFileDataError('The file is not valid UTF-8.') from exc
+
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+
+    return text
+
+
+def split_block(block: bytes, binary: bool = False, keepends: bool = True) -> List[Any]:
+    """Splits a block of lines in one pass, keeping or dropping the line breaks."""
+    if keepends:
+        # readlines splits on '\n' only, unlike str.splitlines
+        return io.BytesIO(block).readlines() if binary else io.StringIO(_decode(block)).readlines()
+
+    lines = block.split(b'\n') if binary else _decode(block).split('\n')
+
+    if not lines[-1]:
+        lines.pop()
+
+    return lines
+
+
+def iter_line_batches(file: IO[bytes], chunk_size: int = DEFAULT_CHUNK_SIZE, start: int = 0,
+                      end: Union[None, int] = None, binary: bool = False, keepends: bool = True) -> Iterator[List[Any]]:
+    """Yields the lines of a binary file, or of the byte range start-end, as one list per chunk read."""
+    return map(functools.partial(split_block, binary=binary, keepends=keepends),
+               iter_line_blocks(file, chunk_size, start, end))
+
+
+def iter_lines(file: IO[bytes], chunk_size: int = DEFAULT_CHUNK_SIZE, start: int = 0, end: Union[None, int] = None,
+               binary: bool = False, keepends: bool = True) -> Iterator[Any]:
+    """Yields the lines of a binary file, or of the byte range start-end, reading chunk_size bytes at a time."""
+    # Chained in C, so the per-line cost doesn't include resuming a Python generator
+    return itertools.chain.from_iterable(iter_line_batches(file, chunk_size, start, end, binary, keepends))
+
+
+def _plain_file_size(file: IO[bytes]) -> Union[None, int]:
+    return os.fstat(file.fileno()).st_size if is_plain_file(file) else None
+
+
+def tail_lines(file: IO[bytes], n: int, chunk_size: int = TAIL_CHUNK_SIZE) -> List[str]:
+    """
+    Returns the last n lines of a binary file without their line breaks.
+
+    Plain files are read backward from the end until n lines are found, so the cost doesn't depend on the file
+    size. Compressed files can only be read forward and are streamed through.
+    """
+    if n <= 0:
+        return []
+
+    size = _plain_file_size(file)
+
+    if size is None:
+        last_lines = collections.deque(maxlen=n)
+
+        for block in iter_line_blocks(file):
+            last_lines.extend(split_block(block, keepends=False))
+
+        return list(last_lines)
+
+    if size == 0:
+        return []
+
+    blocks = collections.deque()
+    newlines = 0
+    position = size
+
+    # One line break more than n is needed to know where the first of the n lines starts, unless the file
+    # ends with a line break, which ends the last line instead of starting a new one
+    while position > 0 and newlines <= n:
+        read_size = min(max(1, chunk_size), position)
+        position -= read_size
+
+        file.seek(position)
+        block = file.read(read_size)
+
+        if position + read_size == size and block.endswith(b'\n'):
+            newlines -= 1
+
+        blocks.appendleft(block)
+        newlines += block.count(b'\n')
+
+    data = b''.join(blocks)
+
+    # The first line is incomplete if the read stopped mid-line
+    if position > 0:
+        data = data[data.find(b'\n') + 1:]
+
+    # Split by the same rule as iter_lines, so '\r\n' and '\r' line breaks give the same lines
+    return split_block(data, keepends=False)[-n:]
+
+
+def count_lines(file: IO[bytes], chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """
+    Counts the lines of a binary file. A last line without a line break counts as a line.
+
+    Plain files are memory-mapped and counted with bytes.count over bounded slices of the mapping, so the file is
+    never read through Python file objects or held in memory at once.
+    """
+    size = _plain_file_size(file)
+    chunk_size = max(1, chunk_size)
+    count = 0
+
+    if size is not None:
+        if size == 0:
+            return 0
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapping:
+            for position in range(0, size, chunk_size):
+                count += mapping[position:position + chunk_size].count(b'\n')
+
+            return count + (mapping[size - 1] != ord('\n'))
+
+    last = b'\n'
+
+    for chunk in iter(lambda: file.read(chunk_size), b''):
+        count += chunk.count(b'\n')
+        last = chunk[-1:]
+
+    return count + (last != b'\n')
+
+
+def split_line_ranges(file: IO[bytes], k: int) -> List[Tuple[int, int]]:
+    """
+    Splits a plain binary file into at most k byte ranges (start, end) of about equal size, each starting at the
+    beginning of a line and ending after a line break (or at the end of the file).
+    """
+    if k < 1:
+        raise ValueError('k must be at least 1.')
+
+    size = _plain_file_size(file)
+
+    if size is None:
+        raise ValueError('Line ranges need an uncompressed file, compressed data has no byte offsets to seek to.')
+
+    boundaries = [0]
+
+    for part in range(1, k):
+        target = max(size * part // k, boundaries[-1])
+
+        if target >= size:
+            break
+
+        # Starting one byte early finds a line that begins exactly at the target
+        position = file.seek(max(target - 1, 0))
+        boundary = position + len(file.readline())
+
+        if boundary > boundaries[-1]:
+            boundaries.append(boundary)
+
+    if boundaries[-1] < size:
+        boundaries.append(size)
+
+    return list(zip(boundaries, boundaries[1:]))
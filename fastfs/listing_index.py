@@ -0,0 +1,225 @@
+import os
+import threading
+
+from typing import Any, Callable, Dict, List, Tuple, Union
+
+from fastfs.scan import cache_file_path, load_cache_file, save_cache_file
+
+
+# The default bulk_read_directory orderings, '12.json' (or '12.json.gz') and '12-prefix.json' respectively
+SORT_KEYS = {
+    'numeric': lambda file_name: int(file_name.split('.', 1)[0]),
+    'numeric_prefix': lambda file_name: int(file_name.split("-")[0]),
+}
+
+INDEX_VERSION = 2
+
+
+def _parse_sort_keys(file_name: str) -> Tuple[Union[None, int], ...]:
+    keys = []
+
+    for sort_key in SORT_KEYS.values():
+        try:
+            keys.append(sort_key(file_name))
+        except ValueError:
+            keys.append(None)
+
+    return tuple(keys)
+
+
+def _stat_entry(file_path: str, file_name: str) -> Union[None, list]:
+    try:
+        stat_result = os.stat(file_path)
+    except FileNotFoundError:
+        return None
+
+    return [stat_result.st_size, stat_result.st_mtime_ns, os.path.splitext(file_name)[1], *_parse_sort_keys(file_name)]
+
+
+class DirectoryIndex():
+    """
+    A listing of one directory: name -> [size, mtime_ns, extension, *parsed sort keys].
+
+    The listing is trusted while the directory's mtime is unchanged. When it changes, the names are listed
+    again but only new names are stat'ed. Files rewritten in place by other programs keep their old
+    size/mtime in the index, since that doesn't change the directory's mtime.
+    """
+
+    def __init__(self, directory_name: str, index_path: Union[None, str] = None):
+        self.directory_name = directory_name
+        self.index_path = index_path
+
+        self.mtime_ns = None
+        self.entries: Dict[str, list] = {}
+
+        self._sorted: Dict[Tuple[str, bool], List[str]] = {}
+        self._dirty = False
+        self._lock = threading.RLock()
+
+        if index_path is not None:
+            self._load()
+
+    def _load(self):
+        data = load_cache_file(self.index_path)
+
+        if data.get('version') == INDEX_VERSION:
+            self.mtime_ns = data['mtime_ns']
+            self.entries = data['entries']
+
+    def save(self):
+        with self._lock:
+            if self.index_path is None or not self._dirty:
+                return
+
+            save_cache_file(self.index_path, {'version': INDEX_VERSION, 'mtime_ns': self.mtime_ns,
+                                              'entries': self.entries})
+            self._dirty = False
+
+    def refresh(self):
+        """Brings the index up to date if the directory changed since it was last seen."""
+        with self._lock:
+            mtime_ns = os.stat(self.directory_name).st_mtime_ns
+
+            if mtime_ns == self.mtime_ns:
+                return
+
+            names = set(os.listdir(self.directory_name))
+
+            for name in set(self.entries) - names:
+                del self.entries[name]
+
+            for name in names - set(self.entries):
+                entry = _stat_entry(os.path.join(
+                    self.directory_name, name), name)
+
+                if entry is not None:
+                    self.entries[name] = entry
+
+            self.mtime_ns = mtime_ns
+            self._changed()
+
+        # A full relisting is the expensive case, keep the result
+        self.save()
+
+    def file_changed(self, file_name: str, mtime_ns_before: Union[None, int] = None):
+        """
+        Records a write or delete made through fastfs without relisting the directory.
+
+        mtime_ns_before is the directory's mtime observed right before the write. The index is only moved to the
+        directory's new mtime if it was up to date then, so files others created in the meantime aren't missed.
+        Otherwise the directory is listed again when it is next used.
+        """
+        with self._lock:
+            entry = _stat_entry(os.path.join(
+                self.directory_name, file_name), file_name)
+
+            if entry is None:
+                self.entries.pop(file_name, None)
+            else:
+                self.entries[file_name] = entry
+
+            if mtime_ns_before is not None and mtime_ns_before == self.mtime_ns:
+                self.mtime_ns = os.stat(self.directory_name).st_mtime_ns
+            else:
+                self.mtime_ns = None
+
+            self._changed()
+
+    def _changed(self):
+        self._sorted.clear()
+        self._dirty = True
+
+    def names(self, show_hidden: bool = False) -> List[str]:
+        with self._lock:
+            if show_hidden:
+                return list(self.entries)
+
+            return [name for name in self.entries if not name.startswith('.')]
+
+    def sorted_names(self, sort_by: Union[str, Callable[[str], Any]], reverse: bool = False) -> List[str]:
+        """
+        Returns the visible names sorted by one of SORT_KEYS (using the parsed keys, memoized until the
+        directory changes) or by an arbitrary callable.
+        """
+        with self._lock:
+            if callable(sort_by):
+                return sorted(self.names(), key=sort_by, reverse=reverse)
+
+            cached = self._sorted.get((sort_by, reverse))
+
+            if cached is None:
+                key_idx = 3 + list(SORT_KEYS).index(sort_by)
+                names = self.names()
+
+                if all(self.entries[name][key_idx] is not None for name in names):
+                    cached = sorted(
+                        names, key=lambda name: self.entries[name][key_idx], reverse=reverse)
+                else:
+                    # Let the sort key raise for the file name it can't parse
+                    cached = sorted(
+                        names, key=SORT_KEYS[sort_by], reverse=reverse)
+
+                self._sorted[(sort_by, reverse)] = cached
+
+            return list(cached)
+
+
+class ListingIndexes():
+    """The listing indexes of every directory a file manager has listed, by absolute path."""
+
+    def __init__(self, persist: bool = True):
+        self.persist = persist
+
+        self._indexes: Dict[str, DirectoryIndex] = {}
+        self._lock = threading.Lock()
+
+    def get(self, directory_name: str) -> DirectoryIndex:
+        directory_name = os.path.abspath(directory_name)
+
+        with self._lock:
+            index = self._indexes.get(directory_name)
+
+            if index is None:
+                index_path = cache_file_path(
+                    'index', directory_name) if self.persist else None
+                index = DirectoryIndex(directory_name, index_path=index_path)
+                self._indexes[directory_name] = index
+
+        index.refresh()
+
+        return index
+
+    def directory_mtime_ns(self, file_name: str) -> Union[None, int]:
+        """The mtime of the directory of file_name if it is indexed, to pass to file_changed after a write."""
+        directory_name = os.path.dirname(os.path.abspath(file_name))
+
+        if directory_name not in self._indexes:
+            return None
+
+        try:
+            return os.stat(directory_name).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def file_changed(self, file_name: str, mtime_ns_before: Union[None, int] = None):
+        directory_name, name = os.path.split(os.path.abspath(file_name))
+
+        index = self._indexes.get(directory_name)
+
+        if index is not None:
+            index.file_changed(name, mtime_ns_before)
+
+    def directory_removed(self, directory_name: str):
+        directory_name = os.path.abspath(directory_name)
+
+        with self._lock:
+            for path in list(self._indexes):
+                if path == directory_name or path.startswith(directory_name + os.sep):
+                    del self._indexes[path]
+
+    def save(self):
+        with self._lock:
+            indexes = list(self._indexes.values())
+
+        for index in indexes:
+            index.save()
@@ -0,0 +1,280 @@
+"""
+Packed containers: many items in a single file, for bulk writes that would otherwise create millions of tiny files.
+
+Layout: an 8-byte header, then one segment per appended batch. A segment is the items' payloads back to back,
+followed by the batch's index and a fixed-size footer:
+
+    header  | payload ... payload | index | footer | payload ... | index | footer
+
+The index holds (offset, length, data type) per item, then each item's optional key. The footer points to its
+index and to the previous footer, so opening a pack reads one footer and index per batch, and appending a batch is
+a single sequential write at the end of the file.
+"""
+import array
+import mmap
+import os
+import struct
+import zlib
+
+from typing import Any, Callable, Dict, IO, Iterable, Iterator, List, Tuple, Union
+
+from fastfs.data_types import FileTypes
+from fastfs.exceptions import CorruptFileError, FileNotFound, FileReadError
+
+
+PACK_MAGIC = b'FPCK'
+PACK_VERSION = 1
+HEADER = struct.Struct('<4sB3x')
+
+FOOTER_MAGIC = b'FPIX'
+# magic, index offset, index length, item count, previous footer offset (0 for the first batch), index crc32
+FOOTER = struct.Struct('<4sQQQQI')
+
+# payload offset, payload length, data type
+ENTRY = struct.Struct('<QQB')
+KEY_LENGTH = struct.Struct('<I')
+NO_KEY = 0xFFFFFFFF
+
+# The data type byte of each entry indexes this tuple
+PACK_TYPES = (FileTypes.BINARY, FileTypes.JSON, FileTypes.PICKLE, FileTypes.CSV)
+
+
+def is_pack_file(file_name: str) -> bool:
+    try:
+        with open(file_name, 'rb') as file:
+            return file.read(len(PACK_MAGIC)) == PACK_MAGIC
+    except OSError:
+        return False
+
+
+def _read_footer(read_at: Callable[[int, int], bytes], footer_offset: int) -> Tuple[int, int, int, int, int]:
+    magic, index_offset, index_length, count, previous, crc = FOOTER.unpack(
+        read_at(footer_offset, FOOTER.size))
+
+    if magic != FOOTER_MAGIC or index_offset + index_length != footer_offset:
+        raise CorruptFileError(
+            'Invalid pack footer, the last batch may not have been fully written.')
+
+    return index_offset, index_length, count, previous, crc
+
+
+def last_footer_offset(fd: int, size: int) -> int:
+    """Validates the end of an existing pack and returns the offset of its last footer, 0 if it is empty."""
+    header = os.pread(fd, HEADER.size, 0)
+
+    if len(header) != HEADER.size or HEADER.unpack(header)[0] != PACK_MAGIC:
+        raise CorruptFileError('Not a fastfs pack file.')
+
+    if size == HEADER.size:
+        return 0
+
+    footer_offset = size - FOOTER.size
+    _read_footer(lambda offset, length: os.pread(
+        fd, length, offset), footer_offset)
+
+    return footer_offset
+
+
+def write_batch(file: IO[bytes], items: Iterable[Tuple[int, bytes, Union[None, str]]]) -> Tuple[int, int]:
+    """
+    Appends a batch of (data type index, payload, key) items at the end of an open pack file, writing the
+    header first if the file is empty.
+
+    Returns:
+        Tuple[int, int]: The number of items and payload bytes written.
+    """
+    start = offset = file.seek(0, os.SEEK_END)
+
+    if offset == 0:
+        previous = 0
+    else:
+        previous = last_footer_offset(file.fileno(), offset)
+
+    entries = bytearray()
+    keys = bytearray()
+    count = 0
+    total = 0
+
+    try:
+        if offset == 0:
+            offset = file.write(HEADER.pack(PACK_MAGIC, PACK_VERSION))
+
+        for type_idx, payload, key in items:
+            file.write(payload)
+
+            entries += ENTRY.pack(offset, len(payload), type_idx)
+
+            if key is None:
+                keys += KEY_LENGTH.pack(NO_KEY)
+            else:
+                encoded = key.encode('utf-8')
+                keys += KEY_LENGTH.pack(len(encoded)) + encoded
+
+            offset += len(payload)
+            count += 1
+            total += len(payload)
+
+        index = bytes(entries + keys)
+
+        file.write(index)
+        file.write(FOOTER.pack(FOOTER_MAGIC, offset, len(index),
+                   count, previous, zlib.crc32(index)))
+    except BaseException:
+        # An item failed to serialize part way through the batch, drop its payloads so the pack stays readable
+        file.truncate(start)
+        raise
+
+    return count, total
+
+
+class PackReader():
+    """
+    Random access to the items of a pack through a read-only memory map.
+
+    Items are read by position, pack[i], or by key, pack['name'], which costs one dictionary lookup and a slice
+    of the mapping. decode turns (FileTypes, memoryview) into the item, see AbstractFileManager.open_pack.
+    """
+
+    def __init__(self, file_name: str, decode: Callable[[FileTypes, memoryview], Any]):
+        self.file_name = file_name
+        self._decode = decode
+
+        try:
+            with open(file_name, 'rb') as file:
+                size = os.fstat(file.fileno()).st_size
+                # Packs have at least a header, so the mapping is never empty
+                self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        except FileNotFoundError as exc:
+            raise FileNotFound(file_name) from exc
+        except OSError as exc:
+            raise FileReadError from exc
+
+        if size < HEADER.size or HEADER.unpack_from(self._mmap, 0)[0] != PACK_MAGIC:
+            self.close()
+            raise CorruptFileError(f'{file_name} is not a fastfs pack file.')
+
+        self._view = memoryview(self._mmap)
+
+        self._offsets = array.array('Q')
+        self._lengths = array.array('Q')
+        self._types = bytearray()
+        self._keys: List[Union[None, str]] = []
+        self._key_index: Dict[str, int] = {}
+
+        try:
+            self._load_index(size)
+        except BaseException:
+            self.close()
+            raise
+
+    def _load_index(self, size: int):
+        batches = []
+        footer_offset = size - FOOTER.size if size > HEADER.size else 0
+
+        while footer_offset:
+            index_offset, index_length, count, previous, crc = _read_footer(
+                lambda offset, length: self._mmap[offset:offset + length], footer_offset)
+
+            if zlib.crc32(self._view[index_offset:index_offset + index_length]) != crc:
+                raise CorruptFileError(f'The index of {self.file_name} is corrupt.')
+
+            batches.append((index_offset, count))
+            footer_offset = previous
+
+        for index_offset, count in reversed(batches):
+            for offset, length, type_idx in ENTRY.iter_unpack(self._view[index_offset:index_offset + count * ENTRY.size]):
+                self._offsets.append(offset)
+                self._lengths.append(length)
+                self._types.append(type_idx)
+
+            position = index_offset + count * ENTRY.size
+
+            for _ in range(count):
+                (length,) = KEY_LENGTH.unpack_from(self._mmap, position)
+                position += KEY_LENGTH.size
+
+                if length == NO_KEY:
+                    self._keys.append(None)
+                    continue
+
+                key = bytes(self._view[position:position + length]).decode('utf-8')
+                position += length
+
+                # Later batches override earlier items with the same key
+                self._key_index[key] = len(self._keys)
+                self._keys.append(key)
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def _position(self, item: Union[int, str]) -> int:
+        if isinstance(item, str):
+            try:
+                return self._key_index[item]
+            except KeyError:
+                raise KeyError(item) from None
+
+        if item < 0:
+            item += len(self._offsets)
+
+        if not 0 <= item < len(self._offsets):
+            raise IndexError('pack index out of range')
+
+        return item
+
+    def view(self, item: Union[int, str]) -> memoryview:
+        """Returns the raw payload of an item without copying it. Only valid until the pack is closed."""
+        idx = self._position(item)
+        offset = self._offsets[idx]
+
+        return self._view[offset:offset + self._lengths[idx]]
+
+    def data_type(self, item: Union[int, str]) -> FileTypes:
+        return PACK_TYPES[self._types[self._position(item)]]
+
+    def __getitem__(self, item: Union[int, str]) -> Any:
+        idx = self._position(item)
+
+        return self._decode(PACK_TYPES[self._types[idx]], self.view(idx))
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key not in self._key_index:
+            return default
+
+        return self[key]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._key_index
+
+    def keys(self) -> List[Union[None, str]]:
+        """Returns the key of each item in order, None for items stored without a key."""
+        return list(self._keys)
+
+    def __iter__(self) -> Iterator[Any]:
+        for idx in range(len(self)):
+            yield self[idx]
+
+    def items(self) -> Iterator[Tuple[Union[None, str], Any]]:
+        for idx in range(len(self)):
+            yield self._keys[idx], self[idx]
+
+    def close(self):
+        view, self._view = getattr(self, '_view', None), None
+
+        if view is not None:
+            view.release()
+
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                # Views returned by view() are still referenced, the mapping is freed along with them
+                pass
+
+            self._mmap = None
+
+    def __enter__(self) -> 'PackReader':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
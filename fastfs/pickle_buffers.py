@@ -0,0 +1,174 @@
+"""
+Pickles with out-of-band buffers (pickle protocol 5, PEP 574).
+
+Large buffers, such as the data of NumPy arrays, are written after the pickle stream instead of inside it, each
+aligned to ALIGNMENT bytes:
+
+    header | buffer table | pickle stream | buffer | buffer | ...
+
+On load the rest of the file is read with one readinto call into a single buffer that all arrays share, so arrays
+are rebuilt without copying their data a second time.
+
+With mmap=True the file is memory-mapped instead and the buffers are views of the mapping, so nothing is read until
+it is touched. The mapping is copy-on-write: arrays stay writable, and writes to them never reach the file. It is
+only safe while the file is not truncated or rewritten in place: touching a mapped page past the new end of the
+file kills the process with SIGBUS. Atomic writes (set_write_options(atomic=True)) replace the file instead and
+are safe.
+"""
+import ctypes
+import io
+import mmap as _mmap
+import os
+import pickle
+import struct
+
+from typing import IO, Any, List
+
+from fastfs.compression import is_plain_file
+from fastfs.exceptions import CorruptFileError
+
+
+# Not a pickle opcode, so these files can't be mistaken for plain pickles
+MAGIC = b'\xffFPK'
+VERSION = 1
+
+# magic, version, pickle stream length, number of buffers
+HEADER = struct.Struct('<4sB3xQQ')
+# buffer offset, buffer length
+BUFFER_ENTRY = struct.Struct('<QQ')
+
+# Buffers start on cache line boundaries, which also satisfies the alignment of every NumPy dtype
+ALIGNMENT = 64
+
+# Smaller buffers stay in the pickle stream, where they cost less than a table entry and padding
+MIN_BUFFER_SIZE = 64 * 1024
+
+
+class _OutOfBandPickler(pickle.Pickler):
+
+    def __init__(self, file: IO[bytes], min_buffer_size: int):
+        self._buffers: List[memoryview] = []
+        self._min_buffer_size = min_buffer_size
+
+        super().__init__(file, protocol=5, buffer_callback=self._buffer_callback)
+
+    def _buffer_callback(self, buffer: pickle.PickleBuffer) -> bool:
+        raw = buffer.raw()
+
+        # A true value keeps the buffer in the pickle stream
+        if raw.nbytes < self._min_buffer_size:
+            return True
+
+        self._buffers.append(raw)
+        return False
+
+    def reducer_override(self, obj: Any) -> Any:
+        # bytearray is pickled in-band even with protocol 5. bytes objects never reach reducer_override.
+        if type(obj) is bytearray and len(obj) >= self._min_buffer_size:
+            return bytearray, (pickle.PickleBuffer(obj),)
+
+        return NotImplemented
+
+
+def _aligned(position: int) -> int:
+    return -(-position // ALIGNMENT) * ALIGNMENT
+
+
+def _aligned_buffer(size: int) -> memoryview:
+    # Offsets in the file are aligned, so the buffer is started on an aligned address to keep them aligned in memory
+    buffer = bytearray(size + ALIGNMENT)
+    address = ctypes.addressof((ctypes.c_char * len(buffer)).from_buffer(buffer))
+    start = -address % ALIGNMENT
+
+    return memoryview(buffer)[start:start + size]
+
+
+def dump(obj: Any, file: IO[bytes], min_buffer_size: int = MIN_BUFFER_SIZE):
+    """Pickles obj to a binary file, writing buffers of at least min_buffer_size bytes out-of-band."""
+    stream = io.BytesIO()
+    pickler = _OutOfBandPickler(stream, min_buffer_size)
+    pickler.dump(obj)
+
+    # Only the in-band part is held in memory, the buffers are written straight from the objects
+    buffers = pickler._buffers
+    stream = stream.getbuffer()
+
+    position = HEADER.size + BUFFER_ENTRY.size * len(buffers) + stream.nbytes
+    table = bytearray()
+    offsets = []
+
+    for buffer in buffers:
+        position = _aligned(position)
+        offsets.append(position)
+        table += BUFFER_ENTRY.pack(position, buffer.nbytes)
+        position += buffer.nbytes
+
+    file.write(HEADER.pack(MAGIC, VERSION, stream.nbytes, len(buffers)))
+    file.write(table)
+    file.write(stream)
+
+    position = HEADER.size + len(table) + stream.nbytes
+
+    for offset, buffer in zip(offsets, buffers):
+        file.write(bytes(offset - position))
+        file.write(buffer)
+        position = offset + buffer.nbytes
+
+
+def _parse(view: memoryview):
+    magic, version, stream_length, count = HEADER.unpack_from(view)
+
+    if version != VERSION:
+        raise CorruptFileError(f'Unsupported out-of-band pickle version {version}.')
+
+    stream_start = HEADER.size + BUFFER_ENTRY.size * count
+
+    if len(view) < stream_start:
+        raise CorruptFileError('The pickle file is truncated.')
+
+    entries = list(BUFFER_ENTRY.iter_unpack(view[HEADER.size:stream_start]))
+    end = max([stream_start + stream_length] + [offset + length for offset, length in entries])
+
+    return stream_start, stream_length, entries, end
+
+
+def load(file: IO[bytes], mmap: bool = False) -> Any:
+    """
+    Loads a pickle written by dump from a binary file positioned after MAGIC.
+
+    The buffers are read once into a single buffer that the objects share. With mmap=True, plain files are
+    memory-mapped instead so buffers aren't read or copied, see the module docstring for when that is safe.
+    """
+    if mmap and is_plain_file(file):
+        if os.fstat(file.fileno()).st_size < HEADER.size:
+            raise CorruptFileError('The pickle file is truncated.')
+
+        view = memoryview(_mmap.mmap(file.fileno(), 0, access=_mmap.ACCESS_COPY))
+        stream_start, stream_length, entries, end = _parse(view)
+
+        if end > len(view):
+            raise CorruptFileError('The pickle file is truncated.')
+    else:
+        head = MAGIC + file.read(HEADER.size - len(MAGIC))
+
+        if len(head) < HEADER.size:
+            raise CorruptFileError('The pickle file is truncated.')
+
+        head += file.read(BUFFER_ENTRY.size * HEADER.unpack(head)[3])
+        stream_start, stream_length, entries, end = _parse(memoryview(head))
+
+        # The rest is read straight into one buffer of the final size
+        view = _aligned_buffer(end)
+        view[:len(head)] = head
+        position = len(head)
+
+        while position < end:
+            read = file.readinto(view[position:])
+
+            if not read:
+                raise CorruptFileError('The pickle file is truncated.')
+
+            position += read
+
+    return pickle.loads(view[stream_start:stream_start + stream_length],
+                        buffers=[view[offset:offset + length] for offset, length in entries])
@@ -0,0 +1,223 @@
+import heapq
+import json
+import os
+import tempfile
+
+from typing import Any, Dict, List, Tuple, Union
+
+from fastfs.digests import sidecar_target
+from fastfs.executors import create_executor
+
+
+def cache_file_path(kind: str, directory_name: str) -> str:
+    """Returns a per-directory cache file under $XDG_CACHE_HOME/fastfs (or ~/.cache/fastfs)."""
+    cache_root = os.environ.get('XDG_CACHE_HOME') or os.path.join(
+        os.path.expanduser('~'), '.cache')
+
+    import hashlib
+
+    digest = hashlib.sha1(os.path.abspath(
+        directory_name).encode('utf-8')).hexdigest()
+
+    # Kept outside of the directory itself, writing it would otherwise change the directory's mtime
+    return os.path.join(cache_root, 'fastfs', f'{kind}-{digest}.json')
+
+
+def default_size_cache_path(directory_name: str) -> str:
+    return cache_file_path('dirinfo', directory_name)
+
+
+def load_cache_file(cache_path: str) -> Dict[str, Any]:
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache_file(cache_path: str, cache: Dict[str, Any]):
+    directory_name = os.path.dirname(cache_path)
+
+    # A bare file name lives in the working directory
+    if directory_name:
+        os.makedirs(directory_name, exist_ok=True)
+
+    fd, temp_path = tempfile.mkstemp(dir=directory_name or '.', suffix='.tmp')
+
+    try:
+        with open(fd, 'w', encoding='utf-8') as file:
+            json.dump(cache, file)
+
+        os.replace(temp_path, cache_path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+def _empty_summary() -> Dict[str, Any]:
+    return {'files': 0, 'size': 0, 'extensions': {}, 'largest': [], 'oldest': None, 'newest': None}
+
+
+def _merge_summary(total: Dict[str, Any], other: Dict[str, Any], largest: int):
+    total['files'] += other['files']
+    total['size'] += other['size']
+
+    for extension, count in other['extensions'].items():
+        total['extensions'][extension] = total['extensions'].get(
+            extension, 0) + count
+
+    if largest > 0:
+        total['largest'] = heapq.nlargest(
+            largest, total['largest'] + other['largest'])
+
+    for key, pick in (('oldest', min), ('newest', max)):
+        if other[key] is not None:
+            total[key] = other[key] if total[key] is None else pick(
+                total[key], other[key])
+
+
+def _scan_entries(path: str, rel_path: str, largest: int) -> Tuple[Dict[str, Any], List[str], int]:
+    # One scandir per directory; DirEntry caches the stat result, so each file costs a single stat
+    files = _empty_summary()
+    sub_directories = []
+    num_entries = 0
+
+    with os.scandir(path) as entries:
+        entries = list(entries)
+
+    names = {entry.name for entry in entries}
+
+    for entry in entries:
+        # Digest sidecars of skip_if_unchanged writes are fastfs bookkeeping, not files of the directory
+        target = sidecar_target(entry.name)
+
+        if target is not None and target in names:
+            continue
+
+        num_entries += 1
+
+        # Symlinks are neither followed nor counted, like os.walk's default
+        if entry.is_symlink():
+            continue
+
+        if entry.is_dir():
+            sub_directories.append(entry.name)
+            continue
+
+        stat_result = entry.stat(follow_symlinks=False)
+        extension = os.path.splitext(entry.name)[1]
+
+        files['files'] += 1
+        files['size'] += stat_result.st_size
+        files['extensions'][extension] = files['extensions'].get(
+            extension, 0) + 1
+        files['largest'].append(
+            [stat_result.st_size, os.path.join(rel_path, entry.name)])
+
+        mtime = stat_result.st_mtime
+        files['oldest'] = mtime if files['oldest'] is None else min(
+            files['oldest'], mtime)
+        files['newest'] = mtime if files['newest'] is None else max(
+            files['newest'], mtime)
+
+    files['largest'] = heapq.nlargest(
+        largest, files['largest']) if largest > 0 else []
+
+    return files, sub_directories, num_entries
+
+
+def _list_directory(path: str, rel_path: str, mtime_ns: int, old_cache: Dict[str, Any], new_cache: Dict[str, Any],
+                    largest: int) -> Tuple[Dict[str, Any], List[str]]:
+    # A directory whose mtime is unchanged since it was cached doesn't need to be listed again, unless the cached
+    # largest files were cut to fewer than this call asks for
+    cached = old_cache.get(rel_path)
+
+    if cached is not None and cached['mtime_ns'] == mtime_ns and cached.get('largest', -1) >= largest:
+        files, sub_directories, num_entries = cached['files'], cached['dirs'], cached['entries']
+        largest = cached['largest']
+    else:
+        files, sub_directories, num_entries = _scan_entries(
+            path, rel_path, largest)
+
+    new_cache[rel_path] = {'mtime_ns': mtime_ns, 'files': files,
+                           'dirs': sub_directories, 'entries': num_entries, 'largest': largest}
+
+    return files, sub_directories
+
+
+def _scan_sub_directory(path: str, rel_path: str, name: str, old_cache: Dict[str, Any], new_cache: Dict[str, Any],
+                        largest: int) -> Union[None, Dict[str, Any]]:
+    sub_path = os.path.join(path, name)
+
+    try:
+        sub_mtime_ns = os.stat(sub_path, follow_symlinks=False).st_mtime_ns
+
+        return scan_tree(sub_path, os.path.join(rel_path, name), sub_mtime_ns, old_cache, new_cache, largest)
+    except OSError:
+        # Removed since its parent was cached, or not readable: skipped, like os.walk does
+        return None
+
+
+def scan_tree(path: str, rel_path: str, mtime_ns: int, old_cache: Dict[str, Any], new_cache: Dict[str, Any],
+              largest: int) -> Dict[str, Any]:
+    """
+    Summarizes a directory tree: file count and size, counts by extension, largest files and mtime range.
+
+    A directory whose mtime matches its entry in old_cache is not listed again, only its subdirectories are
+    visited. Note that rewriting a file in place doesn't change its directory's mtime; replacing it (as atomic
+    writes do), creating or deleting files does. Every visited directory is recorded in new_cache.
+    """
+    files, sub_directories = _list_directory(
+        path, rel_path, mtime_ns, old_cache, new_cache, largest)
+
+    summary = _empty_summary()
+    _merge_summary(summary, files, largest)
+
+    for name in sub_directories:
+        sub_summary = _scan_sub_directory(
+            path, rel_path, name, old_cache, new_cache, largest)
+
+        if sub_summary is not None:
+            _merge_summary(summary, sub_summary, largest)
+
+    return summary
+
+
+def scan_directory(directory_name: str, largest: int = 10, workers: int = 1,
+                   cache_path: Union[None, str] = None) -> Tuple[Dict[str, Any], int]:
+    """
+    Summarizes a directory tree, optionally scanning the root's subtrees in parallel and reusing
+    the per-directory results stored at cache_path.
+
+    Returns:
+        Tuple[Dict[str, Any], int]: The summary of the whole tree and the number of entries directly in the root.
+    """
+    old_cache = load_cache_file(cache_path) if cache_path is not None else {}
+    new_cache = {}
+
+    root_mtime_ns = os.stat(directory_name).st_mtime_ns
+
+    if workers <= 1:
+        summary = scan_tree(directory_name, '', root_mtime_ns,
+                            old_cache, new_cache, largest)
+    else:
+        # List the root here, then hand each top-level subtree to a worker thread.
+        # os.scandir and stat release the GIL, so subtrees are listed concurrently.
+        files, sub_directories = _list_directory(
+            directory_name, '', root_mtime_ns, old_cache, new_cache, largest)
+
+        summary = _empty_summary()
+        _merge_summary(summary, files, largest)
+
+        with create_executor('thread', workers) as pool:
+            sub_summaries = pool.map(lambda name: _scan_sub_directory(
+                directory_name, '', name, old_cache, new_cache, largest), sub_directories)
+
+            for sub_summary in sub_summaries:
+                if sub_summary is not None:
+                    _merge_summary(summary, sub_summary, largest)
+
+    if cache_path is not None:
+        save_cache_file(cache_path, new_cache)
+
+    return summary, new_cache['']['entries']
@@ -1,7 +1,15 @@
 # Utils
-from typing import Callable, Any, List, Union
+from typing import TYPE_CHECKING, Callable, Any, ContextManager, Dict, Iterator, List, Tuple, Union
 from fastfs.global_instance import fast_file_manager
-from fastfs.data_types import FileTypes
+from fastfs.data_types import FileTypes, Durability
+from fastfs.durability import WriteBatch
+from fastfs.listing_index import ListingIndexes
+from fastfs.cache import ReadCache
+from fastfs.instrumentation import OperationRecord
+from fastfs.pack import PackReader
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
 
 
 def get_fs_directory(absolute_path: bool = False) -> str:
@@ -17,6 +25,16 @@ def get_fs_directory(absolute_path: bool = False) -> str:
     return fast_file_manager.get_fs_directory(absolute_path=absolute_path)
 
 
+def reload_config():
+    """
+    Re-reads the .fastfs config and applies its directory and active setting.
+
+    The config is read once on first use and get_fs_directory only re-parses it when its modification time
+    changes, so call this after another process changes .fastfs.
+    """
+    fast_file_manager.reload_config()
+
+
 def ls(directory_name: str) -> List[str]:
     """
     Lists all files in the given directory.
@@ -30,13 +48,15 @@ def ls(directory_name: str) -> List[str]:
     return fast_file_manager.ls(directory_name)
 
 
-def sorted_ls(directory_name: str, sort_by: Callable[[str], Any], reverse: bool = False) -> List[str]:
+def sorted_ls(directory_name: str, sort_by: Union[str, Callable[[str], Any]], reverse: bool = False) -> List[str]:
     """
     Lists all files in a directory, sorted based on the given sorting function.
 
     Args:
         directory_name: The name/path of the directory to list files from.
-        sort_by: A callable function that takes a file name as input and returns a sorting key.
+        sort_by: A callable function that takes a file name as input and returns a sorting key, or 'numeric'
+                 ('12.json') / 'numeric_prefix' ('12-prefix.json') to sort by the bulk_write_directory index.
+                 With the listing index enabled, these named orderings are computed once per directory change.
         reverse: If True, sorts the files in reverse order.
 
     Returns:
@@ -115,18 +135,28 @@ def touch_directory(directory_name: str):
     fast_file_manager.touch_directory(directory_name)
 
 
-def get_directory_info(directory_name: str) -> dict:
+def get_directory_info(directory_name: str, workers: int = 1, size_cache: Union[bool, str] = False,
+                       largest: int = 10) -> dict:
     """
     Returns information about the given directory.
 
     Args:
         directory_name: The name/path of the directory.
+        workers: The number of threads scanning the directory's top-level subtrees in parallel.
+        size_cache: If True, per-directory results are stored in a cache file under ~/.cache/fastfs, and directories
+                    whose modification time is unchanged are not listed again on the next call. A string is used as
+                    the cache file path instead. Files rewritten in place don't change their directory's modification
+                    time, so their new size is only picked up once the directory itself changes.
+        largest: The number of largest files to report.
 
     Returns:
         dict: A dictionary containing information about the directory, including the absolute path, number of files,
-              creation time, modification time, and total size.
+              creation time, modification time, and total size. It also includes aggregates over the whole tree:
+              total_files, extensions (file count by extension), largest_files (relative path and size) and the
+              oldest/newest file modification times.
     """
-    return fast_file_manager.get_directory_info(directory_name)
+    return fast_file_manager.get_directory_info(directory_name, workers=workers, size_cache=size_cache,
+                                                largest=largest)
 
 
 def get_file_info(file_name: str) -> dict:
@@ -144,26 +174,52 @@ def get_file_info(file_name: str) -> dict:
 
 
 def bulk_write_directory(directory_name: str, file_data_ls: List[Any], data_type: Union[FileTypes, str],
-                         file_prefix: Union[None, str] = None):
+                         file_prefix: Union[None, str] = None, workers: int = 1, serialize_workers: int = 0,
+                         queue_size: int = 64, compression: Union[None, str] = None,
+                         compression_level: Union[None, int] = None, pack: bool = False,
+                         skip_if_unchanged: bool = False) -> Dict[str, Any]:
     """
     Writes a list of data objects to files in a directory.
 
     Args:
         directory_name: The name/path of the directory to write files to.
         file_data_ls: A list of data objects to write.
-        data_type: The file format to use for writing data. Supported formats include JSON, CSV, Pickle, HDF5, INI,
-                   YAML, and XML.
+        data_type: The file format to use for writing data. Supported formats are JSON, CSV, Pickle and Binary.
         file_prefix: An optional prefix to append to each file name. If not provided, file names will have no prefix.
+        workers: The number of threads writing files in parallel.
+        serialize_workers: If greater than 0, objects are serialized in this many worker processes instead of
+                           the calling thread. Useful for large objects.
+        queue_size: The maximum number of serialized files waiting to be written. Bounds memory use while
+                    serializing overlaps with writing.
+        compression: An optional compression ('gzip', 'bz2', 'xz', 'zstd' or 'lz4'). Its extension is appended to
+                     each file name, e.g. '0.json.gz'. bulk_read_directory decompresses such files automatically.
+        compression_level: The compression level. Defaults to a fast level for each compression.
+        pack: If True, writes all objects to a single pack file named directory_name instead of one file each,
+              see write_pack. bulk_read_directory and iter_directory read the pack like a directory.
+              Packs can't be compressed.
+        skip_if_unchanged: If True, files whose contents match the digest recorded by their previous write are
+                           left untouched, see fastfs.write_json. Not supported with pack.
+
+    Returns:
+        Dict[str, Any]: Throughput statistics with the keys 'files', 'bytes', 'seconds', 'files_per_second'
+                        and 'mb_per_second'. 'bytes' counts the data before compression. With skip_if_unchanged,
+                        'files' and 'bytes' only count rewritten files, 'rewritten' lists their paths in input
+                        order and 'skipped' counts the unchanged ones.
     """
-    fast_file_manager.bulk_write_directory(
-        directory_name, file_data_ls, data_type, file_prefix=file_prefix)
+    return fast_file_manager.bulk_write_directory(
+        directory_name, file_data_ls, data_type, file_prefix=file_prefix, workers=workers,
+        serialize_workers=serialize_workers, queue_size=queue_size, compression=compression,
+        compression_level=compression_level, pack=pack, skip_if_unchanged=skip_if_unchanged)
 
 
 def bulk_read_directory(directory_name: str, skip_unsupported_data_type: bool = False,
                         sort_by: Callable = None, sort_reverse=False,
-                        file_prefix: Union[None, str] = None, include_file_names: bool = False) -> List[Any]:
+                        file_prefix: Union[None, str] = None, include_file_names: bool = False,
+                        workers: int = 1, executor: Union[str, 'Executor'] = 'thread') -> List[Any]:
     """
     Reads files from a directory. File names must be in the same style and format as bulk_write_directory.
+    If directory_name is a pack file, its items are read instead, in the order they were written. Items are named by
+    their key, items without one by their position; an item whose key was written again is left out.
 
     Args:
         directory_name: The name/path of the directory to read files from.
@@ -175,11 +231,256 @@ def bulk_read_directory(directory_name: str, skip_unsupported_data_type: bool =
                      directory will be considered.
         include_file_names: If True, returns a dictionary mapping file names to the read data objects. If False,
                             returns a list of the read data objects.
+        workers: The number of files to read in parallel. If 1, files are read one after another.
+        executor: 'thread' to overlap file I/O, 'process' to also spread decoding (JSON, pickle) across CPU cores,
+                  or an existing concurrent.futures Executor to run the reads on.
 
     Returns:
         List[Any]: A list of data objects read from the directory, or a dictionary mapping file names to data objects
                    if `include_file_names` is True.
+
+    Raises:
+        BulkReadDirectoryError: If any file could not be read. Every file is still attempted; the exception's `errors`
+                                maps each failed file name to its exception and `data` holds the successful reads.
     """
     return fast_file_manager.bulk_read_directory(directory_name, skip_unsupported_data_type=skip_unsupported_data_type,
                                                  sort_by=sort_by, sort_reverse=sort_reverse, file_prefix=file_prefix,
-                                                 include_file_names=include_file_names)
+                                                 include_file_names=include_file_names, workers=workers,
+                                                 executor=executor)
+
+
+def iter_directory(directory_name: str, skip_unsupported_data_type: bool = False,
+                   sort_by: Callable = None, sort_reverse=False,
+                   file_prefix: Union[None, str] = None, prefetch: int = 8) -> Iterator[Tuple[str, Any]]:
+    """
+    Lazily reads files from a directory, one at a time. File names must be in the same style and format as
+    bulk_write_directory. Unlike bulk_read_directory, the directory doesn't have to fit in memory.
+    If directory_name is a pack file, its items are read instead, in the order they were written.
+
+    Args:
+        directory_name: The name/path of the directory to read files from.
+        skip_unsupported_data_type: If True, skips files with unsupported file types.
+        sort_by: An optional callable taking a file name as input and returning a sorting key. If provided, files will
+                 be sorted based on this function's return values.
+        sort_reverse: If True, sorts files in reverse order according to the sort_by callable.
+        file_prefix: An optional file name prefix for filtering files to read. If not provided, all files in the
+                     directory will be considered.
+        prefetch: The number of files read ahead in background threads. If 0, files are only read when requested.
+
+    Yields:
+        Tuple[str, Any]: The file name and the data object read from it, in the same order as bulk_read_directory.
+    """
+    return fast_file_manager.iter_directory(directory_name, skip_unsupported_data_type=skip_unsupported_data_type,
+                                            sort_by=sort_by, sort_reverse=sort_reverse, file_prefix=file_prefix,
+                                            prefetch=prefetch)
+
+
+def write_pack(file_name: str, file_data_ls: List[Any], data_type: Union[FileTypes, str],
+               keys: Union[None, List[Union[None, str]]] = None, serialize_workers: int = 0) -> Dict[str, int]:
+    """
+    Writes a list of data objects to a single pack file, replacing it if it exists. Packs avoid the per-file
+    overhead of creating, opening and listing many small files, and items can be read back in any order.
+
+    Args:
+        file_name: The name/path of the pack file.
+        file_data_ls: A list of data objects to write.
+        data_type: The format each object is serialized to. Supported formats are JSON, CSV, Pickle and Binary.
+        keys: An optional key per object (or None for objects without one), to read them back by key.
+        serialize_workers: If greater than 0, objects are serialized in this many worker processes.
+
+    Returns:
+        Dict[str, int]: The number of 'items' and payload 'bytes' written.
+    """
+    return fast_file_manager.write_pack(file_name, file_data_ls, data_type, keys=keys,
+                                        serialize_workers=serialize_workers)
+
+
+def append_pack(file_name: str, file_data_ls: List[Any], data_type: Union[FileTypes, str],
+                keys: Union[None, List[Union[None, str]]] = None, serialize_workers: int = 0) -> Dict[str, int]:
+    """
+    Appends a batch of data objects to a pack file, creating it if it doesn't exist. The batch is written with
+    one sequential write at the end of the file; existing items are never rewritten.
+
+    Args:
+        file_name: The name/path of the pack file.
+        file_data_ls: A list of data objects to append.
+        data_type: The format each object is serialized to. Batches may use different formats.
+        keys: An optional key per object. A key that already exists in the pack now refers to the new object.
+        serialize_workers: If greater than 0, objects are serialized in this many worker processes.
+
+    Returns:
+        Dict[str, int]: The number of 'items' and payload 'bytes' written.
+
+    Raises:
+        CorruptFileError: If the file is not a pack, or its last batch was not fully written.
+    """
+    return fast_file_manager.append_pack(file_name, file_data_ls, data_type, keys=keys,
+                                         serialize_workers=serialize_workers)
+
+
+def open_pack(file_name: str) -> PackReader:
+    """
+    Opens a pack file for random access. The file is memory-mapped, so reading an item only touches its own bytes.
+
+    Use as a context manager, or call close() when done:
+
+        with open_pack('records.pack') as pack:
+            first, last, record = pack[0], pack[-1], pack['0.json']
+
+    Args:
+        file_name: The name/path of the pack file.
+
+    Returns:
+        PackReader: Items are read with pack[index] or pack[key], and len(pack), keys(), items() and iteration
+                    work like on a list of (optionally keyed) objects.
+
+    Raises:
+        CorruptFileError: If the file is not a pack or its index is damaged.
+    """
+    return fast_file_manager.open_pack(file_name)
+
+
+def enable_read_cache(max_bytes: int = 256 * 1024 * 1024, return_mode: str = 'copy') -> ReadCache:
+    """
+    Enables an in-memory cache for read_json, read_pickle and read_yaml. A cached file is only reused while its
+    modification time, size and inode are unchanged, and writes through fastfs invalidate it immediately.
+
+    Args:
+        max_bytes: The approximate memory budget for decoded objects. Least recently used entries are evicted first.
+        return_mode: 'copy' returns a new copy of the cached object on every read, so callers may modify it. Entries
+                     are stored pickled and unpickled on every hit, which is about as fast as decoding JSON with orjson.
+                     'view' returns a shared read-only object instead (dicts become mappingproxy, lists become tuples,
+                     NumPy arrays are made read-only), so hits cost nothing. Files holding other mutable objects are
+                     still copied.
+
+    Returns:
+        ReadCache: The new cache, exposing invalidate(), clear() and stats() (hit/miss/eviction counters).
+    """
+    return fast_file_manager.enable_read_cache(max_bytes=max_bytes, return_mode=return_mode)
+
+
+def disable_read_cache():
+    """
+    Disables and drops the read cache.
+    """
+    fast_file_manager.disable_read_cache()
+
+
+def invalidate_read_cache(file_name: Union[None, str] = None):
+    """
+    Drops cached entries from the read cache.
+
+    Args:
+        file_name: The name/path of the file to drop. If not provided, the whole cache is cleared.
+    """
+    fast_file_manager.invalidate_read_cache(file_name)
+
+
+def enable_instrumentation(instrument: Union[None, Callable[[OperationRecord], Any]] = None) -> Callable[[OperationRecord], Any]:
+    """
+    Records every read and write made through fastfs. Each operation produces an OperationRecord with the operation
+    name, resolved path, bytes moved, the time spent opening the file, in read/write calls and decoding/encoding,
+    and the exception raised if any. While no instrument is enabled, operations are not recorded at all.
+
+    Args:
+        instrument: A callable taking an OperationRecord, such as fastfs.instrumentation.ChromeTraceExporter.
+                    If not provided, a new HistogramAggregator is enabled. Several instruments can be enabled.
+
+    Returns:
+        Callable[[OperationRecord], Any]: The enabled instrument.
+    """
+    return fast_file_manager.enable_instrumentation(instrument)
+
+
+def disable_instrumentation(instrument: Union[None, Callable[[OperationRecord], Any]] = None):
+    """
+    Stops calling an instrument.
+
+    Args:
+        instrument: The instrument to disable. If not provided, all instruments are disabled.
+    """
+    fast_file_manager.disable_instrumentation(instrument)
+
+
+def set_write_options(atomic: Union[None, bool] = None, durability: Union[None, str, Durability] = None):
+    """
+    Configures how fastfs writes files. Options that are not provided keep their current value.
+
+    Args:
+        atomic: If True, files are written to a temporary file in the same directory and then renamed over the
+                destination, so a crash mid-write never leaves a truncated or partially written file.
+        durability: 'none' leaves flushing to the OS, 'file' fdatasyncs each written file, and 'full' also fsyncs
+                    the containing directory so the rename/new file itself survives a power loss.
+    """
+    fast_file_manager.set_write_options(atomic=atomic, durability=durability)
+
+
+def set_json_backend(backend: str = 'auto'):
+    """
+    Sets the library used to encode and decode JSON by read_json, write_json and the JSON Lines functions.
+    Individual calls can still pick another one with their backend argument.
+
+    Args:
+        backend: 'auto' (the default) uses the fastest installed library, in order: orjson, ujson, simdjson and
+                 the stdlib json module. Any of them can be chosen by name, or a backend added with
+                 fastfs.json_backends.register_json_backend. 'auto' falls back to the stdlib for data the
+                 faster library can't handle.
+
+    Raises:
+        MissingDependencyError: If the library of the backend is not installed.
+        ValueError: If there is no backend with that name.
+    """
+    fast_file_manager.set_json_backend(backend)
+
+
+def get_json_backend() -> str:
+    """
+    Returns the name of the JSON library in use, e.g. 'orjson' when the backend is 'auto' and orjson is installed.
+    """
+    return fast_file_manager.json_backend.name
+
+
+def write_batch() -> ContextManager[WriteBatch]:
+    """
+    Groups writes so that each directory is fsynced once when the block exits, instead of once per file.
+    Only relevant with durability='full'. bulk_write_directory always batches its writes.
+
+    Example:
+        with write_batch():
+            for idx, item in enumerate(items):
+                write_json(f'out/{idx}.json', item)
+    """
+    return fast_file_manager.write_batch()
+
+
+def enable_listing_index(persist: bool = True) -> ListingIndexes:
+    """
+    Enables directory listing indexes for ls, sorted_ls, bulk_read_directory and iter_directory.
+
+    Each listed directory keeps an index of its file names, sizes, modification times, extensions and parsed
+    numeric sort keys. While the directory's modification time is unchanged, listing and sorting are served from
+    the index without touching the files. When it changes, only new files are stat'ed. Writes and deletes made
+    through fastfs update the index directly.
+
+    Args:
+        persist: If True, indexes are stored under ~/.cache/fastfs and reused by later processes.
+                 Changes are saved when the index is rebuilt, by save_listing_indexes() and at exit.
+
+    Returns:
+        ListingIndexes: The indexes of all listed directories.
+    """
+    return fast_file_manager.enable_listing_index(persist=persist)
+
+
+def disable_listing_index():
+    """
+    Saves and disables the directory listing indexes.
+    """
+    fast_file_manager.disable_listing_index()
+
+
+def save_listing_indexes():
+    """
+    Writes changed directory listing indexes to disk.
+    """
+    fast_file_manager.save_listing_indexes()
@@ -27,7 +27,13 @@ fastfs is the missing piece in Python's file management ecosystem, designed to a
         'pandas': ['pandas>=0.20.0'],
         'h5py': ['h5py>=2.5.0'],
         'PyYAML': ['PyYAML>=3.11'],
-        'full': ['pandas>=0.20.0', 'h5py>=2.5.0', 'PyYAML>=3.11']
+        'numpy': ['numpy>=1.17.0'],
+        'orjson': ['orjson>=3.0.0'],
+        'xxhash': ['xxhash>=3.0.0'],
+        'pyarrow': ['pyarrow>=7.0.0'],
+        'tables': ['tables>=3.6.0'],
+        'full': ['pandas>=0.20.0', 'h5py>=2.5.0', 'PyYAML>=3.11', 'numpy>=1.17.0', 'orjson>=3.0.0', 'xxhash>=3.0.0',
+                 'pyarrow>=7.0.0', 'tables>=3.6.0']
     }
 
 
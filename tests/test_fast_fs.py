@@ -1,8 +1,15 @@
 import os
 import unittest
+from contextlib import contextmanager
 from fastfs import write_pickle, read_pickle, write_json, read_json, write_lines, read_lines, write_csv, read_csv, write_file, read_file, write_ini, read_ini
+from fastfs import write_binary, read_binary, map_binary, read_binary_into, iter_csv
 
 import shutil
+from unittest.mock import patch
+from fastfs.utils import set_write_options, write_batch
+from fastfs.exceptions import FileWriteError
+from fastfs.compression import open_file
+from fastfs.durability import default_file_mode
 
 class FastFSTests(unittest.TestCase):
 
@@ -23,6 +30,7 @@ class FastFSTests(unittest.TestCase):
         self.csv_path = self._get_path('test.csv')
         self.file_path = self._get_path('test.txt')
         self.ini_path = self._get_path('test.ini')
+        self.bin_path = self._get_path('test.bin')
 
     def tearDown(self):
     
@@ -118,6 +126,130 @@ class FastFSTests(unittest.TestCase):
 
         self.assertEqual(data, read_data)
 
+    def test_atomic_write_keeps_old_file_on_failure(self):
+        set_write_options(atomic=True)
+
+        try:
+            write_json(self.json_path, self.test_data)
+
+            with self.assertRaises(FileWriteError):
+                write_json(self.json_path, {'bad': object()})
+
+            # The previous contents are intact and no temporary file is left behind
+            self.assertEqual(read_json(self.json_path), self.test_data)
+            self.assertEqual(os.listdir(self.test_dir), ['test.json'])
+        finally:
+            set_write_options(atomic=False)
+
+    def test_durable_writes_batch_directory_sync(self):
+        set_write_options(atomic=True, durability='full')
+
+        try:
+            # The manager syncs single writes through its own import, the batch through fastfs.durability
+            with patch('fastfs.durability.sync_directory') as batch_sync, \
+                    patch('fastfs.file_managers.base_file_manager.sync_directory') as write_sync:
+                with write_batch():
+                    for idx in range(5):
+                        write_pickle(self._get_path(f'{idx}.pkl'), idx)
+
+                # One directory fsync for the whole batch, none per write
+                batch_sync.assert_called_once_with(self.test_dir)
+                write_sync.assert_not_called()
+
+                write_pickle(self._get_path('single.pkl'), 5)
+
+                write_sync.assert_called_once_with(self.test_dir)
+
+            self.assertEqual(read_pickle(self._get_path('4.pkl')), 4)
+        finally:
+            set_write_options(atomic=False, durability='none')
+
+    @unittest.skipIf(os.name == 'nt', 'umask only applies to POSIX permissions')
+    def test_default_file_mode_keeps_umask(self):
+        umask = os.umask(0o027)
+
+        try:
+            with patch('fastfs.durability._umask', None):
+                self.assertEqual(default_file_mode(), 0o640)
+
+            # Reading it must not change it
+            self.assertEqual(os.umask(0o027), 0o027)
+        finally:
+            os.umask(umask)
+
+    def test_binary_write_and_read(self):
+        data = bytes(range(256)) * 10
+
+        write_binary(self.bin_path, data)
+
+        self.assertEqual(read_binary(self.bin_path), data)
+
+        # Memory-mapped reads return a read-only view of the same bytes
+        with read_binary(self.bin_path, mmap=True) as view:
+            self.assertTrue(view.readonly)
+            self.assertEqual(view[10:20], data[10:20])
+
+        with map_binary(self.bin_path) as view:
+            self.assertEqual(bytes(view), data)
+
+    def test_binary_read_into(self):
+        data = b'0123456789'
+        write_binary(self.bin_path, data)
+
+        buffer = bytearray(4)
+
+        self.assertEqual(read_binary_into(self.bin_path, buffer), 4)
+        self.assertEqual(buffer, b'0123')
+
+        self.assertEqual(read_binary_into(self.bin_path, buffer, offset=8), 2)
+        self.assertEqual(buffer[:2], b'89')
+
+    def test_iter_csv_batches(self):
+        headers = ['Name', 'Age', 'Occupation']
+        data_lists = [[f'Person {idx}', str(idx), 'Engineer'] for idx in range(10)]
+
+        write_csv(self.csv_path, data_lists, header=headers)
+
+        batches = list(iter_csv(self.csv_path, batch_size=4))
+
+        self.assertEqual([len(rows) for _, rows in batches], [4, 4, 2])
+        self.assertEqual(batches[0][0], headers)
+        self.assertEqual([row for _, rows in batches for row in rows], data_lists)
+
+    def test_iter_csv_usecols_as_dicts(self):
+        data_dicts = [{'Name': 'Alice', 'Age': '30', 'Occupation': 'Engineer'},
+                      {'Name': 'Bob', 'Age': '40', 'Occupation': 'Doctor'}]
+
+        write_csv(self.csv_path, data_dicts)
+
+        handles = []
+
+        @contextmanager
+        def tracking_open_file(*args, **kwargs):
+            with open_file(*args, **kwargs) as file:
+                handles.append(file)
+                yield file
+
+        with patch('fastfs.file_managers.base_file_manager.open_file', side_effect=tracking_open_file):
+            batches = iter_csv(self.csv_path, batch_size=1, as_dicts=True, usecols=['Age', 'Name'])
+
+            self.assertEqual(next(batches), [{'Age': '30', 'Name': 'Alice'}])
+            self.assertFalse(handles[0].closed)
+
+            # Stopping early closes the file
+            batches.close()
+
+        self.assertTrue(handles[0].closed)
+
+    def test_iter_csv_skips_blank_lines(self):
+        with open(self.csv_path, 'w') as file:
+            file.write('Name,Age\nAlice,30\n\nBob,40\n\n')
+
+        self.assertEqual([row for batch in iter_csv(self.csv_path, as_dicts=True) for row in batch],
+                         [{'Name': 'Alice', 'Age': '30'}, {'Name': 'Bob', 'Age': '40'}])
+        self.assertEqual([row for _, rows in iter_csv(self.csv_path, usecols=['Age']) for row in rows],
+                         [['30'], ['40']])
+
 
 if __name__ == "__main__":
 
@@ -0,0 +1,76 @@
+import os
+import unittest
+import shutil
+from fastfs import aio
+from fastfs.utils import bulk_write_directory
+from fastfs.exceptions import FileNotFound
+
+
+class TestFastFsAio(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.test_dir = os.path.join(os.getcwd(), 'test_aio_dir')
+
+        os.mkdir(self.test_dir)
+
+        self.json_path = os.path.join(self.test_dir, 'test.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    async def test_json_write_and_read(self):
+        await aio.write_json(self.json_path, {'test': 'aio'})
+
+        self.assertTrue(await aio.file_exists(self.json_path))
+        self.assertEqual(await aio.read_json(self.json_path), {'test': 'aio'})
+
+    async def test_write_and_read_many(self):
+        files = [(os.path.join(self.test_dir, f'{idx}.json'), {'idx': idx})
+                 for idx in range(50)]
+
+        await aio.write_many(files, limit=8)
+
+        data = await aio.read_many([file_name for file_name, _ in files], limit=8)
+
+        self.assertEqual(data, [file_data for _, file_data in files])
+
+    async def test_read_many_return_exceptions(self):
+        missing = os.path.join(self.test_dir, 'missing.json')
+
+        await aio.write_json(self.json_path, [1])
+
+        data = await aio.read_many([self.json_path, missing], return_exceptions=True)
+
+        self.assertEqual(data[0], [1])
+        self.assertIsInstance(data[1], FileNotFound)
+
+        with self.assertRaises(FileNotFound):
+            await aio.read_many([missing])
+
+    async def test_concurrency_limit(self):
+        manager = aio.AsyncFileManager(max_workers=4, max_concurrency=2)
+
+        try:
+            results = await manager.gather(pow, [(idx, 2) for idx in range(10)])
+            self.assertEqual(results, [idx ** 2 for idx in range(10)])
+        finally:
+            manager.shutdown()
+
+    async def test_iter_directory(self):
+        bulk_write_directory(self.test_dir, [1, 2, 3], 'json')
+
+        items = [item async for item in aio.iter_directory(self.test_dir, prefetch=2)]
+
+        self.assertEqual(items, [('0.json', 1), ('1.json', 2), ('2.json', 3)])
+
+    async def test_open_line_writer(self):
+        lines_path = os.path.join(self.test_dir, 'log.txt')
+
+        with await aio.open_line_writer(lines_path) as writer:
+            writer.write_lines(['a', 'b'])
+
+        self.assertEqual(await aio.read_lines(lines_path), ['a', 'b'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import os
+import unittest
+import shutil
+import contextlib
+import io
+from fastfs.bench import run_benchmarks, compare_results, save_results, load_results
+from fastfs.bench.__main__ import main
+
+
+class TestFastFsBench(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = os.path.join(os.getcwd(), 'test_bench_dir')
+
+        os.mkdir(self.test_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def run_small(self, **kwargs):
+        return run_benchmarks(names=['_json', 'ls'], payloads=['small'], directories=[20],
+                              min_time=0, min_calls=1, **kwargs)
+
+    def test_run_benchmarks(self):
+        results = self.run_small()
+
+        # Names are matched by substring, so other JSON cases run as well
+        self.assertLessEqual({'write_json[small]', 'read_json[small]', 'ls[20]', 'sorted_ls[20]'},
+                             set(results['results']))
+        self.assertTrue(all('_json' in name or 'ls' in name for name in results['results']))
+
+        result = results['results']['read_json[small]']
+
+        for metric in ('ops_per_second', 'mb_per_second', 'latency_p50_ms', 'latency_p99_ms', 'peak_memory_bytes'):
+            self.assertGreater(result[metric], 0)
+
+        self.assertEqual(results['results']['ls[20]']['size'], 20)
+
+    def test_save_and_compare(self):
+        results_path = os.path.join(self.test_dir, 'results.json')
+
+        baseline = self.run_small(memory=False)
+        save_results(baseline, results_path)
+        baseline = load_results(results_path)
+
+        self.assertFalse(any(comparison['regression']
+                             for comparison in compare_results(baseline, baseline)))
+
+        # Twice as slow
+        current = load_results(results_path)
+        for result in current['results'].values():
+            result['ops_per_second'] /= 2
+            result['latency_p50_ms'] *= 2
+
+        regressions = [comparison for comparison in compare_results(baseline, current, threshold=0.25)
+                       if comparison['regression']]
+
+        self.assertEqual(len(regressions), 2 * len(current['results']))
+        self.assertAlmostEqual(regressions[0]['change'], -0.5)
+
+    def test_command_line(self):
+        results_path = os.path.join(self.test_dir, 'results.json')
+        args = ['run', '--filter', 'write_json', '--payloads', 'small', '--min-time', '0', '--no-memory']
+
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            self.assertEqual(main(args + ['--output', results_path]), 0)
+            self.assertEqual(main(['compare', results_path, results_path]), 0)
+
+        self.assertIn('write_json[small]', load_results(results_path)['results'])
+
+    def test_unknown_profile(self):
+        with self.assertRaises(ValueError):
+            run_benchmarks(profile='huge')
+
+
+if __name__ == '__main__':
+    unittest.main()
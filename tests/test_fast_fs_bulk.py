@@ -0,0 +1,97 @@
+import os
+import unittest
+import shutil
+from fastfs.utils import bulk_write_directory, bulk_read_directory, iter_directory
+from fastfs.exceptions import BulkReadDirectoryError, FileWriteError
+
+
+class TestFastFsBulk(unittest.TestCase):
+
+    def setUp(self):
+        # Setup a test directory in the current directory
+        self.test_dir = os.path.join(os.getcwd(), 'test_bulk_dir')
+
+        self.test_data = [{'idx': idx, 'value': str(idx) * 3}
+                          for idx in range(25)]
+
+    def tearDown(self):
+        # Delete the test directory after running the tests
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_bulk_read_directory_sequential(self):
+        bulk_write_directory(self.test_dir, self.test_data, 'json')
+
+        self.assertEqual(bulk_read_directory(self.test_dir), self.test_data)
+
+    def test_bulk_read_directory_threads(self):
+        bulk_write_directory(self.test_dir, self.test_data, 'json')
+
+        data = bulk_read_directory(self.test_dir, workers=4, executor='thread')
+
+        self.assertEqual(data, self.test_data)
+
+    def test_bulk_read_directory_processes(self):
+        bulk_write_directory(self.test_dir, self.test_data, 'json')
+
+        data = bulk_read_directory(
+            self.test_dir, workers=2, executor='process', include_file_names=True)
+
+        # Same order and dict shape as the sequential read
+        self.assertEqual(list(data.keys()), [f'{idx}.json' for idx in range(25)])
+        self.assertEqual(list(data.values()), self.test_data)
+
+    def test_bulk_read_directory_collects_errors(self):
+        bulk_write_directory(self.test_dir, self.test_data, 'json')
+
+        with open(os.path.join(self.test_dir, '3.json'), 'w') as f:
+            f.write('{not json')
+
+        with self.assertRaises(BulkReadDirectoryError) as context:
+            bulk_read_directory(self.test_dir, workers=4)
+
+        # The failing file doesn't stop the rest of the batch
+        self.assertEqual(list(context.exception.errors.keys()), ['3.json'])
+        self.assertEqual(len(context.exception.data), 24)
+
+    def test_bulk_write_directory_naming(self):
+        bulk_write_directory(self.test_dir, [1, 2], 'pickle', file_prefix='item')
+
+        self.assertEqual(sorted(os.listdir(self.test_dir)),
+                         ['0-item.pickle', '1-item.pickle'])
+
+    def test_bulk_write_directory_parallel(self):
+        stats = bulk_write_directory(
+            self.test_dir, self.test_data, 'pickle', workers=4, serialize_workers=2, queue_size=4)
+
+        self.assertEqual(stats['files'], len(self.test_data))
+        self.assertGreater(stats['bytes'], 0)
+        self.assertGreater(stats['files_per_second'], 0)
+        self.assertIn('mb_per_second', stats)
+
+        self.assertEqual(bulk_read_directory(self.test_dir), self.test_data)
+
+    def test_bulk_write_directory_invalid_data(self):
+        with self.assertRaises(FileWriteError):
+            bulk_write_directory(self.test_dir, [{'a': 1}, {'b': object()}], 'json', workers=2)
+
+    def test_iter_directory(self):
+        bulk_write_directory(self.test_dir, self.test_data, 'json')
+
+        items = list(iter_directory(self.test_dir, prefetch=4))
+
+        self.assertEqual([file_name for file_name, _ in items],
+                         [f'{idx}.json' for idx in range(25)])
+        self.assertEqual([file_data for _, file_data in items], self.test_data)
+
+    def test_iter_directory_early_stop(self):
+        bulk_write_directory(self.test_dir, self.test_data, 'json')
+
+        files = iter_directory(self.test_dir, sort_reverse=True, prefetch=2)
+
+        self.assertEqual(next(files), ('24.json', self.test_data[24]))
+        files.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
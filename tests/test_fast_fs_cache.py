@@ -0,0 +1,141 @@
+import os
+import importlib.util
+import unittest
+import shutil
+from types import MappingProxyType
+from fastfs import write_json, read_json, write_pickle, read_pickle
+from fastfs.utils import enable_read_cache, disable_read_cache, invalidate_read_cache
+
+
+HAS_NUMPY = importlib.util.find_spec('numpy') is not None
+
+
+class TestFastFsReadCache(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = os.path.join(os.getcwd(), 'test_cache_dir')
+
+        os.mkdir(self.test_dir)
+
+        self.json_path = os.path.join(self.test_dir, 'test.json')
+        self.pickle_path = os.path.join(self.test_dir, 'test.pkl')
+
+    def tearDown(self):
+        disable_read_cache()
+
+        shutil.rmtree(self.test_dir)
+
+    def test_cache_hits_and_copies(self):
+        cache = enable_read_cache()
+
+        write_json(self.json_path, {'a': [1, 2]})
+
+        first = read_json(self.json_path)
+        first['a'].append(3)
+
+        # The cached object must not be affected by the caller's changes
+        self.assertEqual(read_json(self.json_path), {'a': [1, 2]})
+        self.assertEqual(cache.stats()['misses'], 1)
+        self.assertEqual(cache.stats()['hits'], 1)
+
+    def test_cache_read_only_views(self):
+        enable_read_cache(return_mode='view')
+
+        write_json(self.json_path, {'a': [1, 2]})
+
+        data = read_json(self.json_path)
+
+        self.assertIsInstance(data, MappingProxyType)
+        self.assertEqual(data['a'], (1, 2))
+        self.assertIs(read_json(self.json_path), data)
+
+    @unittest.skipUnless(HAS_NUMPY, 'requires numpy')
+    def test_cache_view_arrays_are_read_only(self):
+        import numpy as np
+
+        enable_read_cache(return_mode='view')
+
+        write_pickle(self.pickle_path, {'weights': np.arange(10)})
+
+        for _ in range(2):
+            weights = read_pickle(self.pickle_path)['weights']
+
+            with self.assertRaises(ValueError):
+                weights[0] = 42
+
+            # Not even through the array the view was taken from
+            if weights.base is not None:
+                with self.assertRaises(ValueError):
+                    weights.base[0] = 42
+
+        self.assertEqual(read_pickle(self.pickle_path)['weights'][0], 0)
+
+    def test_cache_view_copies_unknown_objects(self):
+        cache = enable_read_cache(return_mode='view')
+
+        write_pickle(self.pickle_path, {'items': bytearray(b'abc')})
+
+        read_pickle(self.pickle_path)['items'][0] = ord('x')
+
+        # Objects the cache can't make read-only are handed out as copies
+        self.assertEqual(read_pickle(self.pickle_path)['items'], bytearray(b'abc'))
+        self.assertEqual(cache.stats()['hits'], 1)
+
+    def test_write_invalidates(self):
+        cache = enable_read_cache()
+
+        write_pickle(self.pickle_path, [1])
+        self.assertEqual(read_pickle(self.pickle_path), [1])
+
+        write_pickle(self.pickle_path, [2])
+        self.assertEqual(read_pickle(self.pickle_path), [2])
+        self.assertEqual(cache.stats()['hits'], 0)
+
+    def test_external_change_detected(self):
+        enable_read_cache()
+
+        write_json(self.json_path, [1])
+        read_json(self.json_path)
+
+        with open(self.json_path, 'w') as f:
+            f.write('[1, 2, 3]')
+
+        self.assertEqual(read_json(self.json_path), [1, 2, 3])
+
+    def test_lru_eviction_by_size(self):
+        cache = enable_read_cache(max_bytes=4096)
+
+        for idx in range(10):
+            path = os.path.join(self.test_dir, f'{idx}.json')
+            write_json(path, list(range(500)))
+            read_json(path)
+
+        stats = cache.stats()
+        self.assertGreater(stats['evictions'], 0)
+        self.assertLessEqual(stats['bytes'], 4096)
+
+    def test_lru_eviction_by_size_in_view_mode(self):
+        cache = enable_read_cache(max_bytes=100000, return_mode='view')
+
+        for idx in range(20):
+            path = os.path.join(self.test_dir, f'{idx}.json')
+            write_json(path, {f'key-{key}': f'value-{key}' for key in range(200)})
+            read_json(path)
+
+        # Frozen dicts are sized with their contents, not as an empty mappingproxy
+        stats = cache.stats()
+        self.assertGreater(stats['evictions'], 0)
+        self.assertLessEqual(stats['bytes'], 100000)
+
+    def test_explicit_invalidate(self):
+        cache = enable_read_cache()
+
+        write_json(self.json_path, [1])
+        read_json(self.json_path)
+
+        invalidate_read_cache(self.json_path)
+        self.assertEqual(cache.stats()['entries'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+import os
+import gzip
+import importlib.util
+import unittest
+import shutil
+from fastfs import write_json, read_json, write_csv, read_csv, iter_csv, write_pickle, read_pickle
+from fastfs import write_lines, read_lines, write_binary, read_binary, write_file, read_file
+from fastfs.utils import bulk_write_directory, bulk_read_directory, set_write_options, enable_read_cache, disable_read_cache
+
+
+CODECS = [('gzip', '.gz'), ('bz2', '.bz2'), ('xz', '.xz')]
+
+for name, module, extension in (('zstd', 'zstandard', '.zst'), ('lz4', 'lz4', '.lz4')):
+    if importlib.util.find_spec(module) is not None:
+        CODECS.append((name, extension))
+
+
+class TestFastFsCompression(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = os.path.join(os.getcwd(), 'test_compression_dir')
+
+        os.mkdir(self.test_dir)
+
+        self.data = {'rows': [{'id': idx, 'name': f'name-{idx}'} for idx in range(1000)]}
+
+    def tearDown(self):
+        set_write_options(atomic=False, durability='none')
+        disable_read_cache()
+
+        shutil.rmtree(self.test_dir)
+
+    def path(self, name):
+        return os.path.join(self.test_dir, name)
+
+    def test_codecs_by_extension(self):
+        for compression, extension in CODECS:
+            with self.subTest(compression=compression):
+                json_path = self.path('data.json' + extension)
+
+                write_json(json_path, self.data)
+
+                self.assertEqual(read_json(json_path), self.data)
+                self.assertLess(os.path.getsize(json_path), len(str(self.data)) / 3)
+
+                pickle_path = self.path('data.pickle' + extension)
+
+                write_pickle(pickle_path, self.data)
+                self.assertEqual(read_pickle(pickle_path), self.data)
+
+    def test_text_formats(self):
+        csv_path = self.path('data.csv.gz')
+        rows = [[str(idx), f'name-{idx}'] for idx in range(100)]
+
+        write_csv(csv_path, rows, header=['id', 'name'])
+
+        self.assertEqual(read_csv(csv_path), (['id', 'name'], rows))
+        self.assertEqual(sum(len(batch) for _, batch in iter_csv(csv_path, batch_size=30)), 100)
+
+        lines_path = self.path('data.txt.bz2')
+
+        write_lines(lines_path, ['a', 'b', 'c'])
+        self.assertEqual(read_lines(lines_path), ['a', 'b', 'c'])
+
+    def test_explicit_compression_and_level(self):
+        json_path = self.path('data.json')
+
+        write_json(json_path, self.data, compression='gzip', compression_level=1)
+
+        with gzip.open(json_path, 'rt', encoding='utf-8') as file:
+            self.assertIn('name-999', file.read())
+
+        self.assertEqual(read_json(json_path, compression='gz'), self.data)
+
+        # The extension can be overridden to store the file as-is
+        plain_path = self.path('plain.json.gz')
+        write_json(plain_path, self.data, compression=None)
+        self.assertEqual(read_json(plain_path, compression=None), self.data)
+
+        with self.assertRaises(ValueError):
+            write_json(json_path, self.data, compression='rar')
+
+    def test_binary(self):
+        binary_path = self.path('data.bin.xz')
+        payload = bytes(range(256)) * 100
+
+        write_binary(binary_path, payload, compression='infer')
+
+        self.assertEqual(read_binary(binary_path, compression='infer'), payload)
+        # Compressed files can't be mapped, they are decompressed into memory instead
+        self.assertEqual(bytes(read_binary(binary_path, mmap=True, compression='infer')), payload)
+
+    def test_raw_data_is_not_compressed_by_default(self):
+        gzip_path = self.path('archive.gz')
+        compressed = gzip.compress(b'payload')
+
+        # Already compressed bytes are stored and returned as they are
+        write_binary(gzip_path, compressed)
+
+        with open(gzip_path, 'rb') as file:
+            self.assertEqual(file.read(), compressed)
+
+        self.assertEqual(read_binary(gzip_path), compressed)
+        self.assertEqual(read_binary(gzip_path, compression='infer'), b'payload')
+
+        text_path = self.path('notes.txt.gz')
+        write_file(text_path, 'plain text')
+
+        self.assertEqual(read_file(text_path), 'plain text')
+
+    def test_atomic_durable_writes(self):
+        set_write_options(atomic=True, durability='full')
+
+        json_path = self.path('data.json.gz')
+
+        write_json(json_path, self.data)
+
+        self.assertEqual(read_json(json_path), self.data)
+        self.assertEqual(os.listdir(self.test_dir), ['data.json.gz'])
+
+    def test_read_cache(self):
+        cache = enable_read_cache()
+
+        json_path = self.path('data.json.gz')
+        write_json(json_path, self.data)
+
+        read_json(json_path)
+        read_json(json_path)
+
+        self.assertEqual(cache.stats()['hits'], 1)
+
+    def test_bulk_directory(self):
+        directory = self.path('bulk')
+        data = [{'idx': idx} for idx in range(12)]
+
+        bulk_write_directory(directory, data, 'json', compression='gzip', workers=2)
+
+        self.assertIn('11.json.gz', os.listdir(directory))
+        self.assertEqual(bulk_read_directory(directory), data)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import os
+import shutil
+import importlib.util
+import unittest
+from fastfs.exceptions import UnsupportedFileType
+from fastfs.extensions import write_dataframe, read_dataframe, iter_dataframe
+
+
+HAS_PANDAS = importlib.util.find_spec('pandas') is not None
+HAS_PYARROW = importlib.util.find_spec('pyarrow') is not None
+HAS_TABLES = importlib.util.find_spec('tables') is not None
+
+
+@unittest.skipUnless(HAS_PANDAS, 'requires pandas')
+class TestFastFsDataframes(unittest.TestCase):
+
+    def setUp(self):
+        import pandas as pd
+
+        self.pd = pd
+        self.test_dir = os.path.join(os.getcwd(), 'test_dataframes_dir')
+
+        os.mkdir(self.test_dir)
+
+        self.df = pd.DataFrame({'id': range(1000), 'score': [idx * 0.5 for idx in range(1000)],
+                                'name': [f'user-{idx}' for idx in range(1000)],
+                                'created': pd.date_range('2020-01-01', periods=1000, freq='h')},
+                               index=pd.RangeIndex(5000, 6000, name='row'))
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.test_dir, name)
+
+    def check_round_trip(self, file_name: str, **kwargs):
+        write_dataframe(self.path(file_name), self.df, **kwargs)
+
+        # Binary formats keep the dtypes and the index
+        self.pd.testing.assert_frame_equal(read_dataframe(self.path(file_name)), self.df)
+        self.pd.testing.assert_frame_equal(read_dataframe(self.path(file_name), columns=['score', 'name']),
+                                           self.df[['score', 'name']])
+
+        chunks = list(iter_dataframe(self.path(file_name), chunk_size=300, columns=['id']))
+
+        self.assertEqual([len(chunk) for chunk in chunks], [300, 300, 300, 100])
+        self.pd.testing.assert_frame_equal(self.pd.concat(chunks), self.df[['id']])
+
+    def test_pickle(self):
+        self.check_round_trip('data.pkl')
+
+    @unittest.skipUnless(HAS_PYARROW, 'requires pyarrow')
+    def test_feather(self):
+        # Record batches of 128 rows are regrouped into chunks of 300
+        self.check_round_trip('data.feather', chunk_size=128)
+
+    @unittest.skipUnless(HAS_PYARROW, 'requires pyarrow')
+    def test_parquet(self):
+        self.check_round_trip('data.parquet', compression='zstd')
+
+    @unittest.skipUnless(HAS_PYARROW, 'requires pyarrow')
+    def test_parquet_row_groups(self):
+        write_dataframe(self.path('data.pq'), self.df, chunk_size=250)
+
+        second = read_dataframe(self.path('data.pq'), row_groups=[1], columns=['id'])
+
+        self.assertEqual(list(second['id']), list(range(250, 500)))
+        self.assertEqual(list(second.index), list(range(5250, 5500)))
+
+    @unittest.skipUnless(HAS_TABLES, 'requires tables')
+    def test_hdf5(self):
+        self.check_round_trip('data.h5')
+
+        write_dataframe(self.path('data.h5'), self.df, key='users', compression='zlib')
+
+        self.pd.testing.assert_frame_equal(read_dataframe(self.path('data.h5'), key='users'), self.df)
+
+    def test_csv(self):
+        write_dataframe(self.path('data.csv'), self.df, index=False)
+
+        self.assertEqual(list(read_dataframe(self.path('data.csv'), columns=['id'])['id']), list(range(1000)))
+        self.assertEqual(sum(map(len, iter_dataframe(self.path('data.csv'), chunk_size=400))), 1000)
+
+    def test_csv_compression(self):
+        write_dataframe(self.path('data.csv'), self.df, index=False, compression='gzip')
+
+        with open(self.path('data.csv'), 'rb') as file:
+            self.assertEqual(file.read(2), b'\x1f\x8b')
+
+        self.assertEqual(len(self.pd.read_csv(self.path('data.csv'), compression='gzip')), 1000)
+
+    def test_json(self):
+        write_dataframe(self.path('data.json'), self.df[['id', 'name']], index=False)
+
+        self.assertEqual(list(read_dataframe(self.path('data.json'))['name']), list(self.df['name']))
+
+    def test_unknown_extension_is_written_as_csv(self):
+        write_dataframe(self.path('data.backup.txt'), self.df, index=False)
+
+        self.assertFalse(os.path.exists(self.path('data.backup.txt')))
+        self.assertEqual(len(read_dataframe(self.path('data.backup.csv'))), 1000)
+
+        with self.assertRaises(UnsupportedFileType):
+            read_dataframe(self.path('data.backup.txt'))
+
+    def test_row_groups_need_parquet(self):
+        write_dataframe(self.path('data.pkl'), self.df)
+
+        with self.assertRaises(ValueError):
+            read_dataframe(self.path('data.pkl'), row_groups=[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,7 +4,7 @@ import pickle
 import unittest
 from unittest.mock import patch, ANY
 from fastfs import write_pickle
-from fastfs.utils import create_fs, get_fs_directory, touch_directory
+from fastfs.utils import create_fs, get_fs_directory, touch_directory, reload_config
 
 from fastfs.global_instance import fast_file_manager
 
@@ -128,6 +128,31 @@ class FastFSDirectoryTests(unittest.TestCase):
         # Delete the test directory
         shutil.rmtree(full_path)
 
+    def test_config_persists_between_processes(self):
+        # Simulate a new process that only has the .fastfs file
+        fast_file_manager._local_fs = None
+        fast_file_manager._fs_active = False
+
+        reload_config()
+
+        self.assertEqual(fast_file_manager._local_fs, self.fast_fs_dir)
+        self.assertTrue(fast_file_manager._fs_active)
+
+        write_pickle('test.pkl', [])
+
+        self.assertTrue(os.path.exists(
+            os.path.join(self.fast_fs_dir, 'test.pkl')))
+
+    def test_get_fs_directory_uses_snapshot(self):
+        get_fs_directory()
+
+        # The config is only parsed again once the file changes
+        with patch.object(fast_file_manager, 'read_ini', wraps=fast_file_manager.read_ini) as read_ini:
+            for _ in range(5):
+                self.assertEqual(get_fs_directory(), self.fast_fs_dir)
+
+            read_ini.assert_not_called()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -2,7 +2,8 @@ import os
 import unittest
 from typing import List
 import shutil
-from fastfs.extensions import write_dataframe, read_dataframe, write_hdf5, read_hdf5, write_yaml, read_yaml
+from fastfs import write_csv
+from fastfs.extensions import write_dataframe, read_dataframe, write_hdf5, read_hdf5, write_yaml, read_yaml, read_csv_columns
 
 
 try:
@@ -21,6 +22,11 @@ try:
 except ImportError:
     pd = None
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 
 class TestFastFsExtensions(unittest.TestCase):
 
@@ -33,6 +39,7 @@ class TestFastFsExtensions(unittest.TestCase):
         self.df_path = os.path.join(self.test_dir, 'pd_test.csv')
         self.h5_path = os.path.join(self.test_dir, 'test.hdf5')
         self.yaml_path = os.path.join(self.test_dir, 'test.yml')
+        self.csv_path = os.path.join(self.test_dir, 'test.csv')
 
     def tearDown(self):
         # Delete the test directory after running the tests
@@ -93,6 +100,66 @@ class TestFastFsExtensions(unittest.TestCase):
         # Compare the original data and the data read from file
         self.assertDictEqual(data, file_data)
 
+    def test_csv_columns_type_inference(self):
+
+        if np is None:
+            self.skipTest(
+                'numpy optional dependency is not installed. Skipping test...')
+
+        header = ['id', 'score', 'active', 'date', 'name', 'missing']
+        rows = [['1', '0.5', 'True', '2023-01-01', 'Alice', '1'],
+                ['2', '1.5', 'false', '2023-02-01', 'Bob', '']]
+
+        write_csv(self.csv_path, rows, header=header)
+
+        columns = read_csv_columns(self.csv_path)
+
+        self.assertEqual(list(columns.keys()), header)
+        self.assertEqual(columns['id'].dtype, np.int64)
+        self.assertEqual(columns['score'].dtype, np.float64)
+        self.assertEqual(columns['active'].tolist(), [True, False])
+        self.assertEqual(columns['date'].dtype.kind, 'M')
+        self.assertEqual(columns['name'].tolist(), ['Alice', 'Bob'])
+        self.assertTrue(np.isnan(columns['missing'][1]))
+
+    def test_csv_columns_dtypes_and_usecols(self):
+
+        if np is None:
+            self.skipTest(
+                'numpy optional dependency is not installed. Skipping test...')
+
+        write_csv(self.csv_path, [['1', 'x'], ['2', 'y']], header=['a', 'b'])
+
+        columns = read_csv_columns(self.csv_path, dtypes={'a': np.float32}, usecols=['a'])
+
+        self.assertEqual(list(columns.keys()), ['a'])
+        self.assertEqual(columns['a'].dtype, np.float32)
+
+    def test_csv_columns_blank_lines_and_no_rows(self):
+
+        if np is None:
+            self.skipTest(
+                'numpy optional dependency is not installed. Skipping test...')
+
+        with open(self.csv_path, 'w') as file:
+            file.write('a,b\n1,x\n\n2,y\n\n')
+
+        columns = read_csv_columns(self.csv_path)
+
+        # Blank lines are not rows of missing values, which would turn int columns into floats
+        self.assertEqual(columns['a'].dtype, np.int64)
+        self.assertEqual(columns['a'].tolist(), [1, 2])
+
+        with open(self.csv_path, 'w') as file:
+            file.write('a,b\n')
+
+        columns = read_csv_columns(self.csv_path, dtypes={'b': np.float32})
+
+        self.assertEqual(list(columns.keys()), ['a', 'b'])
+        self.assertEqual(len(columns['a']), 0)
+        self.assertEqual(columns['b'].dtype, np.float32)
+        self.assertEqual(list(read_csv_columns(self.csv_path, usecols=['b']).keys()), ['b'])
+
 
 if __name__ == '__main__':
     unittest.main()
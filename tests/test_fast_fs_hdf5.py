@@ -0,0 +1,136 @@
+import os
+import shutil
+import importlib.util
+import unittest
+from fastfs.exceptions import FileWriteError
+from fastfs.extensions import write_hdf5, append_hdf5, read_hdf5, list_hdf5_datasets, open_hdf5, iter_hdf5
+
+
+HAS_H5PY = importlib.util.find_spec('h5py') is not None
+
+
+@unittest.skipUnless(HAS_H5PY, 'requires h5py')
+class TestFastFsHdf5(unittest.TestCase):
+
+    def setUp(self):
+        import numpy as np
+
+        self.np = np
+        self.test_dir = os.path.join(os.getcwd(), 'test_hdf5_dir')
+
+        os.mkdir(self.test_dir)
+
+        self.file_path = os.path.join(self.test_dir, 'features.hdf5')
+        self.matrix = np.arange(10000, dtype=np.float32).reshape(1000, 10)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_multiple_datasets(self):
+        labels = self.np.arange(1000) % 3
+
+        write_hdf5(self.file_path, {'features/train': self.matrix, 'labels': labels})
+        write_hdf5(self.file_path, [1, 2, 3], dataset='extra', mode='a')
+
+        self.assertEqual(sorted(list_hdf5_datasets(self.file_path)), ['extra', 'features/train', 'labels'])
+        self.np.testing.assert_array_equal(read_hdf5(self.file_path, dataset='labels'), labels)
+
+        everything = read_hdf5(self.file_path, dataset=None)
+        self.np.testing.assert_array_equal(everything['features/train'], self.matrix)
+        self.np.testing.assert_array_equal(everything['extra'], [1, 2, 3])
+
+        with self.assertRaises(KeyError):
+            read_hdf5(self.file_path)
+
+    def test_sliced_reads(self):
+        write_hdf5(self.file_path, self.matrix, chunks=(100, 10))
+
+        self.np.testing.assert_array_equal(read_hdf5(self.file_path, slice=slice(200, 300)), self.matrix[200:300])
+        self.np.testing.assert_array_equal(read_hdf5(self.file_path, slice=self.np.s_[:, 3]), self.matrix[:, 3])
+        self.assertEqual(read_hdf5(self.file_path, slice=(5, 5)), self.matrix[5, 5])
+
+    def test_compression(self):
+        for compression, level in (('gzip', 4), ('lzf', None)):
+            with self.subTest(compression=compression):
+                write_hdf5(self.file_path, self.matrix, compression=compression, compression_level=level)
+
+                with open_hdf5(self.file_path) as handle:
+                    self.assertEqual(handle.compression, compression)
+                    self.assertTrue(handle.dataset.shuffle)
+                    self.assertIsNotNone(handle.chunks)
+
+                self.np.testing.assert_array_equal(read_hdf5(self.file_path), self.matrix)
+
+        with self.assertRaises(ValueError):
+            write_hdf5(self.file_path, self.matrix, compression='zstd')
+
+        with self.assertRaises(ValueError):
+            write_hdf5(self.file_path, self.matrix, compression='lzf', compression_level=3)
+
+    def test_append(self):
+        for start in range(0, 1000, 250):
+            rows = append_hdf5(self.file_path, self.matrix[start:start + 250], compression='gzip')
+
+        self.assertEqual(rows, 1000)
+        self.np.testing.assert_array_equal(read_hdf5(self.file_path), self.matrix)
+
+        with self.assertRaises(FileWriteError):
+            append_hdf5(self.file_path, self.np.zeros((5, 3)))
+
+        # Fixed-size datasets can't grow
+        write_hdf5(self.file_path, self.matrix)
+
+        with self.assertRaises(FileWriteError):
+            append_hdf5(self.file_path, self.matrix)
+
+        write_hdf5(self.file_path, self.matrix, resizable=True)
+        self.assertEqual(append_hdf5(self.file_path, self.matrix[:10]), 1010)
+
+    def test_lazy_handle(self):
+        write_hdf5(self.file_path, self.matrix, chunks=(64, 10))
+
+        with open_hdf5(self.file_path) as handle:
+            self.assertEqual(len(handle), 1000)
+            self.assertEqual(handle.shape, (1000, 10))
+            self.np.testing.assert_array_equal(handle[10:20], self.matrix[10:20])
+
+            blocks = list(handle.iter_rows())
+            self.assertTrue(all(len(block) % 64 == 0 for block in blocks[:-1]))
+            self.np.testing.assert_array_equal(self.np.concatenate(blocks), self.matrix)
+
+            with self.assertRaises(ValueError):
+                handle.append(self.matrix)
+
+        self.assertTrue(handle.closed)
+
+        with self.assertRaises(KeyError):
+            open_hdf5(self.file_path, dataset='missing')
+
+    def test_handle_appends(self):
+        append_hdf5(self.file_path, self.matrix[:100])
+
+        with open_hdf5(self.file_path, mode='a') as handle:
+            for start in range(100, 1000, 300):
+                handle.append(self.matrix[start:start + 300])
+
+            self.assertEqual(len(handle), 1000)
+
+        self.np.testing.assert_array_equal(read_hdf5(self.file_path), self.matrix)
+
+    def test_iter_hdf5(self):
+        write_hdf5(self.file_path, self.matrix)
+
+        blocks = list(iter_hdf5(self.file_path, rows=300, start=100))
+
+        self.assertEqual([len(block) for block in blocks], [300, 300, 300])
+        self.np.testing.assert_array_equal(self.np.concatenate(blocks), self.matrix[100:])
+
+        # Stopping early closes the file, so it can be rewritten
+        for block in iter_hdf5(self.file_path, rows=10):
+            break
+
+        del block
+        write_hdf5(self.file_path, self.matrix[:5])
+
+if __name__ == '__main__':
+    unittest.main()
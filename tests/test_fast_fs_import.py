@@ -0,0 +1,51 @@
+import os
+import subprocess
+import sys
+import unittest
+
+
+# Cumulative time `import fastfs` may take, in microseconds. Override with FASTFS_IMPORT_BUDGET_US on slow machines.
+IMPORT_BUDGET_US = int(os.environ.get('FASTFS_IMPORT_BUDGET_US', 150000))
+
+# Heavy modules that must only be imported once a feature needing them is used
+LAZY_MODULES = ('yaml', 'h5py', 'pandas', 'numpy',
+                'concurrent.futures', 'multiprocessing')
+
+
+def _import_times() -> dict:
+    # -X importtime reports "import time: self [us] | cumulative | module" for every module on stderr
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import fastfs'],
+                            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                            capture_output=True, text=True, check=True)
+
+    times = {}
+
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+
+        _, cumulative, module = line[len('import time:'):].split('|')
+        times[module.strip()] = int(cumulative)
+
+    return times
+
+
+class TestFastFsImportTime(unittest.TestCase):
+
+    def test_optional_dependencies_not_imported(self):
+        times = _import_times()
+
+        for module in LAZY_MODULES:
+            self.assertNotIn(module, times,
+                             f'{module} is imported by `import fastfs`')
+
+    def test_import_time_budget(self):
+        # Best of three runs, to smooth over noise from other processes
+        import_time = min(_import_times()['fastfs'] for _ in range(3))
+
+        self.assertLess(import_time, IMPORT_BUDGET_US,
+                        f'`import fastfs` took {import_time}us, the budget is {IMPORT_BUDGET_US}us')
+
+
+if __name__ == '__main__':
+    unittest.main()
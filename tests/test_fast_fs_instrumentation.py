@@ -0,0 +1,106 @@
+import os
+import json
+import unittest
+import shutil
+from fastfs import write_json, read_json, write_csv, iter_csv
+from fastfs.exceptions import FileNotFound
+from fastfs.instrumentation import ChromeTraceExporter, HistogramAggregator
+from fastfs.utils import enable_instrumentation, disable_instrumentation, enable_read_cache, disable_read_cache
+
+
+class TestFastFsInstrumentation(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = os.path.join(os.getcwd(), 'test_instrumentation_dir')
+
+        os.mkdir(self.test_dir)
+
+        self.json_path = os.path.join(self.test_dir, 'test.json')
+        self.records = []
+
+    def tearDown(self):
+        disable_instrumentation()
+        disable_read_cache()
+
+        shutil.rmtree(self.test_dir)
+
+    def test_read_and_write_records(self):
+        enable_instrumentation(self.records.append)
+
+        write_json(self.json_path, {'a': list(range(100))})
+        read_json(self.json_path)
+
+        write, read = self.records
+
+        self.assertEqual((write.operation, write.kind), ('write_json', 'write'))
+        self.assertEqual((read.operation, read.kind), ('read_json', 'read'))
+
+        for record in (write, read):
+            self.assertEqual(record.path, self.json_path)
+            self.assertEqual(record.bytes, os.path.getsize(self.json_path))
+            self.assertIsNone(record.error)
+            self.assertGreaterEqual(record.total_seconds,
+                                    record.open_seconds + record.io_seconds + record.codec_seconds)
+
+    def test_errors_are_recorded(self):
+        enable_instrumentation(self.records.append)
+
+        with self.assertRaises(FileNotFound):
+            read_json(os.path.join(self.test_dir, 'missing.json'))
+
+        self.assertIsInstance(self.records[0].error, FileNotFound)
+
+    def test_iterations_and_cache_hits(self):
+        write_csv(os.path.join(self.test_dir, 'test.csv'), [[idx] for idx in range(10)], header=['a'])
+        write_json(self.json_path, [1])
+
+        enable_instrumentation(self.records.append)
+        enable_read_cache()
+
+        batches = list(iter_csv(os.path.join(self.test_dir, 'test.csv'), batch_size=4))
+        read_json(self.json_path)
+        read_json(self.json_path)
+
+        self.assertEqual(len(batches), 3)
+        self.assertEqual([(record.operation, record.kind, record.cache_hit) for record in self.records],
+                         [('iter_csv', 'iter', False), ('read_json', 'read', False), ('read_json', 'read', True)])
+
+    def test_histogram_aggregator(self):
+        aggregator = enable_instrumentation()
+        self.assertIsInstance(aggregator, HistogramAggregator)
+
+        for idx in range(20):
+            write_json(self.json_path, {'idx': idx})
+            read_json(self.json_path)
+
+        summary = aggregator.summary()
+
+        self.assertEqual(summary['read_json']['count'], 20)
+        self.assertEqual(summary['write_json']['count'], 20)
+        self.assertLessEqual(summary['read_json']['p50_seconds'], summary['read_json']['max_seconds'])
+        self.assertEqual(len(aggregator.slowest()), 10)
+
+        disable_instrumentation(aggregator)
+        read_json(self.json_path)
+
+        self.assertEqual(aggregator.summary()['read_json']['count'], 20)
+
+    def test_chrome_trace(self):
+        exporter = enable_instrumentation(ChromeTraceExporter())
+
+        write_json(self.json_path, [1, 2, 3])
+        read_json(self.json_path)
+
+        trace_path = os.path.join(self.test_dir, 'trace.json')
+        exporter.save(trace_path)
+
+        with open(trace_path, 'r', encoding='utf-8') as file:
+            events = json.load(file)['traceEvents']
+
+        self.assertEqual([event['name'] for event in events], ['write_json', 'read_json'])
+        self.assertEqual(events[1]['ph'], 'X')
+        self.assertEqual(events[1]['args']['path'], self.json_path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+import os
+import json
+import math
+import importlib.util
+import unittest
+import shutil
+from fastfs import write_json, read_json, write_jsonl, read_jsonl
+from fastfs.exceptions import FileWriteError, InvalidFileDataError, MissingDependencyError
+from fastfs.json_backends import get_json_backend, register_json_backend, available_json_backends
+from fastfs.utils import set_json_backend, get_json_backend as get_manager_json_backend
+from fastfs.utils import enable_read_cache, disable_read_cache
+
+
+HAS_ORJSON = importlib.util.find_spec('orjson') is not None
+
+
+class TestFastFsJsonBackends(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = os.path.join(os.getcwd(), 'test_json_backends_dir')
+
+        os.mkdir(self.test_dir)
+
+        self.file_path = os.path.join(self.test_dir, 'data.json')
+        self.data = {'name': 'é/ü', 'values': [1, 2.5, None, True], 'nested': {'a': [{'b': 'c'}]}}
+
+    def tearDown(self):
+        set_json_backend('auto')
+        disable_read_cache()
+
+        shutil.rmtree(self.test_dir)
+
+    def test_backends_roundtrip(self):
+        for backend in available_json_backends():
+            with self.subTest(backend=backend):
+                write_json(self.file_path, self.data, backend=backend)
+
+                self.assertEqual(read_json(self.file_path, backend=backend), self.data)
+
+                # Every backend writes standard JSON
+                with open(self.file_path, encoding='utf-8') as file:
+                    self.assertEqual(json.load(file), self.data)
+
+    def test_auto(self):
+        expected = 'orjson' if HAS_ORJSON else get_json_backend('auto').name
+
+        self.assertEqual(get_manager_json_backend(), expected)
+        self.assertIn('json', available_json_backends())
+
+    @unittest.skipUnless(HAS_ORJSON, 'requires orjson')
+    def test_auto_falls_back_to_stdlib(self):
+        # orjson rejects integers beyond 64 bits and NaN in input, the stdlib doesn't
+        data = {'big': 12345678901234567890123, 'negative': -9999999999999999999, 1: 'int key'}
+
+        write_json(self.file_path, data)
+        loaded = read_json(self.file_path)
+
+        # orjson reads these as floats, which would still compare equal for powers of two
+        self.assertEqual(loaded, {'big': 12345678901234567890123, 'negative': -9999999999999999999, '1': 'int key'})
+        self.assertIs(type(loaded['big']), int)
+        self.assertIs(type(loaded['negative']), int)
+
+        with open(self.file_path, 'w') as file:
+            file.write('[NaN]')
+
+        self.assertTrue(math.isnan(read_json(self.file_path)[0]))
+
+        # An explicit backend does not fall back
+        with self.assertRaises(FileWriteError):
+            write_json(self.file_path, data, backend='orjson')
+
+        with self.assertRaises(InvalidFileDataError):
+            read_json(self.file_path, backend='orjson')
+
+    def test_auto_round_trips_non_finite_floats(self):
+        # orjson writes NaN and Infinity as null, the default backend must keep them like the stdlib
+        write_json(self.file_path, {'x': float('nan'), 'y': [float('inf'), -float('inf')], 'z': None})
+        data = read_json(self.file_path)
+
+        self.assertTrue(math.isnan(data['x']))
+        self.assertEqual(data['y'], [float('inf'), -float('inf')])
+        self.assertIsNone(data['z'])
+
+    def test_manager_backend(self):
+        calls = []
+
+        def dumps(obj):
+            calls.append('dumps')
+            return json.dumps(obj).encode('utf-8')
+
+        def loads(data):
+            calls.append('loads')
+            return json.loads(data)
+
+        register_json_backend('counting', dumps, loads)
+        set_json_backend('counting')
+
+        write_json(self.file_path, self.data)
+        self.assertEqual(read_json(self.file_path), self.data)
+
+        # A per-call backend overrides the manager's
+        read_json(self.file_path, backend='json')
+
+        self.assertEqual(calls, ['dumps', 'loads'])
+
+        write_jsonl(self.file_path, [self.data, self.data])
+        self.assertEqual(read_jsonl(self.file_path), [self.data, self.data])
+        self.assertEqual(len(calls), 6)
+
+    def test_unknown_and_missing_backends(self):
+        with self.assertRaises(ValueError):
+            set_json_backend('not-a-backend')
+
+        if importlib.util.find_spec('ujson') is None:
+            with self.assertRaises(MissingDependencyError):
+                set_json_backend('ujson')
+
+        self.assertEqual(get_json_backend('json').name, 'json')
+
+    def test_errors(self):
+        for backend in available_json_backends():
+            with self.subTest(backend=backend):
+                with self.assertRaises(FileWriteError):
+                    write_json(self.file_path, {'bad': object()}, backend=backend)
+
+                with open(self.file_path, 'w') as file:
+                    file.write('{"truncated": ')
+
+                with self.assertRaises(InvalidFileDataError):
+                    read_json(self.file_path, backend=backend)
+
+    def test_read_cache(self):
+        cache = enable_read_cache()
+
+        write_json(self.file_path, self.data)
+
+        read_json(self.file_path)
+        read_json(self.file_path, backend='json')
+
+        self.assertEqual(cache.stats()['hits'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import os
+import unittest
+import shutil
+from fastfs import write_jsonl, append_jsonl, iter_jsonl, read_jsonl
+from fastfs.exceptions import FileWriteError, InvalidFileDataError
+
+
+class TestFastFsJsonl(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = os.path.join(os.getcwd(), 'test_jsonl_dir')
+
+        os.mkdir(self.test_dir)
+
+        self.file_path = os.path.join(self.test_dir, 'events.jsonl')
+        self.records = [{'id': idx, 'name': f'name-{idx}', 'text': 'line\nbreak é'} for idx in range(100)]
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_write_and_read(self):
+        write_jsonl(self.file_path, iter(self.records), batch_size=7)
+
+        self.assertEqual(read_jsonl(self.file_path), self.records)
+        self.assertEqual(list(iter_jsonl(self.file_path, chunk_size=9)), self.records)
+
+        with open(self.file_path, 'rb') as file:
+            self.assertEqual(len(file.readlines()), 100)
+
+    def test_append(self):
+        append_jsonl(self.file_path, self.records[:10])
+        append_jsonl(self.file_path, self.records[10:], batch_size=3)
+        append_jsonl(self.file_path, [])
+
+        self.assertEqual(read_jsonl(self.file_path), self.records)
+
+    def test_append_invalid_record(self):
+        with self.assertRaises(FileWriteError):
+            append_jsonl(self.file_path, [{'ok': 1}, {'bad': object()}, {'ok': 2}], batch_size=1)
+
+        # Batches before the invalid record were written
+        self.assertEqual(read_jsonl(self.file_path), [{'ok': 1}])
+
+    def test_line_ranges(self):
+        write_jsonl(self.file_path, self.records)
+
+        self.assertEqual(read_jsonl(self.file_path, start=10, stop=20), self.records[10:20])
+        self.assertEqual(read_jsonl(self.file_path, start=95), self.records[95:])
+
+    def test_offsets(self):
+        write_jsonl(self.file_path, self.records)
+
+        offsets = [offset for offset, _ in iter_jsonl(self.file_path, with_offsets=True)]
+
+        self.assertEqual(read_jsonl(self.file_path, offsets=[offsets[50], offsets[3]]),
+                         [self.records[50], self.records[3]])
+
+        with self.assertRaises(InvalidFileDataError):
+            read_jsonl(self.file_path, offsets=[offsets[1] + 1])
+
+        with self.assertRaises(ValueError):
+            read_jsonl(self.file_path, start=1, offsets=[0])
+
+    def test_parallel_decode(self):
+        write_jsonl(self.file_path, self.records)
+
+        self.assertEqual(list(iter_jsonl(self.file_path, workers=2, chunk_size=10)), self.records)
+
+        pairs = list(iter_jsonl(self.file_path, workers=2, chunk_size=10, with_offsets=True))
+        self.assertEqual(pairs, list(iter_jsonl(self.file_path, with_offsets=True)))
+
+    def test_blank_and_invalid_lines(self):
+        with open(self.file_path, 'w') as file:
+            file.write('{"a": 1}\n\n{"a": 2}\nnot json\n')
+
+        iterator = iter_jsonl(self.file_path, chunk_size=1)
+
+        self.assertEqual([next(iterator), next(iterator)], [{'a': 1}, {'a': 2}])
+
+        with self.assertRaisesRegex(InvalidFileDataError, 'line 4'):
+            next(iterator)
+
+        self.assertEqual(read_jsonl(self.file_path, stop=3), [{'a': 1}, {'a': 2}])
+
+    def test_compressed(self):
+        gzip_path = self.file_path + '.gz'
+
+        append_jsonl(gzip_path, self.records[:50])
+        append_jsonl(gzip_path, self.records[50:])
+
+        self.assertEqual(list(iter_jsonl(gzip_path)), self.records)
+        self.assertEqual(read_jsonl(gzip_path, start=60, stop=61), [self.records[60]])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,196 @@
+import os
+import shutil
+import unittest
+import gc
+from fastfs import write_lines, append_lines, open_line_writer, read_lines, read_file
+from fastfs import iter_lines, tail_lines, count_lines, split_line_ranges
+from fastfs.exceptions import FileWriteError
+from fastfs import lines
+
+
+class TestFastFsLines(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = os.path.join(os.getcwd(), 'test_lines_dir')
+
+        os.mkdir(self.test_dir)
+
+        self.file_path = os.path.join(self.test_dir, 'lines.txt')
+        self.lines = [f'line {idx} é' for idx in range(1000)]
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_write_generator(self):
+        write_lines(self.file_path, (line for line in self.lines), buffer_size=100)
+
+        self.assertEqual(read_lines(self.file_path), self.lines)
+        self.assertEqual(read_file(self.file_path), '\n'.join(self.lines) + '\n')
+
+        write_lines(self.file_path, [])
+        self.assertEqual(read_file(self.file_path), '')
+
+    def test_append(self):
+        append_lines(self.file_path, self.lines[:10])
+        append_lines(self.file_path, iter(self.lines[10:]), buffer_size=1)
+
+        self.assertEqual(read_lines(self.file_path), self.lines)
+
+    def test_invalid_lines(self):
+        with self.assertRaises(FileWriteError):
+            write_lines(self.file_path, ['a', 1])
+
+    def test_line_writer(self):
+        write_lines(self.file_path, ['first'])
+
+        with open_line_writer(self.file_path, buffer_size=50) as writer:
+            for line in self.lines[:100]:
+                writer.write(line)
+
+            # Full chunks have reached the file, the rest is buffered until flush
+            self.assertLess(len(read_lines(self.file_path)), 101)
+
+            writer.flush()
+            self.assertEqual(read_lines(self.file_path), ['first'] + self.lines[:100])
+
+            writer.write_lines(self.lines[100:])
+
+        self.assertTrue(writer.closed)
+        self.assertEqual(read_lines(self.file_path), ['first'] + self.lines)
+
+        with self.assertRaises(ValueError):
+            writer.write('closed')
+
+        with open_line_writer(self.file_path, append=False) as writer:
+            writer.write('only')
+
+        self.assertEqual(read_lines(self.file_path), ['only'])
+
+    def test_compressed(self):
+        gzip_path = self.file_path + '.gz'
+
+        append_lines(gzip_path, self.lines[:500])
+
+        with open_line_writer(gzip_path) as writer:
+            writer.write_lines(self.lines[500:])
+
+        self.assertEqual(read_lines(gzip_path), self.lines)
+
+    def _open_fds(self):
+        return len(os.listdir('/proc/self/fd'))
+
+    def test_iter_lines(self):
+        with open(self.file_path, 'wb') as file:
+            file.write(b'a\r\nb\n\nc\rd\nlast')
+
+        self.assertEqual(list(iter_lines(self.file_path, chunk_size=2)), ['a\n', 'b\n', '\n', 'c\n', 'd\n', 'last'])
+        self.assertEqual(list(iter_lines(self.file_path, keepends=False)), ['a', 'b', '', 'c', 'd', 'last'])
+        self.assertEqual(list(iter_lines(self.file_path, binary=True, chunk_size=3)),
+                         [b'a\r\n', b'b\n', b'\n', b'c\rd\n', b'last'])
+
+        batches = list(iter_lines(self.file_path, chunk_size=4, keepends=False, batches=True))
+        self.assertEqual(batches, [['a'], ['b', ''], ['c', 'd'], ['last']])
+
+        write_lines(self.file_path, self.lines)
+
+        # Lines longer than the chunk size are reassembled
+        self.assertEqual(list(iter_lines(self.file_path, chunk_size=5, keepends=False)), self.lines)
+
+    @unittest.skipUnless(os.path.isdir('/proc/self/fd'), 'requires /proc')
+    def test_iter_lines_closes_early(self):
+        write_lines(self.file_path, self.lines)
+        open_fds = self._open_fds()
+
+        for line in iter_lines(self.file_path):
+            break
+
+        gc.collect()
+        self.assertEqual(self._open_fds(), open_fds)
+
+        lines = iter_lines(self.file_path)
+        next(lines)
+        lines.close()
+
+        self.assertEqual(self._open_fds(), open_fds)
+
+    def test_tail_lines(self):
+        write_lines(self.file_path, self.lines)
+
+        self.assertEqual(tail_lines(self.file_path), self.lines[-10:])
+        self.assertEqual(tail_lines(self.file_path, 1), self.lines[-1:])
+        self.assertEqual(tail_lines(self.file_path, 5000), self.lines)
+        self.assertEqual(tail_lines(self.file_path, 0), [])
+
+        with open(self.file_path, 'a') as file:
+            file.write('no newline')
+
+        self.assertEqual(tail_lines(self.file_path, 2), [self.lines[-1], 'no newline'])
+
+        # Small steps cross many chunk boundaries
+        with open(self.file_path, 'rb') as file:
+            self.assertEqual(lines.tail_lines(file, 300, chunk_size=7), self.lines[-299:] + ['no newline'])
+
+        gzip_path = self.file_path + '.gz'
+        write_lines(gzip_path, self.lines)
+        self.assertEqual(tail_lines(gzip_path, 3), self.lines[-3:])
+
+        write_lines(self.file_path, [])
+        self.assertEqual(tail_lines(self.file_path), [])
+
+    def test_tail_lines_crlf(self):
+        with open(self.file_path, 'wb') as file:
+            file.write(b'a\r\nb\r\nc\r\n')
+
+        self.assertEqual(tail_lines(self.file_path, 2), ['b', 'c'])
+        self.assertEqual(tail_lines(self.file_path, 5), list(iter_lines(self.file_path, keepends=False)))
+
+        # A chunk boundary between '\r' and '\n'
+        with open(self.file_path, 'rb') as file:
+            self.assertEqual(lines.tail_lines(file, 1, chunk_size=4), ['c'])
+            self.assertEqual(lines.tail_lines(file, 2, chunk_size=2), ['b', 'c'])
+
+    def test_count_lines(self):
+        write_lines(self.file_path, self.lines)
+        self.assertEqual(count_lines(self.file_path), 1000)
+
+        with open(self.file_path, 'a') as file:
+            file.write('no newline')
+
+        self.assertEqual(count_lines(self.file_path), 1001)
+
+        write_lines(self.file_path + '.gz', self.lines)
+        self.assertEqual(count_lines(self.file_path + '.gz'), 1000)
+
+        write_lines(self.file_path, [])
+        self.assertEqual(count_lines(self.file_path), 0)
+
+    def test_split_line_ranges(self):
+        write_lines(self.file_path, self.lines)
+        size = os.path.getsize(self.file_path)
+
+        for k in (1, 2, 3, 7, 5000):
+            with self.subTest(k=k):
+                ranges = split_line_ranges(self.file_path, k)
+
+                self.assertLessEqual(len(ranges), k)
+                self.assertEqual(ranges[0][0], 0)
+                self.assertEqual(ranges[-1][1], size)
+
+                collected = []
+
+                for start, end in ranges:
+                    collected.extend(iter_lines(self.file_path, start=start, end=end, keepends=False))
+
+                self.assertEqual(collected, self.lines)
+
+        with self.assertRaises(ValueError):
+            split_line_ranges(self.file_path, 0)
+
+        write_lines(self.file_path + '.gz', self.lines)
+
+        with self.assertRaises(ValueError):
+            split_line_ranges(self.file_path + '.gz', 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
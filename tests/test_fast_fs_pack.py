@@ -0,0 +1,162 @@
+import os
+import unittest
+import shutil
+from fastfs.exceptions import BulkReadDirectoryError, CorruptFileError, FileWriteError
+from fastfs.utils import write_pack, append_pack, open_pack, set_write_options
+from fastfs.utils import bulk_write_directory, bulk_read_directory, iter_directory
+
+
+class TestFastFsPack(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = os.path.join(os.getcwd(), 'test_pack_dir')
+
+        os.mkdir(self.test_dir)
+
+        self.pack_path = os.path.join(self.test_dir, 'data.pack')
+        self.data = [{'idx': idx, 'name': f'name-{idx}'} for idx in range(50)]
+
+    def tearDown(self):
+        set_write_options(atomic=False, durability='none')
+
+        shutil.rmtree(self.test_dir)
+
+    def test_roundtrip(self):
+        stats = write_pack(self.pack_path, self.data, 'json')
+
+        self.assertEqual(stats['items'], 50)
+
+        with open_pack(self.pack_path) as pack:
+            self.assertEqual(len(pack), 50)
+            self.assertEqual(list(pack), self.data)
+            self.assertEqual(pack[-1], self.data[-1])
+            self.assertEqual(pack.keys(), [None] * 50)
+
+            with self.assertRaises(IndexError):
+                pack[50]
+
+    def test_data_types(self):
+        write_pack(self.pack_path, [b'\x00\x01', b'\xff'], 'binary')
+        append_pack(self.pack_path, [{'a': (1, 2)}], 'pickle')
+        append_pack(self.pack_path, [[{'a': '1', 'b': '2'}]], 'csv')
+
+        with open_pack(self.pack_path) as pack:
+            self.assertEqual(pack[0], b'\x00\x01')
+            self.assertEqual(bytes(pack.view(1)), b'\xff')
+            self.assertEqual(pack[2], {'a': (1, 2)})
+            self.assertEqual(pack[3], (['a', 'b'], [['1', '2']]))
+
+    def test_append_and_keys(self):
+        append_pack(self.pack_path, self.data[:10], 'json', keys=[f'k{idx}' for idx in range(10)])
+        append_pack(self.pack_path, self.data[10:], 'json')
+        # Later batches win for repeated keys
+        append_pack(self.pack_path, [{'replaced': True}], 'json', keys=['k3'])
+
+        with open_pack(self.pack_path) as pack:
+            self.assertEqual(len(pack), 51)
+            self.assertEqual(pack['k9'], self.data[9])
+            self.assertEqual(pack['k3'], {'replaced': True})
+            self.assertIn('k0', pack)
+            self.assertIsNone(pack.get('missing'))
+
+            with self.assertRaises(KeyError):
+                pack['missing']
+
+        with self.assertRaises(ValueError):
+            append_pack(self.pack_path, self.data, 'json', keys=['too-few'])
+
+    def test_corrupt_pack(self):
+        write_pack(self.pack_path, self.data, 'json')
+
+        # A batch that was cut off while being appended
+        with open(self.pack_path, 'r+b') as file:
+            file.truncate(os.path.getsize(self.pack_path) - 3)
+
+        with self.assertRaises(CorruptFileError):
+            open_pack(self.pack_path)
+
+        with self.assertRaises(CorruptFileError):
+            append_pack(self.pack_path, self.data, 'json')
+
+        plain_path = os.path.join(self.test_dir, 'plain.txt')
+
+        with open(plain_path, 'w') as file:
+            file.write('not a pack')
+
+        with self.assertRaises(CorruptFileError):
+            open_pack(plain_path)
+
+    def test_failed_append(self):
+        write_pack(self.pack_path, self.data, 'json')
+        size = os.path.getsize(self.pack_path)
+
+        with self.assertRaises(FileWriteError):
+            append_pack(self.pack_path, [{'ok': 1}, {'bad': object()}], 'json')
+
+        # The partial batch is discarded
+        self.assertEqual(os.path.getsize(self.pack_path), size)
+
+        with open_pack(self.pack_path) as pack:
+            self.assertEqual(len(pack), 50)
+
+    def test_atomic_write(self):
+        set_write_options(atomic=True, durability='full')
+
+        write_pack(self.pack_path, self.data, 'pickle')
+        write_pack(self.pack_path, self.data[:5], 'pickle')
+
+        self.assertEqual(os.listdir(self.test_dir), ['data.pack'])
+
+        with open_pack(self.pack_path) as pack:
+            self.assertEqual(list(pack), self.data[:5])
+
+    def test_bulk_directory(self):
+        stats = bulk_write_directory(self.pack_path, self.data, 'json', pack=True)
+
+        self.assertEqual(stats['files'], 50)
+        self.assertTrue(os.path.isfile(self.pack_path))
+
+        self.assertEqual(bulk_read_directory(self.pack_path), self.data)
+        self.assertEqual(bulk_read_directory(self.pack_path, sort_by='numeric', sort_reverse=True), self.data[::-1])
+        self.assertEqual(bulk_read_directory(self.pack_path, include_file_names=True)['7.json'], self.data[7])
+        self.assertEqual([name for name, _ in iter_directory(self.pack_path)][:3], ['0.json', '1.json', '2.json'])
+
+        with self.assertRaises(ValueError):
+            bulk_write_directory(self.pack_path, self.data, 'json', pack=True, compression='gzip')
+
+    def test_bulk_read_names(self):
+        write_pack(self.pack_path, [{'a': 1}, {'a': 2}], 'json')
+        # A key equal to the position name of an item without a key
+        append_pack(self.pack_path, [{'a': 3}], 'json', keys=['0'])
+
+        items = bulk_read_directory(self.pack_path, include_file_names=True)
+
+        self.assertEqual(items, {'0_1': {'a': 1}, '1': {'a': 2}, '0': {'a': 3}})
+        self.assertEqual(dict(iter_directory(self.pack_path)), items)
+
+        # A repeated key refers to the newer item, the older one is no longer read
+        append_pack(self.pack_path, [{'a': 4}], 'json', keys=['0'])
+
+        self.assertEqual(bulk_read_directory(self.pack_path), [{'a': 1}, {'a': 2}, {'a': 4}])
+
+    def test_bulk_read_errors(self):
+        append_pack(self.pack_path, [b'not json'], 'binary')
+        append_pack(self.pack_path, self.data[:2], 'json')
+
+        # Corrupt the payload of the first JSON item
+        with open_pack(self.pack_path) as pack:
+            offset = pack._offsets[1]
+
+        with open(self.pack_path, 'r+b') as file:
+            file.seek(offset)
+            file.write(b'!')
+
+        with self.assertRaises(BulkReadDirectoryError) as context:
+            bulk_read_directory(self.pack_path)
+
+        self.assertEqual(set(context.exception.errors), {'1'})
+        self.assertEqual(context.exception.data, {'0': b'not json', '2': self.data[1]})
+
+
+if __name__ == '__main__':
+    unittest.main()
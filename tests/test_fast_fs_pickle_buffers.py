@@ -0,0 +1,105 @@
+import os
+import pickle
+import importlib.util
+import unittest
+import shutil
+from fastfs import write_pickle, read_pickle
+from fastfs.exceptions import CorruptFileError
+from fastfs.pickle_buffers import ALIGNMENT, MAGIC
+
+
+HAS_NUMPY = importlib.util.find_spec('numpy') is not None
+
+
+class TestFastFsPickleBuffers(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = os.path.join(os.getcwd(), 'test_pickle_buffers_dir')
+
+        os.mkdir(self.test_dir)
+
+        self.file_path = os.path.join(self.test_dir, 'data.pickle')
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_bytearrays(self):
+        data = {'large': bytearray(range(256)) * 1024, 'small': bytearray(b'abc'), 'bytes': b'x' * 100000}
+
+        write_pickle(self.file_path, data, out_of_band=True)
+
+        with open(self.file_path, 'rb') as file:
+            self.assertEqual(file.read(len(MAGIC)), MAGIC)
+
+        self.assertEqual(read_pickle(self.file_path), data)
+
+    @unittest.skipUnless(HAS_NUMPY, 'requires numpy')
+    def test_arrays_are_mapped(self):
+        import numpy as np
+
+        data = {'weights': np.arange(100000, dtype=np.float64), 'fortran': np.asfortranarray(np.ones((300, 200))),
+                'tiny': np.arange(3), 'epoch': 3}
+
+        write_pickle(self.file_path, data, out_of_band=True)
+        loaded = read_pickle(self.file_path, mmap=True)
+
+        for key in ('weights', 'fortran', 'tiny'):
+            np.testing.assert_array_equal(loaded[key], data[key])
+
+        self.assertTrue(loaded['fortran'].flags.f_contiguous)
+
+        # Large arrays are views of the file mapping, aligned for vectorized code
+        weights = loaded['weights']
+        self.assertFalse(weights.flags.owndata)
+        self.assertEqual(weights.ctypes.data % ALIGNMENT, 0)
+
+        # The mapping is copy-on-write
+        weights[0] = 42
+        self.assertEqual(read_pickle(self.file_path)['weights'][0], 0)
+
+    @unittest.skipUnless(HAS_NUMPY, 'requires numpy')
+    def test_arrays_outlive_the_file(self):
+        import numpy as np
+
+        write_pickle(self.file_path, {'weights': np.arange(1000000, dtype=np.float64)}, out_of_band=True)
+        weights = read_pickle(self.file_path)['weights']
+
+        # Truncates the file in place, which would crash the process if weights still mapped it
+        write_pickle(self.file_path, {'small': 1})
+
+        self.assertEqual(weights.sum(), 999999 * 1000000 / 2)
+        self.assertEqual(weights.ctypes.data % ALIGNMENT, 0)
+
+    @unittest.skipUnless(HAS_NUMPY, 'requires numpy')
+    def test_compressed(self):
+        import numpy as np
+
+        gzip_path = self.file_path + '.gz'
+        data = [np.arange(50000), np.zeros(50000)]
+
+        write_pickle(gzip_path, data, out_of_band=True)
+        loaded = read_pickle(gzip_path)
+
+        np.testing.assert_array_equal(loaded[0], data[0])
+        np.testing.assert_array_equal(loaded[1], data[1])
+
+    def test_plain_pickles_still_load(self):
+        for protocol in (0, 2, pickle.HIGHEST_PROTOCOL):
+            with self.subTest(protocol=protocol):
+                with open(self.file_path, 'wb') as file:
+                    pickle.dump({'value': 1.5}, file, protocol=protocol)
+
+                self.assertEqual(read_pickle(self.file_path), {'value': 1.5})
+
+    def test_truncated(self):
+        write_pickle(self.file_path, bytearray(200000), out_of_band=True)
+
+        with open(self.file_path, 'r+b') as file:
+            file.truncate(100000)
+
+        with self.assertRaises(CorruptFileError):
+            read_pickle(self.file_path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,153 @@
+import os
+import shutil
+import unittest
+from fastfs import write_json, write_csv, write_pickle, write_file, read_json, read_file
+from fastfs import digests
+from fastfs.digests import XATTR_NAME, sidecar_path
+from fastfs.global_instance import fast_file_manager
+from fastfs.exceptions import FileWriteError, InvalidFileDataError
+from fastfs.utils import ls, delete_file, get_directory_info, bulk_write_directory, bulk_read_directory, enable_read_cache, disable_read_cache
+
+
+class TestFastFsSkipUnchanged(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = os.path.join(os.getcwd(), 'test_skip_unchanged_dir')
+
+        os.mkdir(self.test_dir)
+
+        self.file_path = os.path.join(self.test_dir, 'data.json')
+        self.data = {'values': list(range(100)), 'name': 'é'}
+
+    def tearDown(self):
+        disable_read_cache()
+
+        shutil.rmtree(self.test_dir)
+
+    def test_skips_identical_data(self):
+        self.assertTrue(write_json(self.file_path, self.data, skip_if_unchanged=True))
+        mtime = os.stat(self.file_path).st_mtime_ns
+
+        self.assertFalse(write_json(self.file_path, self.data, skip_if_unchanged=True))
+        self.assertEqual(os.stat(self.file_path).st_mtime_ns, mtime)
+
+        self.assertTrue(write_json(self.file_path, {'other': 1}, skip_if_unchanged=True))
+        self.assertEqual(read_json(self.file_path), {'other': 1})
+
+    def test_plain_writes_return_true(self):
+        self.assertTrue(write_json(self.file_path, self.data))
+
+        # A file without a recorded digest is always written
+        self.assertTrue(write_json(self.file_path, self.data, skip_if_unchanged=True))
+
+    def test_external_changes_are_detected(self):
+        write_file(self.file_path, 'fastfs', skip_if_unchanged=True)
+
+        with open(self.file_path, 'w') as file:
+            file.write('edited elsewhere')
+
+        self.assertTrue(write_file(self.file_path, 'fastfs', skip_if_unchanged=True))
+        self.assertEqual(read_file(self.file_path), 'fastfs')
+
+        os.remove(self.file_path)
+
+        self.assertTrue(write_file(self.file_path, 'fastfs', skip_if_unchanged=True))
+
+    def test_text_and_compressed(self):
+        csv_path = os.path.join(self.test_dir, 'rows.csv')
+        rows = [{'a': '1', 'b': 'x\ny'}, {'a': '2', 'b': 'z'}]
+
+        self.assertTrue(write_csv(csv_path, rows, skip_if_unchanged=True))
+        self.assertFalse(write_csv(csv_path, rows, skip_if_unchanged=True))
+
+        with open(csv_path, 'rb') as file:
+            self.assertEqual(file.read().count(b'\r\n'), 3)
+
+        gzip_path = os.path.join(self.test_dir, 'data.pickle.gz')
+
+        self.assertTrue(write_pickle(gzip_path, self.data, skip_if_unchanged=True))
+        self.assertFalse(write_pickle(gzip_path, self.data, skip_if_unchanged=True))
+
+        # The same contents stored differently are rewritten
+        self.assertTrue(write_pickle(gzip_path, self.data, compression=None, skip_if_unchanged=True))
+
+    def test_digest_storage(self):
+        write_json(self.file_path, self.data, skip_if_unchanged=True)
+
+        if not os.path.exists(sidecar_path(self.file_path)):
+            self.assertTrue(os.getxattr(self.file_path, XATTR_NAME).startswith((b'xxh3_128:', b'blake2b:')))
+
+    def test_sidecar(self):
+        supports_xattr = digests._SUPPORTS_XATTR
+        digests._SUPPORTS_XATTR = False
+
+        try:
+            self.assertTrue(write_json(self.file_path, self.data, skip_if_unchanged=True))
+            self.assertFalse(write_json(self.file_path, self.data, skip_if_unchanged=True))
+        finally:
+            digests._SUPPORTS_XATTR = supports_xattr
+
+        self.assertTrue(os.path.isfile(sidecar_path(self.file_path)))
+
+        # Sidecars are hidden
+        self.assertEqual(ls(self.test_dir), ['data.json'])
+
+        info = get_directory_info(self.test_dir)
+
+        self.assertEqual(info['num_files'], 1)
+        self.assertEqual(info['extensions'], {'.json': 1})
+
+        # And deleted with their file
+        delete_file(self.file_path)
+
+        self.assertEqual(os.listdir(self.test_dir), [])
+
+    def test_serialization_errors(self):
+        # Raised like a normal write raises them, before anything is written
+        for skip_if_unchanged in (False, True):
+            with self.assertRaises(FileWriteError) as context:
+                write_json(self.file_path, {'bad': object()}, skip_if_unchanged=skip_if_unchanged)
+
+            self.assertIsInstance(context.exception.__cause__, InvalidFileDataError)
+
+    def test_appends_are_rejected(self):
+        with self.assertRaises(ValueError):
+            fast_file_manager.append_jsonl(self.file_path, [1], skip_if_unchanged=True)
+
+    def test_read_cache(self):
+        enable_read_cache()
+
+        write_json(self.file_path, self.data, skip_if_unchanged=True)
+        self.assertEqual(read_json(self.file_path), self.data)
+
+        write_json(self.file_path, {'new': True}, skip_if_unchanged=True)
+        self.assertEqual(read_json(self.file_path), {'new': True})
+
+    def test_bulk(self):
+        directory = os.path.join(self.test_dir, 'bulk')
+        items = [{'id': idx} for idx in range(20)]
+
+        stats = bulk_write_directory(directory, items, 'json', workers=4, skip_if_unchanged=True)
+        self.assertEqual(stats['files'], 20)
+        self.assertEqual(stats['skipped'], 0)
+        self.assertEqual(len(stats['rewritten']), 20)
+
+        items[3] = {'id': 'changed'}
+        items[17] = {'id': 'changed'}
+
+        stats = bulk_write_directory(directory, items, 'json', workers=4, skip_if_unchanged=True)
+        self.assertEqual(stats['rewritten'], [f'{directory}/3.json', f'{directory}/17.json'])
+        self.assertEqual(stats['skipped'], 18)
+        self.assertEqual(stats['files'], 2)
+
+        # Bulk and single writes serialize the same way, so they share digests
+        self.assertFalse(write_json(f'{directory}/3.json', items[3], skip_if_unchanged=True))
+
+        self.assertEqual(bulk_read_directory(directory, sort_by=lambda name: int(name.split('.')[0])), items)
+
+        with self.assertRaises(ValueError):
+            bulk_write_directory(directory + '.pack', items, 'json', pack=True, skip_if_unchanged=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,7 +2,10 @@ import os
 import unittest
 from typing import List
 import shutil
-from fastfs.utils import sorted_ls, ls, file_exists, touch_file, touch_directory, delete_file, delete_directory, create_fs
+from unittest.mock import patch
+from fastfs import write_json
+from fastfs.utils import sorted_ls, ls, file_exists, touch_file, touch_directory, delete_file, delete_directory, create_fs, get_directory_info
+from fastfs.utils import enable_listing_index, disable_listing_index, bulk_read_directory
 
 class TestFastFsUtils(unittest.TestCase):
 
@@ -76,6 +79,157 @@ class TestFastFsUtils(unittest.TestCase):
         touch_file(self.test_file)
         delete_file(self.test_file)
         self.assertFalse(file_exists(self.test_file))  # Check if file was deleted
+    def test_get_directory_info(self):
+        os.mkdir(os.path.join(self.test_dir, 'child'))
+
+        with open(os.path.join(self.test_dir, 'a.txt'), 'w') as f:
+            f.write('a' * 10)
+        with open(os.path.join(self.test_dir, 'child', 'b.json'), 'w') as f:
+            f.write('b' * 100)
+
+        info = get_directory_info(self.test_dir, workers=2)
+
+        self.assertEqual(info['num_files'], 2)
+        self.assertEqual(info['total_files'], 2)
+        self.assertEqual(info['total_size'], 110)
+        self.assertEqual(info['extensions'], {'.txt': 1, '.json': 1})
+        self.assertEqual(info['largest_files'][0], (os.path.join('child', 'b.json'), 100))
+        self.assertIsNotNone(info['newest_modification_time'])
+
+    def test_get_directory_info_skips_unreadable_directories(self):
+        os.makedirs(os.path.join(self.test_dir, 'locked', 'deeper'))
+
+        with open(os.path.join(self.test_dir, 'a.txt'), 'w') as f:
+            f.write('a' * 10)
+
+        locked = os.path.join(self.test_dir, 'locked')
+        scandir = os.scandir
+
+        # Patched rather than chmod-ed, permissions don't stop root
+        def guarded_scandir(path):
+            if path == locked:
+                raise PermissionError(13, 'Permission denied', path)
+            return scandir(path)
+
+        with patch('fastfs.scan.os.scandir', side_effect=guarded_scandir):
+            for workers in (1, 2):
+                info = get_directory_info(self.test_dir, workers=workers)
+
+                self.assertEqual(info['total_files'], 1)
+                self.assertEqual(info['total_size'], 10)
+
+    def test_get_directory_info_size_cache(self):
+        cache_path = os.path.join(self.test_dir, 'size_cache.json')
+        data_dir = os.path.join(self.test_dir, 'data')
+        os.mkdir(data_dir)
+
+        with open(os.path.join(data_dir, 'a.txt'), 'w') as f:
+            f.write('a' * 10)
+
+        self.assertEqual(get_directory_info(data_dir, size_cache=cache_path)['total_size'], 10)
+
+        # Unchanged directories are served from the cache without being listed again
+        with patch('fastfs.scan._scan_entries') as scan_entries:
+            self.assertEqual(get_directory_info(data_dir, size_cache=cache_path)['total_size'], 10)
+            scan_entries.assert_not_called()
+
+        with open(os.path.join(data_dir, 'b.txt'), 'w') as f:
+            f.write('b' * 5)
+
+        # Make sure the change is visible on filesystems with coarse timestamps
+        mtime_ns = os.stat(data_dir).st_mtime_ns + 10 ** 9
+        os.utime(data_dir, ns=(mtime_ns, mtime_ns))
+
+        self.assertEqual(get_directory_info(data_dir, size_cache=cache_path)['total_size'], 15)
+
+    def test_get_directory_info_size_cache_largest(self):
+        cache_path = os.path.join(self.test_dir, 'size_cache.json')
+        data_dir = os.path.join(self.test_dir, 'data')
+        os.mkdir(data_dir)
+
+        for idx in range(6):
+            with open(os.path.join(data_dir, f'{idx}.txt'), 'w') as f:
+                f.write('a' * (idx + 1))
+
+        self.assertEqual(len(get_directory_info(data_dir, size_cache=cache_path, largest=2)['largest_files']), 2)
+
+        # The cache only kept the two largest files, asking for more lists the directory again
+        info = get_directory_info(data_dir, size_cache=cache_path, largest=5)
+        self.assertEqual([size for _, size in info['largest_files']], [6, 5, 4, 3, 2])
+
+        with patch('fastfs.scan._scan_entries') as scan_entries:
+            self.assertEqual(len(get_directory_info(data_dir, size_cache=cache_path, largest=3)['largest_files']), 3)
+            scan_entries.assert_not_called()
+
+    def test_get_directory_info_size_cache_bare_file_name(self):
+        data_dir = os.path.join(self.test_dir, 'data')
+        os.mkdir(data_dir)
+        cwd = os.getcwd()
+
+        os.chdir(self.test_dir)
+
+        try:
+            self.assertEqual(get_directory_info('data', size_cache='size_cache.json')['total_files'], 0)
+            self.assertTrue(os.path.exists('size_cache.json'))
+        finally:
+            os.chdir(cwd)
+
+    def test_listing_index(self):
+        enable_listing_index(persist=False)
+
+        try:
+            for idx in (3, 1, 10, 2):
+                write_json(os.path.join(self.test_dir, f'{idx}.json'), idx)
+
+            self.assertEqual(sorted_ls(self.test_dir, 'numeric'),
+                             ['1.json', '2.json', '3.json', '10.json'])
+
+            # Served from the index while the directory is unchanged
+            with patch('os.listdir') as listdir:
+                self.assertEqual(len(ls(self.test_dir)), 4)
+                listdir.assert_not_called()
+
+            # fastfs writes and deletes keep the index up to date
+            delete_file(os.path.join(self.test_dir, '2.json'))
+            write_json(os.path.join(self.test_dir, '0.json'), 0)
+
+            self.assertEqual(sorted_ls(self.test_dir, 'numeric', reverse=True),
+                             ['10.json', '3.json', '1.json', '0.json'])
+
+            # Changes made outside of fastfs are picked up through the directory mtime
+            with open(os.path.join(self.test_dir, '5.json'), 'w') as f:
+                f.write('5')
+            mtime_ns = os.stat(self.test_dir).st_mtime_ns + 10 ** 9
+            os.utime(self.test_dir, ns=(mtime_ns, mtime_ns))
+
+            self.assertEqual(bulk_read_directory(self.test_dir), [0, 1, 3, 5, 10])
+        finally:
+            disable_listing_index()
+
+    def test_listing_index_external_file_between_writes(self):
+        enable_listing_index(persist=False)
+
+        try:
+            write_json(os.path.join(self.test_dir, '1.json'), 1)
+            self.assertEqual(ls(self.test_dir), ['1.json'])
+
+            # Writes made through fastfs alone keep the index current
+            write_json(os.path.join(self.test_dir, '2.json'), 2)
+
+            with patch('os.listdir') as listdir:
+                self.assertEqual(sorted(ls(self.test_dir)), ['1.json', '2.json'])
+                listdir.assert_not_called()
+
+            # A file created by someone else between two fastfs writes isn't hidden by the second write
+            with open(os.path.join(self.test_dir, '3.json'), 'w') as f:
+                f.write('3')
+
+            write_json(os.path.join(self.test_dir, '4.json'), 4)
+
+            self.assertEqual(sorted_ls(self.test_dir, 'numeric'), ['1.json', '2.json', '3.json', '4.json'])
+        finally:
+            disable_listing_index()
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file